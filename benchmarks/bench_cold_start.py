@@ -0,0 +1,109 @@
+"""
+benchmarks/bench_cold_start.py
+------------------------------
+Time-to-first-response for GET /api/settings in a fresh interpreter, as on
+an Azure Functions cold start, for the full factory and for serving mode
+(`create_app(..., serving=True)`, what function_app.py uses).
+
+Each run starts `python -X importtime`, which reports per-module import
+cost on stderr; the child reports its own wall time for import, app
+creation and the first request.  Reported per mode: the median of --runs
+and the heaviest top-level imports of the last run.
+
+    python benchmarks/bench_cold_start.py --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+_CHILD = """
+import json, time
+t0 = time.perf_counter()
+from admin_page import create_app
+from admin_page.config import Prod
+t1 = time.perf_counter()
+Prod.SQLALCHEMY_ENGINE_OPTIONS = {"execution_options": {"schema_translate_map": {"config": None}}}
+Prod.SECRET_KEY = "bench"
+app = create_app(Prod, serving=SERVING)
+t2 = time.perf_counter()
+resp = app.test_client().get("/api/settings")
+t3 = time.perf_counter()
+assert resp.status_code == 200, resp.status_code
+times = {"import": t1 - t0, "create_app": t2 - t1, "first_request": t3 - t2}
+print(json.dumps({**times, "total": t3 - t0}))
+"""
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def _prepare_db(path: Path) -> None:
+    """Create the tables once, outside the measured processes."""
+    script = (
+        "from admin_page import create_app\n"
+        "from admin_page.config import Prod\n"
+        "from admin_page.extensions import db\n"
+        'Prod.SQLALCHEMY_ENGINE_OPTIONS = {"execution_options": '
+        '{"schema_translate_map": {"config": None}}}\n'
+        "app = create_app(Prod, serving=True)\n"
+        "with app.app_context():\n"
+        "    db.create_all()\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, env=_env(path), capture_output=True)
+
+
+def _env(db_path: Path) -> dict[str, str]:
+    return {**os.environ, "DATABASE_URI": f"sqlite:///{db_path}"}
+
+
+def _run_once(serving: bool, db_path: Path) -> tuple[dict[str, float], list[tuple[int, str]]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD.replace("SERVING", str(serving))],
+        env=_env(db_path),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    top_level: list[tuple[int, str]] = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME.match(line)
+        if m and len(m.group(3)) == 1:  # direct imports of the child script
+            top_level.append((int(m.group(2)), m.group(4)))
+    top_level.sort(reverse=True)
+    return timings, top_level
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="heaviest imports to list")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        _prepare_db(db_path)
+
+        for serving in (False, True):
+            runs = [_run_once(serving, db_path) for _ in range(args.runs)]
+            label = "serving" if serving else "full"
+            med = {k: statistics.median(r[0][k] for r in runs) * 1000 for k in runs[0][0]}
+            print(
+                f"{label:>8}: total {med['total']:7.1f} ms  (import {med['import']:.1f}, "
+                f"create_app {med['create_app']:.1f}, first request {med['first_request']:.1f})"
+            )
+            for cumulative_us, module in runs[-1][1][: args.top]:
+                print(f"{'':>10}{cumulative_us / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+benchmarks/bench_serialization.py
+---------------------------------
+Compare the two ways of producing the /api/customer_configs body:
+
+* orm     – `list_configs(as_dict=True)` (ORM objects → `_to_dict`) encoded
+            with Flask's JSON provider (the old read path)
+* msgspec – `read_configs()` (Core rows → msgspec structs) encoded with
+            msgspec (the snapshot's read path)
+
+Each variant runs against a seeded SQLite database in a fresh session, as a
+request would.  Reported per request: CPU time (mean of --repeat runs) and
+the tracemalloc peak.
+
+    python benchmarks/bench_serialization.py --customers 1000 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from flask import current_app
+from sqlalchemy import insert
+
+from admin_page import create_app
+from admin_page.blueprints.customers.services import list_configs, read_configs
+from admin_page.config import Dev
+from admin_page.extensions import db
+from admin_page.models import BaseColumn, Customer
+from admin_page.structs import encoder
+
+
+def _make_app(path: Path):
+    class Bench(Dev):
+        DEBUG = False
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            "execution_options": {"schema_translate_map": {"config": None}}
+        }
+
+    app = create_app(Bench)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _seed(n: int) -> None:
+    db.session.execute(
+        insert(BaseColumn),
+        [
+            {"key": f"col_{i}", "name": f"Column {i}", "dtype": "string", "length": 50, "order": i}
+            for i in range(1, 31)
+        ],
+    )
+    db.session.execute(
+        insert(Customer),
+        [
+            {
+                "name": f"customer-{i:06d}",
+                "konserni": [i % 97, 1000 + i % 13],
+                "source_container": f"src-{i % 20}",
+                "destination_container": f"dst-{i % 20}",
+                "file_format": "csv",
+                "file_encoding": "utf-8",
+                "extra_columns": {"extra_1": {"name": "Extra 1", "dtype": "string"}},
+                "exclude_columns": ["Column 3"],
+                "enabled": i % 10 != 0,
+                "revision": 1,
+            }
+            for i in range(n)
+        ],
+    )
+    db.session.commit()
+
+
+def _orm_body() -> bytes:
+    return current_app.json.dumps(list_configs(as_dict=True)).encode()
+
+
+def _msgspec_body() -> bytes:
+    return encoder.encode(read_configs())
+
+
+def _measure(fn: Callable[[], bytes], repeat: int) -> tuple[float, int, int]:
+    """(mean CPU seconds, tracemalloc peak bytes, body size) for `fn` per request."""
+    fn()  # warm up: statement cache, imports
+    db.session.remove()
+
+    cpu: list[float] = []
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        cpu.append(time.process_time() - start)
+        db.session.remove()
+
+    tracemalloc.start()
+    body = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.session.remove()
+    return statistics.mean(cpu), peak, len(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--customers", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'customers':>10} {'path':>8} {'cpu ms':>9} {'peak MiB':>9} {'body KiB':>9}")
+    for n in args.customers:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = _make_app(Path(tmp) / "bench.db")
+            with app.app_context():
+                _seed(n)
+                for label, fn in (("orm", _orm_body), ("msgspec", _msgspec_body)):
+                    cpu, peak, size = _measure(fn, args.repeat)
+                    print(
+                        f"{n:>10} {label:>8} {cpu * 1000:>9.1f} "
+                        f"{peak / 2**20:>9.2f} {size / 1024:>9.1f}"
+                    )
+                db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+benchmarks/bench_sessions.py
+----------------------------
+Compare session stores on the request pattern that dominates the admin UI:
+logged-in users repeatedly viewing `login_required` pages.
+
+* filesystem – Flask-Session's cachelib FileSystemCache with
+               SESSION_REFRESH_EACH_REQUEST=True (the previous configuration)
+* sql        – `admin_page.sessions.SqlSessionInterface` on a SQLite file
+
+Reported per store: mean and p95 latency of a page view, and how many
+session writes the page views caused.
+
+    python benchmarks/bench_sessions.py --users 50 --views 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from cachelib import FileSystemCache
+from flask import session
+
+from admin_page import create_app
+from admin_page.blueprints.auth import login_required
+from admin_page.config import Dev
+from admin_page.extensions import db
+
+
+def _make_app(store: str, tmp: Path):
+    class Bench(Dev):
+        DEBUG = False
+        SECRET_KEY = "bench"
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp / 'bench.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            "execution_options": {"schema_translate_map": {"config": None}}
+        }
+
+    if store == "filesystem":
+        Bench.SESSION_TYPE = "cachelib"
+        Bench.SESSION_CACHELIB = FileSystemCache(str(tmp / "sessions"), threshold=500)
+        Bench.SESSION_REFRESH_EACH_REQUEST = True
+    else:
+        Bench.SESSION_TYPE = "sql"
+
+    app = create_app(Bench)
+
+    @app.get("/_bench/login")
+    def bench_login():
+        session["user"] = {"name": "bench", "oid": "bench"}
+        return "ok"
+
+    @app.get("/_bench/page")
+    @login_required
+    def bench_page():
+        return session["user"]["name"]
+
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _run(store: str, users: int, views: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        app = _make_app(store, Path(tmp))
+        interface = app.session_interface
+
+        writes = 0
+        upsert = interface._upsert_session
+
+        def counting_upsert(*args, **kwargs):
+            nonlocal writes
+            writes += 1
+            return upsert(*args, **kwargs)
+
+        interface._upsert_session = counting_upsert
+
+        clients = [app.test_client() for _ in range(users)]
+        for client in clients:
+            client.get("/_bench/login")
+        writes = 0
+
+        latencies: list[float] = []
+        for _ in range(views):
+            for client in clients:
+                start = time.perf_counter()
+                resp = client.get("/_bench/page")
+                latencies.append(time.perf_counter() - start)
+                assert resp.status_code == 200, resp.status_code
+
+        with app.app_context():
+            db.engine.dispose()
+
+    latencies.sort()
+    return {
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "writes": writes,
+        "views": len(latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--views", type=int, default=20, help="page views per user")
+    args = parser.parse_args()
+
+    print(f"{'store':>10} {'views':>7} {'mean ms':>8} {'p95 ms':>8} {'writes':>7}")
+    for store in ("filesystem", "sql"):
+        r = _run(store, args.users, args.views)
+        print(
+            f"{store:>10} {r['views']:>7} {r['mean_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+            f"{r['writes']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
 # function_app.py  –  Python v2
 import azure.functions as func
-from app import create_app
 
+from admin_page import create_app
 from admin_page.config import Prod
 
-flask_app = create_app(Prod)
+# serving mode: no Flask-Migrate / CLI on the cold-start path
+flask_app = create_app(Prod, serving=True)
 
 # 1. expose Flask through the dedicated v2 helper
 app = func.WsgiFunctionApp(  # NOTE: WsgiFunctionApp, *not* FunctionApp
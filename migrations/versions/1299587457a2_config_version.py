@@ -0,0 +1,31 @@
+"""config version
+
+Revision ID: 1299587457a2
+Revises: 2ddb5bd4a7d7
+Create Date: 2026-10-18 09:40:12.114233
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1299587457a2"
+down_revision = "2ddb5bd4a7d7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    config_version = op.create_table(
+        "config_version",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        schema="config",
+    )
+    op.bulk_insert(config_version, [{"id": 1, "version": 1}])
+
+
+def downgrade():
+    op.drop_table("config_version", schema="config")
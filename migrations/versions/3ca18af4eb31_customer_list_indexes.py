@@ -0,0 +1,35 @@
+"""customer list indexes
+
+Revision ID: 3ca18af4eb31
+Revises: e415f850f980
+Create Date: 2026-10-18 10:31:07.880412
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3ca18af4eb31"
+down_revision = "e415f850f980"
+branch_labels = None
+depends_on = None
+
+# Keyset pagination orders by `name` (already covered by its unique index);
+# these composite indexes keep the filtered variants a single range scan.
+_INDEXES = {
+    "ix_customer_configs_enabled_name": ["enabled", "name"],
+    "ix_customer_configs_source_container_name": ["source_container", "name"],
+    "ix_customer_configs_destination_container_name": ["destination_container", "name"],
+}
+
+
+def upgrade():
+    with op.batch_alter_table("customer_configs", schema="config") as batch_op:
+        for name, columns in _INDEXES.items():
+            batch_op.create_index(name, columns)
+
+
+def downgrade():
+    with op.batch_alter_table("customer_configs", schema="config") as batch_op:
+        for name in _INDEXES:
+            batch_op.drop_index(name)
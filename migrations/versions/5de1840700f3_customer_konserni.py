@@ -0,0 +1,52 @@
+"""customer konserni association
+
+Revision ID: 5de1840700f3
+Revises: 3ca18af4eb31
+Create Date: 2026-10-18 10:58:23.640129
+
+"""
+
+import json
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5de1840700f3"
+down_revision = "3ca18af4eb31"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    customer_konserni = op.create_table(
+        "customer_konserni",
+        sa.Column("konserni_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("customer_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["customer_id"], ["config.customer_configs.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("konserni_id", "customer_id"),
+        schema="config",
+    )
+
+    # ── data migration: explode the JSON arrays into rows ───────────────
+    customers = sa.table(
+        "customer_configs",
+        sa.column("id", sa.Integer()),
+        sa.column("konserni", sa.Text()),
+        schema="config",
+    )
+    rows = []
+    for customer_id, raw in op.get_bind().execute(sa.select(customers.c.id, customers.c.konserni)):
+        konserni = json.loads(raw) if isinstance(raw, str) else (raw or [])
+        rows.extend(
+            {"konserni_id": konserni_id, "customer_id": customer_id}
+            for konserni_id in sorted({int(k) for k in konserni})
+        )
+    if rows:
+        op.bulk_insert(customer_konserni, rows)
+
+
+def downgrade():
+    op.drop_table("customer_konserni", schema="config")
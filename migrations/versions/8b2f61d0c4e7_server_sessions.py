@@ -0,0 +1,35 @@
+"""server-side sessions
+
+Revision ID: 8b2f61d0c4e7
+Revises: 5de1840700f3
+Create Date: 2026-10-18 12:14:52.301877
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8b2f61d0c4e7"
+down_revision = "5de1840700f3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "sessions",
+        sa.Column("id", sa.String(length=255), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("expiry", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        schema="config",
+    )
+    with op.batch_alter_table("sessions", schema="config") as batch_op:
+        batch_op.create_index(batch_op.f("ix_config_sessions_expiry"), ["expiry"])
+
+
+def downgrade():
+    with op.batch_alter_table("sessions", schema="config") as batch_op:
+        batch_op.drop_index(batch_op.f("ix_config_sessions_expiry"))
+    op.drop_table("sessions", schema="config")
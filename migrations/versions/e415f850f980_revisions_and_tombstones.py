@@ -0,0 +1,67 @@
+"""revisions and tombstones
+
+Revision ID: e415f850f980
+Revises: 1299587457a2
+Create Date: 2026-10-18 10:05:41.502118
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e415f850f980"
+down_revision = "1299587457a2"
+branch_labels = None
+depends_on = None
+
+_REVISIONED = ("customer_configs", "base_columns", "general_settings")
+
+
+def upgrade():
+    for table in _REVISIONED:
+        with op.batch_alter_table(table, schema="config") as batch_op:
+            batch_op.add_column(
+                sa.Column("revision", sa.BigInteger(), nullable=False, server_default="0")
+            )
+
+    # Existing rows get the current config version (seeded as 1), so a client
+    # syncing from since=0 receives them; revision 0 would never be > since.
+    config_version = sa.table(
+        "config_version", sa.column("id"), sa.column("version"), schema="config"
+    )
+    current = sa.select(config_version.c.version).where(config_version.c.id == 1).scalar_subquery()
+    for table in _REVISIONED:
+        op.execute(
+            sa.table(table, sa.column("revision"), schema="config")
+            .update()
+            .values(revision=current)
+        )
+
+    with op.batch_alter_table("customer_configs", schema="config") as batch_op:
+        batch_op.create_index(batch_op.f("ix_config_customer_configs_revision"), ["revision"])
+
+    op.create_table(
+        "tombstones",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("entity", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("revision", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        schema="config",
+    )
+    with op.batch_alter_table("tombstones", schema="config") as batch_op:
+        batch_op.create_index(batch_op.f("ix_config_tombstones_revision"), ["revision"])
+
+
+def downgrade():
+    with op.batch_alter_table("tombstones", schema="config") as batch_op:
+        batch_op.drop_index(batch_op.f("ix_config_tombstones_revision"))
+    op.drop_table("tombstones", schema="config")
+
+    with op.batch_alter_table("customer_configs", schema="config") as batch_op:
+        batch_op.drop_index(batch_op.f("ix_config_customer_configs_revision"))
+
+    for table in _REVISIONED:
+        with op.batch_alter_table(table, schema="config") as batch_op:
+            batch_op.drop_column("revision")
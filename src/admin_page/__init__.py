@@ -2,12 +2,16 @@ import logging
 
 from flask import Flask
 
+from admin_page.config import engine_options
+from admin_page.engine import init_engine
 from admin_page.extensions import (
     csrf,
     db,
-    fsession,
-    migrate,
 )
+from admin_page.instrumentation import init_instrumentation
+from admin_page.metrics import init_metrics
+from admin_page.sessions import init_sessions
+from admin_page.slow_queries import init_slow_queries
 
 logging.basicConfig(
     level=logging.INFO,  # show INFO+ from the root
@@ -16,28 +20,41 @@ logging.basicConfig(
 )
 
 
-def create_app(config_object) -> Flask:
+def create_app(config_object, *, serving: bool = False) -> Flask:
     """
     Create and configure the Flask application.
+
+    `serving=True` builds the app for request serving only (function_app.py):
+    Flask-Migrate and the CLI commands are neither imported nor registered,
+    which keeps Alembic and the seeding code out of a cold start.
     """
     logger = logging.getLogger(__name__)
 
     app = Flask(__name__, static_folder="assets")  # global static
     app.config.from_object(config_object)
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
 
     # --- init extensions -------------------
     db.init_app(app)
+    init_engine(app)
+    init_instrumentation(app)
+    init_metrics(app)
+    init_slow_queries(app)
     csrf.init_app(app)
-    fsession.init_app(app)
-    migrate.init_app(app, db)
+    init_sessions(app)
 
     from admin_page.blueprints import register_blueprints
 
     register_blueprints(app)
 
-    # --- register CLI commands -------------
-    from admin_page.cli import register_commands
+    if not serving:
+        from admin_page.extensions import migrate
+
+        migrate.init_app(app, db)
+
+        # --- register CLI commands -------------
+        from admin_page.cli import register_commands
 
-    register_commands(app)
+        register_commands(app)
     logger.info("Flask app created and configured.")
     return app
@@ -1,9 +1,26 @@
+import hashlib
 import logging
+import math
+from collections.abc import Callable
+from urllib.parse import urlencode
 
-from flask import Blueprint
+from flask import Blueprint, Response, abort, current_app, request, stream_with_context
 
-from .customers.services import list_configs
-from .settings.services import get_base_columns, load_settings
+from admin_page.metrics import record_cache
+from admin_page.ratelimit import limit_api_requests
+from admin_page.singleflight import single_flight
+from admin_page.snapshot import get_snapshot
+from admin_page.versioning import change_horizon, current_version, etag_for, read_version
+from admin_page.watch import TooManyWatchers, watch
+
+from .customers.services import (
+    PAGE_QUERY_ARGS,
+    find_by_konserni,
+    iter_configs_ndjson,
+    list_config_changes,
+    page_args_from_query,
+    page_configs,
+)
 
 api_bp = Blueprint(
     "api",
@@ -11,15 +28,213 @@ api_bp = Blueprint(
     url_prefix="/api",
 )
 logger = logging.getLogger(__name__)
+api_bp.before_request(limit_api_requests)
+
+
+def _conditional(resource: str, build: Callable[[], tuple[int, bytes]]) -> Response:
+    """
+    Serve the JSON body returned by `build()` -> (version, body), tagged with
+    a strong ETag for that config version.  A matching `If-None-Match` is
+    answered with 304 before `build` (and therefore the database) is touched.
+
+    Concurrent requests for the same resource and version share one `build`
+    call, and with it the queries and the encoded body.
+    """
+    etag = etag_for(resource, current_version())
+
+    if request.if_none_match.contains(etag):
+        record_cache("etag", hit=True)
+        response = Response(status=304)
+    else:
+        record_cache("etag", hit=False)
+        version, body = single_flight(("api", etag), build)
+        response = Response(body, mimetype="application/json")
+        etag = etag_for(resource, version)
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @api_bp.route("/customer_configs", methods=["GET"])
 def get_customers():
     """
     Get a list of customers.
+
+    With `?since=<revision>` only what was created, updated or deleted after
+    that revision is returned – customers, plus base columns and settings
+    (see `list_config_changes`); 410 if `since` is more than
+    TOMBSTONE_RETENTION revisions old.
+
+    Any of `after`, `limit`, `enabled`, `prefix`, `source_container`,
+    `destination_container` or `fields` switches to a keyset-paginated
+    response: {"items": [...], "next_cursor": "<cursor>" | null}.
+    """
+    if "since" in request.args:
+        since = request.args.get("since", type=int)
+        if since is None or since < 0:
+            abort(400, description="'since' must be a non-negative integer revision")
+
+        def build_changes() -> tuple[int, bytes]:
+            changes = list_config_changes(since)
+            return changes["revision"], current_app.json.dumps(changes).encode()
+
+        return _conditional(f"customer_configs-since-{since}", build_changes)
+
+    if any(k in request.args for k in PAGE_QUERY_ARGS):
+        kwargs = page_args_from_query(request.args)
+
+        def build_page() -> tuple[int, bytes]:
+            version = read_version()
+            items, next_cursor = page_configs(**kwargs)
+            body = {"items": items, "next_cursor": next_cursor}
+            return version, current_app.json.dumps(body).encode()
+
+        query = urlencode(sorted(request.args.items(multi=True)))
+        digest = hashlib.sha1(query.encode()).hexdigest()[:16]
+        return _conditional(f"customer_configs-page-{digest}", build_page)
+
+    def build() -> tuple[int, bytes]:
+        snapshot = get_snapshot()
+        return snapshot.version, snapshot.customers_json
+
+    return _conditional("customer_configs", build)
+
+
+@api_bp.route("/customer_configs/export", methods=["GET"])
+def export_customers():
+    """
+    Stream every customer config as NDJSON, one object per line.
+    Re-import with POST /customers/import.
+    """
+    return Response(stream_with_context(iter_configs_ndjson()), mimetype="application/x-ndjson")
+
+
+@api_bp.route("/customer_configs/by-konserni/<int:konserni_id>", methods=["GET"])
+def get_customers_by_konserni(konserni_id: int):
+    """
+    Get the customers belonging to one konserni.
+    """
+
+    def build() -> tuple[int, bytes]:
+        version = read_version()
+        customers = find_by_konserni([konserni_id])[konserni_id]
+        return version, current_app.json.dumps(customers).encode()
+
+    return _conditional(f"by-konserni-{konserni_id}", build)
+
+
+@api_bp.route("/customer_configs/by-konserni", methods=["GET"])
+def get_customers_by_konserni_bulk():
+    """
+    Get the customers for many konserni at once: `?ids=2208,1234`.
+    Returns {"<konserni id>": [customer, ...], ...}.
+    """
+    try:
+        ids = sorted({int(x) for x in request.args.get("ids", "").split(",") if x.strip()})
+    except ValueError:
+        abort(400, description="'ids' must be a comma-separated list of integers")
+    if not ids:
+        abort(400, description="'ids' is required")
+
+    def build() -> tuple[int, bytes]:
+        version = read_version()
+        customers = find_by_konserni(ids)
+        return version, current_app.json.dumps(customers).encode()
+
+    digest = hashlib.sha1(",".join(map(str, ids)).encode()).hexdigest()[:16]
+    return _conditional(f"by-konserni-{digest}", build)
+
+
+@api_bp.route("/customer_configs/<int:customer_id>/schema", methods=["GET"])
+def get_customer_schema(customer_id: int):
+    """
+    Get the effective output schema of one customer: base columns in order,
+    minus its excluded columns, plus its extra columns.
+    """
+    snapshot = get_snapshot()
+    if customer_id not in snapshot.schemas_json:
+        abort(404)
+
+    def build() -> tuple[int, bytes]:
+        return snapshot.version, snapshot.schemas_json[customer_id][1]
+
+    return _conditional(f"schema-{customer_id}", build)
+
+
+@api_bp.route("/customer_configs/schemas", methods=["GET"])
+def get_enabled_schemas():
+    """
+    Get the effective output schemas of all enabled customers, ordered by name.
+    """
+
+    def build() -> tuple[int, bytes]:
+        snapshot = get_snapshot()
+        return snapshot.version, snapshot.enabled_schemas_json
+
+    return _conditional("schemas", build)
+
+
+@api_bp.route("/bundle", methods=["GET"])
+def get_bundle():
     """
+    Get everything a pipeline run needs in one call, read in one consistent
+    transaction: {"version": n, "customers": [...], "base_columns": {...},
+    "settings": {..., "emails": [...]}}.
 
-    return list_configs(as_dict=True)
+    Sent gzip-compressed when the client accepts it (`Accept-Encoding: gzip`).
+    """
+    compressed = request.accept_encodings["gzip"] > 0
+
+    def build() -> tuple[int, bytes]:
+        snapshot = get_snapshot()
+        return snapshot.version, snapshot.bundle_gzip if compressed else snapshot.bundle_json
+
+    # each encoding is its own representation, with its own strong ETag
+    response = _conditional("bundle-gzip" if compressed else "bundle", build)
+    if compressed and response.status_code == 200:
+        response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+@api_bp.route("/watch", methods=["GET"])
+def watch_changes():
+    """
+    Long-poll for config changes: `?since=<version>&timeout=<seconds>`.
+
+    Answers as soon as the config version passes `since`, with the ids of
+    the entities changed since then (see `admin_page.watch`), or with 204
+    once `timeout` (default API_WATCH_TIMEOUT, at most API_WATCH_MAX_TIMEOUT)
+    runs out.  Without `since` it waits for the next change.  A `since` more
+    than TOMBSTONE_RETENTION versions old gets 410: resync, then watch again.
+    """
+    since = request.args.get("since", type=int)
+    if "since" in request.args and (since is None or since < 0):
+        abort(400, description="'since' must be a non-negative integer version")
+    timeout = request.args.get(
+        "timeout", default=current_app.config["API_WATCH_TIMEOUT"], type=float
+    )
+    if timeout is None or not math.isfinite(timeout) or timeout < 0:
+        abort(400, description="'timeout' must be a non-negative number of seconds")
+    timeout = min(timeout, current_app.config["API_WATCH_MAX_TIMEOUT"])
+
+    version = current_version()
+    if since is None:
+        since = version
+    elif since and since < change_horizon(version):
+        abort(410, description=f"Version {since} is too old, resync from since=0")
+    try:
+        changes = watch(since, timeout)
+    except TooManyWatchers:
+        abort(503, description="Too many watchers, retry shortly", retry_after=1)
+
+    if changes is None:
+        response = Response(status=204)
+    else:
+        response = Response(current_app.json.dumps(changes), mimetype="application/json")
+    response.headers["Cache-Control"] = "no-store"
+    return response
 
 
 @api_bp.route("/settings", methods=["GET"])
@@ -28,9 +243,11 @@ def get_settings():
     Get general settings.
     """
 
-    settings = load_settings(as_dict=True)
-    settings["base_columns"] = get_base_columns()
-    return settings
+    def build() -> tuple[int, bytes]:
+        snapshot = get_snapshot()
+        return snapshot.version, snapshot.settings_json
+
+    return _conditional("settings", build)
 
 
 def init_app(app):
@@ -0,0 +1,126 @@
+"""
+One MSAL ConfidentialClientApplication per app (i.e. per process).
+
+Constructing the client runs authority validation and OpenID discovery over
+HTTP, so building one per login added a round trip to every `/auth/login`
+and `/auth/callback` – worst right after a cold start.  The shared client is
+rebuilt after `MSAL_METADATA_TTL` seconds so key or endpoint changes on the
+identity provider side are still picked up.
+
+MSAL reads tokens through `app.token_cache`, which is fixed at construction.
+The shared client therefore gets a `_BoundTokenCache` that forwards to the
+cache bound to the current thread with `bound_token_cache()`, so each
+request keeps working on its own user's cache.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from flask import current_app
+
+if TYPE_CHECKING:  # msal is imported lazily: only the login routes need it
+    import msal
+
+_EXTENSION_KEY = "msal_client"
+
+
+class _BoundTokenCache:
+    """
+    `token_cache` stand-in that forwards to the cache bound to this thread.
+
+    `add`, `remove_rt` and `update_rt` are defined explicitly because MSAL
+    captures them (as callbacks) when the client is built, before any cache
+    is bound.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def _current(self) -> msal.TokenCache:
+        cache = getattr(self._local, "cache", None)
+        if cache is None:
+            raise RuntimeError("No token cache bound; use bound_token_cache()")
+        return cache
+
+    @contextmanager
+    def bind(self, cache: msal.TokenCache) -> Iterator[None]:
+        previous = getattr(self._local, "cache", None)
+        self._local.cache = cache
+        try:
+            yield
+        finally:
+            self._local.cache = previous
+
+    def add(self, *args: Any, **kwargs: Any) -> Any:
+        return self._current().add(*args, **kwargs)
+
+    def remove_rt(self, *args: Any, **kwargs: Any) -> Any:
+        return self._current().remove_rt(*args, **kwargs)
+
+    def update_rt(self, *args: Any, **kwargs: Any) -> Any:
+        return self._current().update_rt(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._current(), name)
+
+
+class _ClientHolder:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.client: msal.ConfidentialClientApplication | None = None
+        self.built_at = 0.0
+        self.token_cache = _BoundTokenCache()
+
+
+def _holder() -> _ClientHolder:
+    return current_app.extensions.setdefault(_EXTENSION_KEY, _ClientHolder())
+
+
+def _build(holder: _ClientHolder) -> msal.ConfidentialClientApplication:
+    import msal
+
+    config = current_app.config
+    return msal.ConfidentialClientApplication(
+        config["AZURE_CLIENT_ID"],
+        authority=config["AZURE_AUTHORITY"],
+        client_credential=config["AZURE_CLIENT_SECRET"],
+        token_cache=holder.token_cache,
+        http_client=config.get("MSAL_HTTP_CLIENT"),
+    )
+
+
+def get_msal_client() -> msal.ConfidentialClientApplication:
+    """
+    The shared client for this app, built on first use and again once it is
+    older than `MSAL_METADATA_TTL` seconds.  Concurrent callers share one build.
+    """
+    holder = _holder()
+    ttl = current_app.config.get("MSAL_METADATA_TTL", 86400)
+
+    client = holder.client
+    if client is not None and time.monotonic() - holder.built_at < ttl:
+        return client
+
+    with holder.lock:
+        if holder.client is None or time.monotonic() - holder.built_at >= ttl:
+            holder.client = _build(holder)
+            holder.built_at = time.monotonic()
+        return holder.client
+
+
+@contextmanager
+def bound_token_cache(cache: msal.TokenCache) -> Iterator[msal.ConfidentialClientApplication]:
+    """
+    Yield the shared client with `cache` as its token cache for this thread.
+
+        with bound_token_cache(cache) as client:
+            client.acquire_token_by_authorization_code(...)
+    """
+    client = get_msal_client()
+    with _holder().token_cache.bind(cache):
+        yield client
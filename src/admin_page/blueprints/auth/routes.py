@@ -1,39 +1,19 @@
 import logging
 import uuid
 
-import msal
 from flask import current_app, redirect, render_template, request, session, url_for
 
 from . import auth_bp
+from .client import bound_token_cache, get_msal_client
+from .token_cache import new_token_cache, token_cache_store
 
 logger = logging.getLogger(__name__)
 
 # ---------- helpers ---------- #
 
 
-def _load_cache():
-    cache = msal.SerializableTokenCache()
-    if session.get("token_cache"):
-        cache.deserialize(session["token_cache"])
-    return cache
-
-
-def _save_cache(cache):
-    if cache.has_state_changed:
-        session["token_cache"] = cache.serialize()
-
-
-def _build_msal_app(cache=None):
-    return msal.ConfidentialClientApplication(
-        current_app.config["AZURE_CLIENT_ID"],
-        authority=current_app.config["AZURE_AUTHORITY"],
-        client_credential=current_app.config["AZURE_CLIENT_SECRET"],
-        token_cache=cache,
-    )
-
-
 def _build_auth_url(scopes=None, state=None):
-    return _build_msal_app().get_authorization_request_url(
+    return get_msal_client().get_authorization_request_url(
         scopes or [],
         state=state or str(uuid.uuid4()),
         redirect_uri=url_for(".callback", _external=True),
@@ -54,15 +34,17 @@ def login():
 # NOTE: path must match AZURE_REDIRECT_PATH
 @auth_bp.route("/callback")
 def callback():
-    if request.args.get("state") != session.get("auth_state"):
+    if request.args.get("state") != session.pop("auth_state", None):
         return render_template("403.html"), 403
 
-    cache = _load_cache()
-    result = _build_msal_app(cache).acquire_token_by_authorization_code(
-        request.args.get("code"),
-        scopes=current_app.config["AZURE_SCOPE"],
-        redirect_uri=url_for(".callback", _external=True),
-    )
+    # stored by the user's oid (not in the session) once we know who logged in
+    cache = new_token_cache()
+    with bound_token_cache(cache) as client:
+        result = client.acquire_token_by_authorization_code(
+            request.args.get("code"),
+            scopes=current_app.config["AZURE_SCOPE"],
+            redirect_uri=url_for(".callback", _external=True),
+        )
 
     if "error" in result:
         return render_template("error.html", error=result.get("error_description"))
@@ -73,12 +55,16 @@ def callback():
         "email": result["id_token_claims"].get("preferred_username"),
         "oid": result["id_token_claims"].get("oid"),
     }
-    _save_cache(cache)
+    if session["user"]["oid"]:
+        token_cache_store().save(session["user"]["oid"], cache)
     return redirect(url_for("main.index"))  # or wherever you land the user
 
 
 @auth_bp.route("/logout")
 def logout():
+    user = session.get("user") or {}
+    if user.get("oid"):
+        token_cache_store().discard(user["oid"])
     session.clear()
     logout_url = (
         current_app.config["AZURE_AUTHORITY"]
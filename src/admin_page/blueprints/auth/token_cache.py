@@ -0,0 +1,93 @@
+"""
+MSAL token caches, kept out of the Flask session.
+
+A serialized token cache is several KB, while the session otherwise holds
+just the user's claims.  Storing it in the session made every page view
+load (and every save write) that payload although only `/auth/callback`
+uses it.  Caches now live in a bounded, expiring in-process store keyed by
+the user's `oid`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from flask import current_app
+
+if TYPE_CHECKING:
+    import msal
+
+_EXTENSION_KEY = "token_cache_store"
+
+
+def new_token_cache() -> msal.SerializableTokenCache:
+    import msal
+
+    return msal.SerializableTokenCache()
+
+
+class TokenCacheStore:
+    """LRU of serialized token caches by `oid`, each entry expiring after `ttl` seconds."""
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 3600) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, oid: str) -> bool:
+        return self._get(oid) is not None
+
+    def _get(self, oid: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(oid)
+            if entry is None:
+                return None
+            expires_at, state = entry
+            if expires_at <= time.monotonic():
+                del self._entries[oid]
+                return None
+            self._entries.move_to_end(oid)
+            return state
+
+    def load(self, oid: str) -> msal.SerializableTokenCache:
+        """The user's cache, or an empty one if none is stored (or it expired)."""
+        cache = new_token_cache()
+        state = self._get(oid)
+        if state:
+            cache.deserialize(state)
+        return cache
+
+    def save(self, oid: str, cache: msal.SerializableTokenCache) -> None:
+        """Store `cache` for `oid` if it changed, evicting the least recently used."""
+        if not cache.has_state_changed:
+            return
+        with self._lock:
+            self._entries[oid] = (time.monotonic() + self.ttl, cache.serialize())
+            self._entries.move_to_end(oid)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, oid: str) -> None:
+        with self._lock:
+            self._entries.pop(oid, None)
+
+
+def token_cache_store() -> TokenCacheStore:
+    """The app's token cache store, sized by TOKEN_CACHE_MAX_ENTRIES / TOKEN_CACHE_TTL."""
+    store = current_app.extensions.get(_EXTENSION_KEY)
+    if store is None:
+        store = current_app.extensions.setdefault(
+            _EXTENSION_KEY,
+            TokenCacheStore(
+                max_entries=current_app.config.get("TOKEN_CACHE_MAX_ENTRIES", 1000),
+                ttl=current_app.config.get("TOKEN_CACHE_TTL", 3600),
+            ),
+        )
+    return store
@@ -1,4 +1,6 @@
-from flask import Blueprint, render_template
+from flask import Blueprint, Response, abort, render_template
+
+from admin_page.metrics import metrics_authorized, metrics_registry
 
 from ..auth import login_required
 
@@ -17,5 +19,18 @@ def index():
     return render_template("index.html")
 
 
+@core_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Prometheus metrics of this process (see admin_page.metrics).
+    """
+    if not metrics_authorized():
+        abort(401)
+    registry = metrics_registry()
+    if registry is None:
+        abort(404)
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+
 def init_app(app):
     app.register_blueprint(core_bp)
@@ -4,8 +4,17 @@ URL endpoints for managing customer configurations.
 
 import logging
 
-from flask import abort, flash, jsonify, redirect, render_template, request, url_for
-from werkzeug.exceptions import NotFound
+from flask import (
+    abort,
+    current_app,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
+from werkzeug.exceptions import BadRequest, NotFound
 
 from ..auth import login_required
 from ..settings.services import get_base_columns
@@ -13,7 +22,18 @@ from ..settings.services import get_base_columns
 # from ..auth.aad import login_required
 from . import customers_bp
 from .forms import CustomerForm
-from .services import delete_customer, list_configs, save_config, set_customer_enabled
+from .services import (
+    bulk_delete_customers,
+    bulk_set_enabled,
+    config_to_dict,
+    delete_customer,
+    import_configs_ndjson,
+    list_configs,
+    page_args_from_query,
+    page_configs,
+    save_config,
+    set_customer_enabled,
+)
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -26,10 +46,15 @@ logger: logging.Logger = logging.getLogger(__name__)
 @login_required
 def index():
     """
-    Show all customer configs.
+    Show one page of customer configs, keyset-paginated by name.
+    Accepts the same filters as /api/customer_configs (prefix, enabled, …).
     """
-    customers = list_configs()  # Returns list[dict] or Model objs
-    return render_template("list.html", customers=customers)
+    kwargs = page_args_from_query(request.args)
+    kwargs.setdefault("limit", current_app.config["CUSTOMERS_PAGE_SIZE"])
+    kwargs["fields"] = ("id", "name", "enabled")
+
+    customers, next_cursor = page_configs(**kwargs)
+    return render_template("list.html", customers=customers, next_cursor=next_cursor)
 
 
 # ───────────────────────────────────────
@@ -66,9 +91,12 @@ def edit(pk: int):
     Edit an existing customer configuration.
     """
 
-    customer = list_configs(pk=pk, as_dict=True)
-    if customer is None:
+    # keep the ORM row referenced: save_config() then finds it in the
+    # session's identity map instead of SELECTing it again
+    row = list_configs(pk=pk)
+    if row is None:
         raise NotFound("Customer not found")
+    customer = config_to_dict(row)
     base_columns = get_base_columns()
 
     form = CustomerForm(obj=customer)  # Pre-fill with existing data
@@ -134,3 +162,97 @@ def delete(pk):
     flash("Customer deleted.", "success")
     next_url = request.args.get("next") or url_for("customers.index")
     return redirect(next_url)
+
+
+# ───────────────────────────────────────
+# Bulk enable / disable / delete
+# ───────────────────────────────────────
+
+
+def _bulk_selection(data: dict) -> dict:
+    """`ids` / `filter` of a bulk request body, as service keyword arguments."""
+    if "ids" in data and not isinstance(data["ids"], list):
+        abort(400, description="'ids' must be a list of customer ids")
+    if "filter" in data and not isinstance(data["filter"], dict):
+        abort(400, description="'filter' must be an object")
+    return {"ids": data.get("ids"), "filters": data.get("filter")}
+
+
+def _bulk_response(outcome: dict[int, str], version: int | None):
+    counts: dict[str, int] = {}
+    for result in outcome.values():
+        counts[result] = counts.get(result, 0) + 1
+    return jsonify(
+        {
+            "status": "ok",
+            "version": version,  # new config version, None if nothing changed
+            "counts": counts,
+            "results": {str(i): result for i, result in outcome.items()},
+        }
+    )
+
+
+@customers_bp.post("/bulk/enabled")
+@login_required
+def bulk_enabled():
+    """
+    POST /customers/bulk/enabled — enable or disable many customers at once.
+    JSON: {"enabled": bool, "ids": [1, 2, …]} or {"enabled": bool, "filter":
+    {"prefix": …, "enabled": …, "source_container": …, "destination_container": …}}.
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data.get("enabled"), bool):
+        abort(400, description="JSON must include 'enabled': true|false")
+
+    try:
+        outcome, version = bulk_set_enabled(data["enabled"], **_bulk_selection(data))
+    except BadRequest as e:
+        abort(400, description=e.description)
+    except Exception:
+        logger.exception("Bulk enable/disable failed")
+        abort(500, description="internal error")
+    return _bulk_response(outcome, version)
+
+
+@customers_bp.post("/bulk/delete")
+@login_required
+def bulk_delete():
+    """
+    POST /customers/bulk/delete — delete many customers at once.
+    JSON: {"ids": [1, 2, …]} or {"filter": {…}} as for /bulk/enabled.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        outcome, version = bulk_delete_customers(**_bulk_selection(data))
+    except BadRequest as e:
+        abort(400, description=e.description)
+    except Exception:
+        logger.exception("Bulk delete failed")
+        abort(500, description="internal error")
+    return _bulk_response(outcome, version)
+
+
+# ───────────────────────────────────────
+# NDJSON import
+# ───────────────────────────────────────
+
+
+@customers_bp.post("/import")
+@login_required
+def import_ndjson():
+    """
+    POST /customers/import  — upsert configs from an NDJSON body, as produced
+    by GET /api/customer_configs/export.  `?dry_run=1` validates and reports
+    without writing.
+
+    Like every POST here it needs the signed-in session's CSRF token (the
+    X-CSRFToken header); scripts use `flask import-customers` instead.
+    """
+    dry_run = request.args.get("dry_run", "").lower() in ("1", "true")
+    try:
+        stats = import_configs_ndjson(request.stream, dry_run=dry_run)
+    except BadRequest as e:
+        logger.warning("NDJSON import rejected: %s", e.description)
+        return jsonify({"status": "error", "error": e.description}), 400
+
+    return jsonify({"status": "ok", "dry_run": dry_run, **stats})
@@ -1,14 +1,28 @@
 # customers/services.py
 from __future__ import annotations
 
-from collections.abc import MutableMapping, Sequence
+import base64
+import binascii
+import json
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping, Sequence
 from typing import Any, Literal, overload
 
+import msgspec
+from flask import current_app
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from werkzeug.exceptions import BadRequest, NotFound
+from sqlalchemy.sql import ColumnElement
+from werkzeug.exceptions import BadRequest, Gone, NotFound
 
+from admin_page.blueprints.settings.services import read_settings
 from admin_page.extensions import db as database
+from admin_page.models.base_column_model import BaseColumn
+from admin_page.models.customer_konserni_model import CustomerKonserni
 from admin_page.models.customer_model import Customer
+from admin_page.models.tombstone_model import Tombstone
+from admin_page.structs import BaseColumnSpec, CustomerConfig, EffectiveSchema, SchemaColumn
+from admin_page.versioning import bump_version, change_horizon, read_version
 
 
 def _dict_from_extras(items: list[Any]) -> dict[str, dict[str, str]] | None:
@@ -39,6 +53,33 @@ def _dict_from_extras(items: list[Any]) -> dict[str, dict[str, str]] | None:
     return out or None
 
 
+def _columns_from_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Map WTForms-style `data` onto Customer column values."""
+    return {
+        "name": data["name"],
+        "konserni": sorted({int(x) for x in data["konserni"]}),
+        "source_container": data["source_container"],
+        "destination_container": data["destination_container"],
+        "file_format": data["file_format"],
+        "file_encoding": data["file_encoding"],
+        "extra_columns": _dict_from_extras(data["extra_columns"]),
+        "exclude_columns": data["exclude_columns"] or None,
+        "enabled": bool(data.get("enabled", False)),
+    }
+
+
+def _sync_konserni_links(cfg: Customer) -> None:
+    """Mirror `cfg.konserni` into the indexed customer_konserni rows."""
+    wanted = set(cfg.konserni)
+    current = {link.konserni_id: link for link in cfg.konserni_links}
+
+    for konserni_id, link in current.items():
+        if konserni_id not in wanted:
+            cfg.konserni_links.remove(link)
+    for konserni_id in sorted(wanted - current.keys()):
+        cfg.konserni_links.append(CustomerKonserni(konserni_id=konserni_id))
+
+
 def save_config(data: dict[str, Any], pk: int | None = None) -> Customer:
     """
     Create or update a CustomerConfig.
@@ -51,6 +92,10 @@ def save_config(data: dict[str, Any], pk: int | None = None) -> Customer:
         When None (default) we create a new row; otherwise we UPDATE
         the row whose primary-key == pk.
 
+    Only changed columns are written, and an update that changes nothing
+    writes (and commits) nothing.  The name check relies on the unique
+    index instead of a SELECT before the INSERT.
+
     Raises
     ------
     werkzeug.exceptions.NotFound
@@ -59,40 +104,196 @@ def save_config(data: dict[str, Any], pk: int | None = None) -> Customer:
         If `name` is already taken on INSERT.
     """
     db: Session = database.session
+    values = _columns_from_data(data)
 
     if pk is None:
         # INSERT
-        if db.query(Customer).filter_by(name=data["name"]).first():
-            raise BadRequest("A customer with that name already exists.")
-
-        cfg = Customer()
+        cfg = Customer(**values, revision=bump_version(db))
         db.add(cfg)
-    else:
-        # UPDATE
-        cfg = db.get(Customer, pk)
-        if cfg is None:
-            raise NotFound(f"CustomerConfig with id={pk} not found.")
-
-    # ─── Map WTForms data → ORM ────────────────────────────────────────────
-    cfg.name = data["name"]
-    cfg.konserni = list({int(x) for x in data["konserni"]})
-    cfg.source_container = data["source_container"]
-    cfg.destination_container = data["destination_container"]
-    cfg.file_format = data["file_format"]
-    cfg.file_encoding = data["file_encoding"]
-    cfg.extra_columns = _dict_from_extras(data["extra_columns"])
-    cfg.exclude_columns = data["exclude_columns"] or None
-    cfg.enabled = bool(data.get("enabled", False))
+        _sync_konserni_links(cfg)
+        try:
+            db.commit()
+        except IntegrityError as exc:
+            db.rollback()
+            if db.scalar(select(Customer.id).where(Customer.name == values["name"])) is not None:
+                raise BadRequest("A customer with that name already exists.") from exc
+            raise
+        return cfg
+
+    # UPDATE – the edit view has usually loaded the row already (identity map)
+    cfg = db.get(Customer, pk)
+    if cfg is None:
+        raise NotFound(f"CustomerConfig with id={pk} not found.")
+
+    changed = {column: v for column, v in values.items() if getattr(cfg, column) != v}
+    if not changed:
+        return cfg
+
+    # bump before touching `cfg` so the version UPDATE can't autoflush it
+    cfg.revision = bump_version(db)
+    for column, value in changed.items():
+        setattr(cfg, column, value)
+    if "konserni" in changed:
+        _sync_konserni_links(cfg)
 
     db.commit()
     return cfg
 
 
+_IN_CHUNK = 1000  # IN-list / executemany batch size (MSSQL caps a statement at 2100 params)
+
+
+def _chunks(items: Sequence[Any], size: int = _IN_CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _normalised(value: Any) -> Any:
+    """Make JSON column values comparable (konserni order is irrelevant)."""
+    if isinstance(value, list) and all(isinstance(v, int) for v in value):
+        return sorted(value)
+    return value
+
+
+def _plan_upsert(
+    wanted: dict[str, dict[str, Any]], existing: Mapping[str, Mapping[str, Any]]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], int]:
+    """Split `wanted` rows into (inserts, updates, unchanged-count) against `existing`."""
+    inserts: list[dict[str, Any]] = []
+    updates: list[dict[str, Any]] = []
+    unchanged = 0
+    for name, row in wanted.items():
+        current = existing.get(name)
+        if current is None:
+            inserts.append(row)
+        elif any(_normalised(current[c]) != _normalised(v) for c, v in row.items()):
+            updates.append({"id": current["id"], **row})
+        else:
+            unchanged += 1
+    return inserts, updates, unchanged
+
+
+def _apply_upsert(
+    db: Session,
+    version: int,
+    inserts: list[dict[str, Any]],
+    updates: list[dict[str, Any]],
+    existing: Mapping[str, Mapping[str, Any]],
+) -> None:
+    """Write a planned upsert with executemany batches.  Does not commit."""
+    links: list[dict[str, Any]] = []
+
+    # ── updates: executemany by primary key, then rebuild changed links ──
+    if updates:
+        db.execute(update(Customer), [{**u, "revision": version} for u in updates])
+        relinked = [
+            u for u in updates if sorted(existing[u["name"]]["konserni"] or []) != u["konserni"]
+        ]
+        for batch in _chunks(relinked):
+            ids = [u["id"] for u in batch]
+            db.execute(delete(CustomerKonserni).where(CustomerKonserni.customer_id.in_(ids)))
+        links += [
+            {"konserni_id": k, "customer_id": u["id"]} for u in relinked for k in u["konserni"]
+        ]
+
+    # ── inserts: executemany with RETURNING to learn the new ids ─────────
+    by_name = {row["name"]: row for row in inserts}
+    for batch in _chunks(inserts):
+        new_ids = db.execute(
+            insert(Customer).returning(Customer.id, Customer.name),
+            [{**row, "revision": version} for row in batch],
+        ).all()
+        links += [
+            {"konserni_id": k, "customer_id": cid}
+            for cid, name in new_ids
+            for k in by_name[name]["konserni"]
+        ]
+
+    if links:
+        db.execute(insert(CustomerKonserni), links)
+
+
+def _delete_customers(db: Session, version: int, ids: Sequence[int]) -> None:
+    """Delete customers by id, with their links and tombstones.  Does not commit."""
+    for batch in _chunks(ids):
+        # links first; SQLite doesn't enforce ON DELETE CASCADE
+        db.execute(delete(CustomerKonserni).where(CustomerKonserni.customer_id.in_(batch)))
+        db.execute(delete(Customer).where(Customer.id.in_(batch)))
+    if ids:
+        db.execute(
+            insert(Tombstone),
+            [{"entity": "customer", "entity_id": i, "revision": version} for i in ids],
+        )
+
+
+def bulk_upsert_configs(
+    configs: Sequence[dict[str, Any]],
+    *,
+    prune: bool = False,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """
+    Insert or update many customer configs, matched by `name`, in one
+    transaction.
+
+    Existing rows are resolved with a single SELECT; inserts, updates and
+    konserni links are written with batched executemany (pyodbc
+    `fast_executemany` on MSSQL, see `config.engine_options`) and committed
+    once.  Rows whose values already match are left untouched.
+
+    Parameters
+    ----------
+    configs
+        Config dicts in the same shape `save_config` accepts.
+    prune
+        Also delete customers whose name is not in `configs`.
+    dry_run
+        Compute the outcome but write nothing.
+
+    Returns
+    -------
+    {"inserted": n, "updated": n, "unchanged": n, "deleted": n}
+
+    Raises
+    ------
+    werkzeug.exceptions.BadRequest
+        If two configs share a name.
+    """
+    db: Session = database.session
+
+    wanted: dict[str, dict[str, Any]] = {}
+    for data in configs:
+        row = _columns_from_data(data)
+        if row["name"] in wanted:
+            raise BadRequest(f"Duplicate customer name {row['name']!r} in input.")
+        wanted[row["name"]] = row
+
+    existing = {r["name"]: r for r in db.execute(select(Customer.__table__)).mappings()}
+    inserts, updates, unchanged = _plan_upsert(wanted, existing)
+    deletes = [r["id"] for name, r in existing.items() if name not in wanted] if prune else []
+
+    stats = {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "unchanged": unchanged,
+        "deleted": len(deletes),
+    }
+    if dry_run or not (inserts or updates or deletes):
+        return stats
+
+    version = bump_version(db)
+    _delete_customers(db, version, deletes)
+    _apply_upsert(db, version, inserts, updates, existing)
+
+    db.commit()
+    return stats
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Optional: tiny serializer so templates / JSON dumps don't have to
 # touch the ORM object directly.
 # ─────────────────────────────────────────────────────────────────────────────
-def _to_dict(obj: Customer) -> dict[str, Any]:
+def config_to_dict(obj: Customer) -> dict[str, Any]:
     """Convert a CustomerModel into a plain dict."""
     return {
         "id": obj.id,
@@ -105,6 +306,7 @@ def _to_dict(obj: Customer) -> dict[str, Any]:
         "extra_columns": obj.extra_columns,
         "exclude_columns": obj.exclude_columns,
         "enabled": obj.enabled,
+        "revision": obj.revision,
     }
 
 
@@ -174,7 +376,7 @@ def list_configs(
     if isinstance(pk, int):
         obj = q.filter(Customer.id == pk).one_or_none()
         if as_dict and obj is not None:
-            return _to_dict(obj)
+            return config_to_dict(obj)
         return obj
 
     # ----- multiple keys or "all" -------------------------------------
@@ -182,24 +384,293 @@ def list_configs(
         q = q.filter(Customer.id.in_(pk))
 
     rows = q.all()
-    return [_to_dict(r) for r in rows] if as_dict else rows
+    return [config_to_dict(r) for r in rows] if as_dict else rows
+
+
+def read_configs(db: Session | None = None) -> list[CustomerConfig]:
+    """
+    All customer configs ordered by name, as immutable structs.
+
+    Reads plain Core rows, so nothing is loaded into the identity map – the
+    cheap path for the API snapshot.  Use `list_configs` when ORM objects
+    are needed.
+    """
+    db = db or database.session
+
+    columns = [getattr(Customer, f) for f in CustomerConfig.__struct_fields__]
+    rows = db.execute(select(*columns).order_by(Customer.name))
+    return [CustomerConfig(*row) for row in rows]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Keyset pagination
+# ─────────────────────────────────────────────────────────────────────────────
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# columns a caller may project with `fields=`; "id" is always included
+PROJECTABLE_FIELDS = (
+    "id",
+    "name",
+    "konserni",
+    "source_container",
+    "destination_container",
+    "file_format",
+    "file_encoding",
+    "extra_columns",
+    "exclude_columns",
+    "enabled",
+    "revision",
+)
+
+
+def encode_cursor(name: str) -> str:
+    """Opaque, URL-safe cursor pointing *after* the customer called `name`."""
+    return base64.urlsafe_b64encode(name.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Inverse of `encode_cursor`.  Raises BadRequest on garbage."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded, altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise BadRequest("Invalid pagination cursor.") from exc
+
+
+# query-string names understood by `page_args_from_query`
+PAGE_QUERY_ARGS = (
+    "after",
+    "limit",
+    "enabled",
+    "prefix",
+    "source_container",
+    "destination_container",
+    "fields",
+)
+
+
+def page_args_from_query(args: Mapping[str, str]) -> dict[str, Any]:
+    """
+    Translate query-string args (e.g. `request.args`) into `page_configs`
+    keyword arguments.  Raises BadRequest on malformed values.
+    """
+    out: dict[str, Any] = {}
+
+    if args.get("after"):
+        out["after"] = args["after"]
+    if args.get("limit"):
+        try:
+            out["limit"] = int(args["limit"])
+        except ValueError as exc:
+            raise BadRequest("'limit' must be an integer.") from exc
+    if args.get("enabled"):
+        value = args["enabled"].strip().lower()
+        if value not in ("true", "false", "1", "0"):
+            raise BadRequest("'enabled' must be true or false.")
+        out["enabled"] = value in ("true", "1")
+    if args.get("prefix"):
+        out["name_prefix"] = args["prefix"]
+    for key in ("source_container", "destination_container"):
+        if args.get(key):
+            out[key] = args[key]
+    if args.get("fields"):
+        out["fields"] = [f.strip() for f in args["fields"].split(",") if f.strip()]
+
+    return out
+
+
+def _filter_clauses(
+    *,
+    enabled: bool | None = None,
+    name_prefix: str | None = None,
+    source_container: str | None = None,
+    destination_container: str | None = None,
+) -> list[ColumnElement[bool]]:
+    """WHERE clauses for the list filters (see `page_configs`)."""
+    clauses: list[ColumnElement[bool]] = []
+    if enabled is not None:
+        clauses.append(Customer.enabled == enabled)
+    if name_prefix:
+        clauses.append(Customer.name.startswith(name_prefix, autoescape=True))
+    if source_container:
+        clauses.append(Customer.source_container == source_container)
+    if destination_container:
+        clauses.append(Customer.destination_container == destination_container)
+    return clauses
+
+
+def page_configs(
+    *,
+    after: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    enabled: bool | None = None,
+    name_prefix: str | None = None,
+    source_container: str | None = None,
+    destination_container: str | None = None,
+    fields: Sequence[str] | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """
+    One page of customers ordered by name, as plain dicts.
+
+    Parameters
+    ----------
+    after
+        Cursor returned by the previous call (None → first page).
+    limit
+        Page size, clamped to 1 … MAX_PAGE_SIZE.
+    enabled, name_prefix, source_container, destination_container
+        Optional filters; each one is an index seek (see Customer indexes).
+    fields
+        Subset of PROJECTABLE_FIELDS to return (None → all).  Only those
+        columns are selected.
+
+    Returns
+    -------
+    (rows, next_cursor) – `next_cursor` is None on the last page.
+
+    Raises
+    ------
+    werkzeug.exceptions.BadRequest
+        On an unknown field or an undecodable cursor.
+    """
+    db: Session = database.session
+
+    if fields:
+        unknown = set(fields) - set(PROJECTABLE_FIELDS)
+        if unknown:
+            raise BadRequest(f"Unknown field(s): {', '.join(sorted(unknown))}")
+        wanted = ["id", *(f for f in PROJECTABLE_FIELDS if f in fields and f != "id")]
+    else:
+        wanted = list(PROJECTABLE_FIELDS)
+    # `name` drives the cursor, so it is always selected
+    selected = wanted if "name" in wanted else [*wanted, "name"]
+
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    q = select(*(getattr(Customer, f) for f in selected)).order_by(Customer.name)
+
+    if after is not None:
+        q = q.where(Customer.name > decode_cursor(after))
+    q = q.where(
+        *_filter_clauses(
+            enabled=enabled,
+            name_prefix=name_prefix,
+            source_container=source_container,
+            destination_container=destination_container,
+        )
+    )
+
+    # fetch one extra row to learn whether another page exists
+    rows = db.execute(q.limit(limit + 1)).mappings().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = encode_cursor(rows[-1]["name"]) if has_more else None
+    return [{f: r[f] for f in wanted} for r in rows], next_cursor
+
+
+MAX_KONSERNI_IDS = 1000  # keeps the IN-list well under MSSQL's 2100-parameter cap
+
+
+def find_by_konserni(konserni_ids: Sequence[int]) -> dict[int, list[dict[str, Any]]]:
+    """
+    Customers belonging to each of `konserni_ids`, as plain dicts.
+
+    One query, answered by an index seek on customer_konserni's primary key.
+
+    Returns
+    -------
+    {konserni_id: [customer dict, ...]} – every requested id is present,
+    with an empty list when no customer belongs to it.
+    """
+    db: Session = database.session
+
+    ids = sorted(set(konserni_ids))
+    if len(ids) > MAX_KONSERNI_IDS:
+        raise BadRequest(f"At most {MAX_KONSERNI_IDS} konserni ids per request.")
+
+    out: dict[int, list[dict[str, Any]]] = {konserni_id: [] for konserni_id in ids}
+    if not ids:
+        return out
+
+    rows = db.execute(
+        select(CustomerKonserni.konserni_id, Customer)
+        .join(Customer, Customer.id == CustomerKonserni.customer_id)
+        .where(CustomerKonserni.konserni_id.in_(ids))
+        .order_by(CustomerKonserni.konserni_id, Customer.name)
+    ).all()
+    for konserni_id, customer in rows:
+        out[konserni_id].append(config_to_dict(customer))
+    return out
+
+
+def effective_schema(
+    customer: CustomerConfig, base_columns: Mapping[str, BaseColumnSpec]
+) -> EffectiveSchema:
+    """
+    The output column layout for one customer: `base_columns` in order,
+    minus `exclude_columns`, followed by `extra_columns`, with 1-based
+    positions.
+
+    `exclude_columns` may hold either base-column keys or display names (the
+    customer form submits names).
+    """
+    excluded = set(customer.exclude_columns or ())
+
+    specs: list[tuple[str, str | None, str | None, int | None, int | None, str]] = [
+        (key, col.name, col.dtype, col.length, col.decimals, "base")
+        for key, col in base_columns.items()
+        if key not in excluded and col.name not in excluded
+    ]
+    specs.extend(
+        (
+            key,
+            extra.get("name"),
+            extra.get("dtype"),
+            extra.get("length"),
+            extra.get("decimals"),
+            "extra",
+        )
+        for key, extra in (customer.extra_columns or {}).items()
+    )
+
+    return EffectiveSchema(
+        customer_id=customer.id,
+        name=customer.name,
+        revision=customer.revision,
+        columns=[SchemaColumn(position, *spec) for position, spec in enumerate(specs, start=1)],
+    )
 
 
 def set_customer_enabled(customer_id: int, enabled: bool) -> Customer:
     """
     Toggle Customer.enabled. Raises ValueError if the id doesn't exist.
+
+    One UPDATE … RETURNING (OUTPUT on MSSQL) besides the version bump; a
+    customer that already has the requested state is left untouched.
     """
 
     db: Session = database.session
+    enabled = bool(enabled)
 
-    customer = db.get(Customer, customer_id)
-    if not customer:
-        raise ValueError(f"Customer id={customer_id} not found")
+    version = bump_version(db)
+    customer = db.scalars(
+        update(Customer)
+        .where(Customer.id == customer_id, Customer.enabled != enabled)
+        .values(enabled=enabled, revision=version)
+        .returning(Customer),
+        # an instance the caller already loaded gets the RETURNING values too
+        execution_options={"synchronize_session": False, "populate_existing": True},
+    ).one_or_none()
 
-    customer.enabled = bool(enabled)
-    db.commit()
-    db.refresh(customer)
+    if customer is None:  # unknown id, or nothing to change
+        db.rollback()
+        customer = db.get(Customer, customer_id)
+        if not customer:
+            raise ValueError(f"Customer id={customer_id} not found")
+        return customer
 
+    db.commit()
     return customer
 
 
@@ -217,6 +688,345 @@ def delete_customer(customer_id: int) -> bool:
         return False
 
     db.delete(customer)
+    db.add(Tombstone(entity="customer", entity_id=customer_id, revision=bump_version(db)))
     db.commit()
 
     return True
+
+
+# ── bulk operations ──────────────────────────────────────────────────────
+
+MAX_BULK_IDS = 1000  # one IN-list, well under MSSQL's 2100-parameter cap
+
+# filter keys accepted by the bulk operations (a subset of PAGE_QUERY_ARGS)
+BULK_FILTER_ARGS = ("enabled", "prefix", "source_container", "destination_container")
+
+
+def _bulk_target(
+    ids: Sequence[int] | None, filters: Mapping[str, Any] | None
+) -> tuple[list[int] | None, list[ColumnElement[bool]]]:
+    """
+    Resolve the customers a bulk operation applies to: explicit `ids`, or
+    `filters` in query-string form (see `BULK_FILTER_ARGS`).
+    Raises BadRequest unless exactly one of them is given.
+    """
+    if (ids is None) == (filters is None):
+        raise BadRequest("Give either 'ids' or 'filter'.")
+
+    if ids is not None:
+        if not ids:
+            raise BadRequest("'ids' must not be empty.")
+        if len(ids) > MAX_BULK_IDS:
+            raise BadRequest(f"At most {MAX_BULK_IDS} ids per request.")
+        try:
+            wanted = sorted({int(i) for i in ids})
+        except (TypeError, ValueError) as exc:
+            raise BadRequest("'ids' must be a list of integers.") from exc
+        return wanted, [Customer.id.in_(wanted)]
+
+    unknown = set(filters) - set(BULK_FILTER_ARGS)
+    if unknown:
+        raise BadRequest(f"Unknown filter(s): {', '.join(sorted(unknown))}")
+    args = {k: str(v).lower() if isinstance(v, bool) else str(v) for k, v in filters.items()}
+    clauses = _filter_clauses(**page_args_from_query(args))
+    if not clauses:
+        raise BadRequest("'filter' must restrict the customers.")
+    return None, clauses
+
+
+def bulk_set_enabled(
+    enabled: bool,
+    *,
+    ids: Sequence[int] | None = None,
+    filters: Mapping[str, Any] | None = None,
+) -> tuple[dict[int, str], int | None]:
+    """
+    Enable or disable many customers with one UPDATE … RETURNING.
+
+    Returns ({id: "updated" | "unchanged" | "not_found"}, new config
+    version or None).  Customers already in the requested state are not
+    written; if nothing changes, nothing is committed and the version stays.
+    """
+    db: Session = database.session
+    enabled = bool(enabled)
+    wanted, where = _bulk_target(ids, filters)
+
+    version = bump_version(db)
+    # read the matches first: a filter on `enabled` no longer matches afterwards
+    matched = set(db.scalars(select(Customer.id).where(*where)))
+    updated = set(
+        db.scalars(
+            update(Customer)
+            .where(*where, Customer.enabled != enabled)
+            .values(enabled=enabled, revision=version)
+            .returning(Customer.id),
+            execution_options={"synchronize_session": False},
+        )
+    )
+
+    if updated:
+        db.commit()
+    else:
+        db.rollback()
+        version = None
+
+    outcome = {i: "updated" if i in updated else "unchanged" for i in matched | updated}
+    outcome.update({i: "not_found" for i in wanted or () if i not in matched})
+    return dict(sorted(outcome.items())), version
+
+
+def bulk_delete_customers(
+    *,
+    ids: Sequence[int] | None = None,
+    filters: Mapping[str, Any] | None = None,
+) -> tuple[dict[int, str], int | None]:
+    """
+    Delete many customers with one set-based DELETE … RETURNING (plus their
+    konserni links and tombstones), in one transaction.
+
+    Returns ({id: "deleted" | "not_found"}, new config version or None).
+    """
+    db: Session = database.session
+    wanted, where = _bulk_target(ids, filters)
+
+    version = bump_version(db)
+    targets = select(Customer.id).where(*where)
+    # links first; SQLite doesn't enforce ON DELETE CASCADE
+    db.execute(delete(CustomerKonserni).where(CustomerKonserni.customer_id.in_(targets)))
+    deleted = list(
+        db.scalars(
+            delete(Customer).where(*where).returning(Customer.id),
+            execution_options={"synchronize_session": False},
+        )
+    )
+
+    if deleted:
+        db.execute(
+            insert(Tombstone),
+            [{"entity": "customer", "entity_id": i, "revision": version} for i in deleted],
+        )
+        db.commit()
+    else:
+        db.rollback()
+        version = None
+
+    outcome = dict.fromkeys(deleted, "deleted")
+    outcome.update({i: "not_found" for i in wanted or () if i not in outcome})
+    return dict(sorted(outcome.items())), version
+
+
+def list_config_changes(since: int) -> dict[str, Any]:
+    """
+    Customers, base columns and settings created, updated or deleted after
+    config revision `since`.
+
+    Returns
+    -------
+    {"revision": <current>, "since": since,
+     "changed": [<customer dict>, ...], "deleted": [<customer id>, ...],
+     "base_columns": {"changed": [<base column dict>, ...], "deleted": [<id>, ...]},
+     "settings": <settings dict> | None}
+
+    Base column dicts carry their `id` (what "deleted" lists) and `order`;
+    `settings` is None when the settings did not change.  Pass the returned
+    `revision` as the next `since`.  The version is read *before* the rows,
+    so a write racing with this call is reported again next time rather
+    than missed.  `since=0` is a full sync: everything, no deletions.
+
+    Raises
+    ------
+    werkzeug.exceptions.Gone
+        If `since` is behind the change horizon (its tombstones may have
+        been pruned); the client must resync from 0.
+    """
+    db: Session = database.session
+
+    revision = read_version(db)
+    if since and since < change_horizon(revision):
+        raise Gone(f"Revision {since} is too old, resync from since=0.")
+    changed = db.scalars(
+        select(Customer).where(Customer.revision > since).order_by(Customer.name)
+    ).all()
+    columns = db.execute(
+        select(
+            BaseColumn.id,
+            BaseColumn.key,
+            BaseColumn.name,
+            BaseColumn.dtype,
+            BaseColumn.length,
+            BaseColumn.decimals,
+            BaseColumn.order,
+            BaseColumn.revision,
+        )
+        .where(BaseColumn.revision > since)
+        .order_by(BaseColumn.order)
+    ).mappings()
+    settings = read_settings(db)
+
+    deleted: dict[str, list[int]] = {"customer": [], "base_column": []}
+    if since:
+        tombstones = db.execute(
+            select(Tombstone.entity, Tombstone.entity_id)
+            .where(Tombstone.revision > since)
+            .order_by(Tombstone.revision)
+        )
+        for entity, entity_id in tombstones:
+            if entity in deleted:
+                deleted[entity].append(entity_id)
+
+    return {
+        "revision": revision,
+        "since": since,
+        "changed": [config_to_dict(r) for r in changed],
+        "deleted": deleted["customer"],
+        "base_columns": {"changed": [dict(c) for c in columns], "deleted": deleted["base_column"]},
+        # a settings row that was never saved has revision 0: still part of a full sync
+        "settings": (
+            msgspec.to_builtins(settings) if not since or settings.revision > since else None
+        ),
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# NDJSON export / import
+# ─────────────────────────────────────────────────────────────────────────────
+EXPORT_YIELD_PER = 500  # rows fetched per server-side cursor round-trip
+IMPORT_BATCH_SIZE = 500  # configs validated and upserted per batch
+
+_IMPORT_STRING_FIELDS = (
+    "name",
+    "source_container",
+    "destination_container",
+    "file_format",
+    "file_encoding",
+)
+
+
+def iter_configs_ndjson(*, yield_per: int = EXPORT_YIELD_PER) -> Iterator[str]:
+    """
+    Yield every customer as one JSON line (`config_to_dict` shape), ordered by name.
+
+    Rows are streamed with `yield_per`, so memory stays flat no matter how
+    many customers exist.  Must run inside an app context (use
+    `stream_with_context` when returning it from a view).
+    """
+    db: Session = database.session
+    dumps = current_app.json.dumps
+
+    rows = db.scalars(
+        select(Customer).order_by(Customer.name).execution_options(yield_per=yield_per)
+    )
+    for obj in rows:
+        yield dumps(config_to_dict(obj)) + "\n"
+
+
+def _config_from_line(line: str | bytes, line_no: int) -> dict[str, Any]:
+    """Validate one NDJSON line and map it onto Customer column values."""
+    try:
+        obj = json.loads(line)
+    except ValueError as exc:
+        raise BadRequest(f"Line {line_no}: invalid JSON.") from exc
+    if not isinstance(obj, dict):
+        raise BadRequest(f"Line {line_no}: expected a JSON object.")
+
+    for field in _IMPORT_STRING_FIELDS:
+        value = obj.get(field)
+        max_len = Customer.__table__.c[field].type.length
+        if not isinstance(value, str) or not value.strip() or len(value) > max_len:
+            raise BadRequest(f"Line {line_no}: '{field}' must be a string of 1–{max_len} chars.")
+    if not isinstance(obj.get("konserni"), list):
+        raise BadRequest(f"Line {line_no}: 'konserni' must be a list of integers.")
+    # strict here, unlike form data: bool("false") would import as enabled
+    if not isinstance(obj.get("enabled"), bool):
+        raise BadRequest(f"Line {line_no}: 'enabled' must be true or false.")
+    excludes = obj.get("exclude_columns") or []
+    if not isinstance(excludes, list) or not all(isinstance(c, str) for c in excludes):
+        raise BadRequest(f"Line {line_no}: 'exclude_columns' must be a list of strings.")
+
+    # the export writes extra_columns as {key: {...}}; save_config takes a list
+    extras = obj.get("extra_columns") or []
+    if isinstance(extras, Mapping):
+        extras = [{"key": k, **v} if isinstance(v, Mapping) else None for k, v in extras.items()]
+    if not isinstance(extras, list) or not all(
+        isinstance(extra, Mapping)
+        and all(isinstance(extra.get(f) or "", str) for f in ("key", "name", "dtype"))
+        for extra in extras
+    ):
+        raise BadRequest(
+            f"Line {line_no}: 'extra_columns' must map keys to {{name, dtype}} strings."
+        )
+
+    try:
+        return _columns_from_data({**obj, "extra_columns": extras, "exclude_columns": excludes})
+    except (TypeError, ValueError) as exc:
+        raise BadRequest(f"Line {line_no}: {exc}") from exc
+
+
+def import_configs_ndjson(
+    lines: Iterable[str | bytes],
+    *,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """
+    Upsert customer configs from NDJSON lines (the `iter_configs_ndjson`
+    format; `id` and `revision` are ignored, rows are matched by name).
+
+    Lines are validated and upserted `batch_size` at a time, each batch
+    resolving its existing rows with one query, all inside one transaction
+    that is committed at the end – a bad line anywhere rolls back everything.
+
+    Returns
+    -------
+    {"inserted": n, "updated": n, "unchanged": n}
+
+    Raises
+    ------
+    werkzeug.exceptions.BadRequest
+        On the first invalid or duplicate line (with its line number).
+    """
+    db: Session = database.session
+
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+    seen: set[str] = set()
+    batch: dict[str, dict[str, Any]] = {}
+    version: int | None = None
+
+    def flush_batch() -> None:
+        nonlocal version
+        existing = {
+            r["name"]: r
+            for r in db.execute(
+                select(Customer.__table__).where(Customer.name.in_(list(batch)))
+            ).mappings()
+        }
+        inserts, updates, unchanged = _plan_upsert(batch, existing)
+        stats["inserted"] += len(inserts)
+        stats["updated"] += len(updates)
+        stats["unchanged"] += unchanged
+        if not dry_run and (inserts or updates):
+            if version is None:
+                version = bump_version(db)
+            _apply_upsert(db, version, inserts, updates, existing)
+        batch.clear()
+
+    try:
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            row = _config_from_line(line, line_no)
+            if row["name"] in seen:
+                raise BadRequest(f"Line {line_no}: duplicate customer name {row['name']!r}.")
+            seen.add(row["name"])
+            batch[row["name"]] = row
+            if len(batch) >= batch_size:
+                flush_batch()
+        if batch:
+            flush_batch()
+    except Exception:
+        db.rollback()
+        raise
+
+    if version is not None:
+        db.commit()
+    return stats
@@ -35,4 +35,62 @@ document.addEventListener("DOMContentLoaded", () => {
       }
     });
   });
-});
\ No newline at end of file
+
+  /* ─── 3. Multi-select + bulk actions ──────────────────────────── */
+  const bulk      = document.getElementById("bulkActions");
+  const selectAll = document.getElementById("selectAll");
+  const counter   = document.getElementById("selectedCount");
+  const boxes     = () => [...document.querySelectorAll(".select-customer")];
+  const selected  = () => boxes().filter(b => b.checked).map(b => Number(b.value));
+
+  const refresh = () => {
+    const n = selected().length;
+    counter.textContent = `${n} valittu`;
+    bulk.querySelectorAll("button[data-bulk]").forEach(btn => (btn.disabled = n === 0));
+    selectAll.checked = n > 0 && n === boxes().length;
+  };
+
+  selectAll?.addEventListener("change", () => {
+    boxes().forEach(b => (b.checked = selectAll.checked));
+    refresh();
+  });
+  document.getElementById("customerList")?.addEventListener("change", ev => {
+    if (ev.target.classList.contains("select-customer")) refresh();
+  });
+
+  bulk?.querySelectorAll("button[data-bulk]").forEach(btn => {
+    btn.addEventListener("click", async () => {
+      const ids    = selected();
+      const action = btn.dataset.bulk;
+      if (!ids.length) return;
+      if (action === "delete" && !confirm(`Poistetaanko ${ids.length} asiakasta?`)) return;
+
+      const url  = action === "delete" ? bulk.dataset.deleteUrl : bulk.dataset.enabledUrl;
+      const body = action === "delete" ? { ids } : { ids, enabled: action === "enable" };
+      try {
+        const res = await fetch(url, {
+          method : "POST",
+          headers: { "Content-Type": "application/json", "X-CSRFToken": CSRF },
+          body   : JSON.stringify(body)
+        });
+        if (!res.ok) throw new Error(await res.text());
+        const { results } = await res.json();
+
+        for (const [id, result] of Object.entries(results)) {
+          const row = document.querySelector(`#customerList li[data-id="${id}"]`);
+          if (!row) continue;
+          if (result === "deleted") {
+            row.remove();
+          } else if (result === "updated" || result === "unchanged") {
+            row.querySelector(".enabled-switch").checked = action === "enable";
+            row.querySelector(".select-customer").checked = false;
+          }
+        }
+        refresh();
+      } catch (err) {
+        console.error("Bulk action failed:", err);
+        alert("Päivitys epäonnistui – yritä uudelleen.");
+      }
+    });
+  });
+});
@@ -2,8 +2,9 @@ import logging
 
 from flask import render_template
 
+from admin_page.snapshot import get_snapshot
+
 from ..auth import login_required
-from ..customers.services import list_configs
 from . import manual_run_bp
 
 logger = logging.getLogger(__name__)
@@ -14,6 +15,10 @@ logger = logging.getLogger(__name__)
 def index():
     """
     Show manual run page.
+
+    Not paginated: "Valitse kaikki" must select every customer, not just
+    one page.  The list comes from the config snapshot, so it costs no
+    queries while the config is unchanged.
     """
-    customers = list_configs()
+    customers = get_snapshot().customers
     return render_template("run.html", customers=customers)
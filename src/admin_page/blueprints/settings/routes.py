@@ -1,7 +1,9 @@
 import logging
 
 from flask import (
+    abort,
     flash,
+    jsonify,
     redirect,
     render_template,
     request,
@@ -9,12 +11,18 @@ from flask import (
 )
 from sqlalchemy.exc import SQLAlchemyError
 
-from admin_page.models import EmailModel
+from admin_page.models import EmailModel, GeneralSettings
 
 from ..auth import login_required
 from . import settings_bp
 from .forms import BaseColumnListForm, GeneralSettingsForm
-from .services import get_base_columns, load_settings, save_base_columns, save_settings
+from .services import (
+    get_base_columns,
+    load_settings,
+    move_base_columns,
+    save_base_columns,
+    save_settings,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +77,37 @@ def base_columns():
     )
 
 
+@settings_bp.patch("/base_columns/order")
+@login_required
+def move_base_columns_order():
+    """
+    PATCH /settings/base_columns/order  — apply drag-and-drop moves only.
+
+    Body: {"moves": [{"key": "<column key>", "to": <1-based position>}, ...]},
+    applied in sequence.  Responds with the resulting key order.
+    """
+    data = request.get_json(silent=True) or {}
+    moves = data.get("moves")
+    if not isinstance(moves, list) or not all(
+        isinstance(m, dict)
+        and isinstance(m.get("key"), str)
+        and isinstance(m.get("to"), int)
+        and m["to"] >= 1
+        for m in moves
+    ):
+        abort(400, description="JSON must include 'moves': [{'key': str, 'to': int >= 1}]")
+
+    try:
+        order = move_base_columns([(m["key"], m["to"]) for m in moves])
+    except KeyError as e:
+        abort(404, description=f"unknown base column {e.args[0]!r}")
+    except SQLAlchemyError:
+        logger.exception("Failed to reorder base columns.")
+        abort(500, description="internal error")
+
+    return jsonify({"status": "ok", "order": order})
+
+
 @settings_bp.route("/general_settings", methods=["GET", "POST"])
 @login_required
 def general_settings():
@@ -80,20 +119,23 @@ def general_settings():
         form.emails.append_entry()
 
     if form.validate_on_submit():
-        # ── scalar fields ──────────────────────────
-        settings.retry_attempts = (
-            form.retry_attempts.data if form.retry_attempts.data is not None else 3
+        # the submitted values, as a transient object – save_settings diffs it
+        updated = GeneralSettings(
+            id=settings.id,
+            retry_attempts=(
+                form.retry_attempts.data if form.retry_attempts.data is not None else 3
+            ),
+            retry_delay=form.retry_delay.data if form.retry_delay.data is not None else 5,
+            emails=[
+                EmailModel(
+                    address=(fld.form.address.data or "").strip(),
+                    display_name=(fld.form.display_name.data or "").strip(),
+                )
+                for fld in form.emails.entries
+            ],
         )
-        settings.retry_delay = form.retry_delay.data if form.retry_delay.data is not None else 5
-
-        # ── rebuild e-mail list ─────────────────────
-        settings.emails.clear()
-        for fld in form.emails.entries:
-            address = (fld.form.address.data or "").strip()
-            display = (fld.form.display_name.data or "").strip()
-            settings.emails.append(EmailModel(address=address, display_name=display))
 
-        save_settings(settings)
+        save_settings(updated)
         flash("Asetukset tallennettu", "success")
         return redirect(url_for("settings.index"))
 
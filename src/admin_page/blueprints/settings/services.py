@@ -2,12 +2,16 @@
 from collections import OrderedDict
 from typing import Any
 
+from sqlalchemy import case, delete, insert, select, update
 from sqlalchemy.orm import Session, joinedload
 
 from admin_page.extensions import db as database
 from admin_page.models.base_column_model import BaseColumn
 from admin_page.models.email_model import EmailModel
 from admin_page.models.general_settings_model import GeneralSettings
+from admin_page.models.tombstone_model import Tombstone
+from admin_page.structs import BaseColumnSpec, Email, Settings
+from admin_page.versioning import bump_version
 
 
 def get_base_columns(*, as_ordered=True, as_rows=False):
@@ -28,18 +32,116 @@ def get_base_columns(*, as_ordered=True, as_rows=False):
     return out
 
 
+def read_base_columns(db: Session | None = None) -> dict[str, BaseColumnSpec]:
+    """
+    {key: BaseColumnSpec} in `order`, read as plain Core rows (no ORM
+    instances) for the API snapshot.
+    """
+    db = db or database.session
+
+    rows = db.execute(
+        select(
+            BaseColumn.key,
+            BaseColumn.name,
+            BaseColumn.dtype,
+            BaseColumn.length,
+            BaseColumn.decimals,
+        ).order_by(BaseColumn.order)
+    )
+    return {key: BaseColumnSpec(*spec) for key, *spec in rows}
+
+
+_SPEC_FIELDS = ("name", "dtype", "length", "decimals")
+
+
+def _apply_orders(db: Session, new_orders: dict[int, int], version: int) -> None:
+    """
+    Move rows to new `order` values ({id: order}) with two set-based UPDATEs.
+
+    The moving rows are first parked on their negated order (distinct,
+    because current orders are unique), then given their final value with a
+    single CASE.  Neither statement can hit the unique `order` index, even on
+    engines that check it row by row.
+    """
+    if not new_orders:
+        return
+    ids = list(new_orders)
+    opts = {"synchronize_session": False}
+
+    db.execute(
+        update(BaseColumn).where(BaseColumn.id.in_(ids)).values(order=-BaseColumn.order),
+        execution_options=opts,
+    )
+    db.execute(
+        update(BaseColumn)
+        .where(BaseColumn.id.in_(ids))
+        .values(order=case(new_orders, value=BaseColumn.id), revision=version),
+        execution_options=opts,
+    )
+
+
+def _order_changes(current: dict[int, int], sequence: list[int]) -> dict[int, int]:
+    """{id: new_order} for the ids in `sequence` whose position differs from `current`."""
+    return {
+        row_id: pos for pos, row_id in enumerate(sequence, start=1) if current.get(row_id) != pos
+    }
+
+
 def reorder_base_columns(new_order: list[int]):
     """
     `new_order` is a list of BaseColumn.id values in desired sequence.
+    Only rows whose position actually changes are written.
     """
     db: Session = database.session
 
-    for pos, row_id in enumerate(new_order, start=1):
-        db.query(BaseColumn).filter_by(id=row_id).update({"order": pos})
+    current = dict(db.execute(select(BaseColumn.id, BaseColumn.order)).all())
+    changes = _order_changes(current, new_order)
+    if not changes:
+        return
+
+    _apply_orders(db, changes, bump_version(db))
     db.commit()
 
 
+def move_base_columns(moves: list[tuple[str, int]]) -> list[str]:
+    """
+    Apply drag-and-drop moves, each `(key, to)` with 1-based target position,
+    in sequence.  Only the rows whose position changes are written.
+
+    Returns the resulting key order.  Raises KeyError for an unknown key.
+    """
+    db: Session = database.session
+
+    rows = db.execute(
+        select(BaseColumn.id, BaseColumn.key, BaseColumn.order).order_by(BaseColumn.order)
+    ).all()
+    id_by_key = {r.key: r.id for r in rows}
+    sequence = [r.id for r in rows]
+
+    for key, to in moves:
+        row_id = id_by_key[key]
+        sequence.remove(row_id)
+        sequence.insert(max(0, min(to - 1, len(sequence))), row_id)
+
+    changes = _order_changes({r.id: r.order for r in rows}, sequence)
+    if changes:
+        _apply_orders(db, changes, bump_version(db))
+        db.commit()
+
+    key_by_id = {v: k for k, v in id_by_key.items()}
+    return [key_by_id[row_id] for row_id in sequence]
+
+
 def save_base_columns(new_columns, *, allow_deletes=True) -> None:
+    """
+    Make the base columns match `new_columns` (dict {key: spec} or list of
+    specs with a "key"), in the given order.
+
+    The submitted list is diffed against the existing rows: deleted rows are
+    removed with one DELETE, changed specs are updated, moved rows are
+    re-ordered with `_apply_orders` and new rows inserted.  Unchanged rows
+    are not touched; a no-op save writes nothing.
+    """
     # normalise ----------------------------------------------------------------
     if isinstance(new_columns, dict):
         items = list(new_columns.items())
@@ -48,42 +150,55 @@ def save_base_columns(new_columns, *, allow_deletes=True) -> None:
 
     db: Session = database.session
 
-    existing = {row.key: row for row in db.query(BaseColumn).all()}
-    seen = set()
-
-    # ─── 1st pass: updates / inserts but give each row a TEMP order ──────
-    temp_offset = 10000  # puts them far from real range
-    for pos, (k, spec) in enumerate(items, start=1):
-        seen.add(k)
-        if k in existing:
-            row = existing[k]
-            row.name = spec["name"]
-            row.dtype = spec["dtype"]
-            row.length = spec.get("length")
-            row.decimals = spec.get("decimals")
-            row.order = temp_offset + pos  # temporary value
-        else:
-            db.add(
-                BaseColumn(
-                    key=k,
-                    name=spec["name"],
-                    dtype=spec["dtype"],
-                    length=spec.get("length"),
-                    decimals=spec.get("decimals"),
-                    order=temp_offset + pos,  # temporary
-                )
-            )
-
-    if allow_deletes:
-        for k, row in existing.items():
-            if k not in seen:
-                db.delete(row)
-
-    db.flush()  # executes all temp-order writes
-
-    # ─── 2nd pass: set the FINAL, collision-free order values ────────────
-    for pos, (k, _) in enumerate(items, start=1):
-        db.query(BaseColumn).filter_by(key=k).update({"order": pos})
+    existing = {row.key: row for row in db.query(BaseColumn).order_by(BaseColumn.order)}
+    submitted = {k for k, _ in items}
+
+    deleted = [row for k, row in existing.items() if k not in submitted] if allow_deletes else []
+    # rows kept but not submitted (allow_deletes=False) go after the submitted ones
+    kept = [row for k, row in existing.items() if k not in submitted and not allow_deletes]
+
+    changed = [
+        (existing[k], spec)
+        for k, spec in items
+        if k in existing and any(getattr(existing[k], f) != spec.get(f) for f in _SPEC_FIELDS)
+    ]
+    new = [(pos, k, spec) for pos, (k, spec) in enumerate(items, start=1) if k not in existing]
+
+    # final positions: submitted rows in the given order, kept-but-unsubmitted
+    # rows (allow_deletes=False) after them; new rows fill the remaining slots
+    final = {existing[k].id: pos for pos, (k, _) in enumerate(items, start=1) if k in existing}
+    final.update({r.id: len(items) + i for i, r in enumerate(kept, start=1)})
+    current = {row.id: row.order for row in existing.values()}
+    moves = {row_id: pos for row_id, pos in final.items() if current[row_id] != pos}
+
+    if not (deleted or changed or new or moves):
+        return
+
+    version = bump_version(db)
+
+    # ─── 1. deletes first: they free `order` values for the rest ─────────
+    if deleted:
+        db.execute(delete(BaseColumn).where(BaseColumn.id.in_([r.id for r in deleted])))
+        db.execute(
+            insert(Tombstone),
+            [{"entity": "base_column", "entity_id": r.id, "revision": version} for r in deleted],
+        )
+
+    # ─── 2. spec changes (UPDATE of the changed columns only) ────────────
+    for row, spec in changed:
+        for f in _SPEC_FIELDS:
+            setattr(row, f, spec.get(f))
+        row.revision = version
+
+    # ─── 3. moves, set-based ─────────────────────────────────────────────
+    _apply_orders(db, moves, version)
+
+    # ─── 4. inserts into the now-free positions ──────────────────────────
+    for pos, k, spec in new:
+        db.add(
+            BaseColumn(key=k, **{f: spec.get(f) for f in _SPEC_FIELDS}, order=pos, revision=version)
+        )
+
     db.commit()
 
 
@@ -93,6 +208,7 @@ def _to_dict(obj: GeneralSettings) -> dict[str, Any]:
     """
     emails: list[EmailModel] = obj.emails
     return {
+        "revision": obj.revision,
         "retry_attempts": obj.retry_attempts,
         "retry_delay": obj.retry_delay,
         "emails": [{"address": e.address, "display_name": e.display_name} for e in emails],
@@ -110,29 +226,106 @@ def load_settings(as_dict: bool = False) -> GeneralSettings:
     return _to_dict(s) if as_dict else s
 
 
+def read_settings(db: Session | None = None) -> Settings:
+    """
+    The general settings as an immutable struct, read as plain Core rows.
+    Creates the settings row (via `load_settings`, in the app session) on
+    first use.
+    """
+    db = db or database.session
+
+    row = db.execute(
+        select(
+            GeneralSettings.id,
+            GeneralSettings.revision,
+            GeneralSettings.retry_attempts,
+            GeneralSettings.retry_delay,
+        )
+        .order_by(GeneralSettings.id)
+        .limit(1)
+    ).first()
+    if row is None:
+        load_settings()
+        # `db` may be a snapshot transaction that cannot see the new row
+        return read_settings()
+
+    emails = db.execute(
+        select(EmailModel.address, EmailModel.display_name)
+        .where(EmailModel.settings_id == row.id)
+        .order_by(EmailModel.id)
+    )
+    return Settings(
+        revision=row.revision,
+        retry_attempts=row.retry_attempts,
+        retry_delay=row.retry_delay,
+        emails=[Email(*e) for e in emails],
+    )
+
+
 def save_settings(updated: GeneralSettings) -> bool:
+    """
+    Apply `updated` (a transient GeneralSettings carrying the form values
+    and its `emails`; set `id` to the settings row if known) to the stored
+    settings.
+
+    Only changed fields are written: e-mails are matched by address, so
+    unchanged ones are kept, renamed ones updated and the rest deleted or
+    inserted.  E-mails are stored in id order, so the submitted order is kept
+    by matching only while it follows the stored order; from the first new
+    or moved address on, rows are re-inserted.  A save that changes nothing
+    writes (and commits) nothing.  Returns False if there is no settings row.
+    """
     db: Session = database.session
 
-    existing = db.query(GeneralSettings).options(joinedload(GeneralSettings.emails)).first()
+    options = [joinedload(GeneralSettings.emails)]
+    if updated.id is not None:
+        # usually already loaded by the form view: no SELECT
+        existing = db.get(GeneralSettings, updated.id, options=options)
+    else:
+        existing = db.execute(select(GeneralSettings).options(*options).limit(1)).unique().scalar()
     if not existing:
         return False
 
-    # ─── grab the *new* addresses before we mutate anything ──────────
-    new_emails_data = [
-        (e.address.strip(), e.display_name.strip()) for e in updated.emails if e.address.strip()
+    wanted = [
+        (e.address.strip(), (e.display_name or "").strip())
+        for e in updated.emails
+        if (e.address or "").strip()
     ]
 
-    # scalar fields
-    existing.retry_attempts = updated.retry_attempts
-    existing.retry_delay = updated.retry_delay
+    # pair submitted addresses with stored rows, in order, duplicates included
+    by_address: dict[str, list[EmailModel]] = {}
+    for email in sorted(existing.emails, key=lambda e: e.id):
+        by_address.setdefault(email.address, []).append(email)
+    emails: list[EmailModel] = []
+    renamed: list[tuple[EmailModel, str]] = []
+    added = False
+    for address, display_name in wanted:
+        matches = by_address.get(address)
+        if not added and matches and (not emails or matches[0].id > emails[-1].id):
+            email = matches.pop(0)
+            if email.display_name != display_name:
+                renamed.append((email, display_name))
+        else:
+            # new ids are larger than every stored one: the rest is inserted
+            added = True
+            email = EmailModel(address=address, display_name=display_name)
+        emails.append(email)
+    removed = any(matches for matches in by_address.values())
 
-    # replace e-mails
-    existing.emails.clear()
-    db.flush()  # deletes issued now
+    scalars = {
+        "retry_attempts": updated.retry_attempts,
+        "retry_delay": updated.retry_delay,
+    }
+    scalars = {k: v for k, v in scalars.items() if getattr(existing, k) != v}
+    if not (scalars or renamed or added or removed):
+        return True
 
-    for addr, name in new_emails_data:
-        existing.emails.append(EmailModel(address=addr, display_name=name))
+    existing.revision = bump_version(db)
+    for field, value in scalars.items():
+        setattr(existing, field, value)
+    for email, display_name in renamed:
+        email.display_name = display_name
+    existing.emails = emails  # delete-orphan removes the unmatched rows
 
     db.commit()
-    db.refresh(existing)
     return True
@@ -29,6 +29,26 @@
       from < to ? refRow.nextSibling : refRow
     );
     renumberRows();
+    saveMove(dragSrc);
+  }
+
+  /* persist a move of an already-saved row right away (only the move) */
+  function saveMove(row) {
+    const url = container.dataset.orderUrl;
+    const key = row.dataset.key;
+    if (!url || !key) return;                        // unsaved row: form submit handles it
+
+    // position among the saved rows, which is what the server knows about
+    const saved = [...container.querySelectorAll(".base-columns-group[data-key]")];
+    const token = document.querySelector('#baseColumnsForm [name="csrf_token"]')?.value;
+
+    fetch(url, {
+      method: "PATCH",
+      headers: { "Content-Type": "application/json", "X-CSRFToken": token },
+      body: JSON.stringify({ moves: [{ key, to: saved.indexOf(row) + 1 }] }),
+    }).then(resp => {
+      if (!resp.ok) console.error("Failed to save column order", resp.status);
+    }).catch(err => console.error("Failed to save column order", err));
   }
   
   function renumberRows() {
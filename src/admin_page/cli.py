@@ -4,22 +4,30 @@ admin_page/cli.py
 Flask-CLI commands to seed reference data.
 
 $ flask bootstrap-base-columns
-$ flask bootstrap-customers
+$ flask bootstrap-customers [--dry-run] [--prune]
 $ flask bootstrap-all          # convenience wrapper
+$ flask import-customers FILE [--dry-run]   # NDJSON from /api/customer_configs/export
+$ flask slow-queries [--top N] [--sort total|max|mean|count] [--reset]
+$ flask prune-tombstones       # drop tombstones older than TOMBSTONE_RETENTION
 """
 
 from __future__ import annotations
 
 import json
+import time
 from pathlib import Path
 
 import click
 from flask import current_app
+from flask.cli import with_appcontext
 from sqlalchemy.orm import Session
+from werkzeug.exceptions import BadRequest
 
-from admin_page.blueprints.customers.services import save_config
+from admin_page.blueprints.customers.services import bulk_upsert_configs, import_configs_ndjson
 from admin_page.extensions import db
 from admin_page.models.base_column_model import BaseColumn
+from admin_page.slow_queries import slow_query_log
+from admin_page.versioning import bump_version, change_horizon, prune_tombstones, read_version
 
 # ---------------------------------------------------------------------------
 # helpers
@@ -57,6 +65,7 @@ def bootstrap_base_columns() -> None:
     BaseColumn.metadata.create_all(bind=engine, checkfirst=True)
 
     with Session(engine) as session:
+        version = bump_version(session)
         for position, (key, spec) in enumerate(data.items(), start=1):
             session.merge(
                 BaseColumn(
@@ -66,6 +75,7 @@ def bootstrap_base_columns() -> None:
                     length=spec.get("length"),
                     decimals=spec.get("decimals"),
                     order=position,
+                    revision=version,
                 )
             )
         session.commit()
@@ -75,9 +85,14 @@ def bootstrap_base_columns() -> None:
 
 
 @click.command("bootstrap-customers")
-def bootstrap_customers() -> None:
+@click.option("--dry-run", is_flag=True, help="Report what would change without writing.")
+@click.option("--prune", is_flag=True, help="Delete customers that have no JSON file.")
+@with_appcontext
+def bootstrap_customers(dry_run: bool, prune: bool) -> None:
     """
     Insert / update customer configs found in blueprints/customers/customer_configs/*.json
+
+    All files are upserted in one transaction; nothing is written if any fails.
     """
     cfg_dir = _app_root() / "blueprints" / "customers" / "customer_configs"
     json_files = sorted(cfg_dir.glob("*.json"))
@@ -85,13 +100,45 @@ def bootstrap_customers() -> None:
         click.echo(click.style(f"⚠  No JSON files in {cfg_dir}", fg="yellow"))
         return
 
-    for jf in json_files:
-        data = _load_json(jf)
-        try:
-            save_config(data)
-            click.echo(click.style(f"✓  {jf.name} → {data.get('name','?')}", fg="green"))
-        except Exception as exc:
-            click.echo(click.style(f"❌  {jf.name}: {exc}", fg="red"))
+    configs = [_load_json(jf) for jf in json_files]
+
+    started = time.perf_counter()
+    try:
+        stats = bulk_upsert_configs(configs, prune=prune, dry_run=dry_run)
+    except Exception as exc:
+        db.session.rollback()
+        click.echo(click.style(f"❌  {exc}", fg="red"))
+        raise click.Abort() from exc
+    elapsed = time.perf_counter() - started
+
+    summary = ", ".join(f"{n} {what}" for what, n in stats.items())
+    prefix = "(dry run) " if dry_run else ""
+    click.echo(click.style(f"✓  {prefix}{summary} in {elapsed:.2f}s", fg="green"))
+
+
+@click.command("import-customers")
+@click.argument("ndjson", type=click.File("rb"))
+@click.option("--dry-run", is_flag=True, help="Validate and report without writing.")
+@with_appcontext
+def import_customers(ndjson, dry_run: bool) -> None:
+    """
+    Upsert customer configs from an NDJSON file ("-" for stdin), as written
+    by GET /api/customer_configs/export – the scripted way to promote configs
+    between environments (POST /customers/import needs a browser CSRF token).
+
+    One transaction; a bad line aborts the import and writes nothing.
+    """
+    started = time.perf_counter()
+    try:
+        stats = import_configs_ndjson(ndjson, dry_run=dry_run)
+    except BadRequest as exc:
+        click.echo(click.style(f"❌  {exc.description}", fg="red"))
+        raise click.Abort() from exc
+    elapsed = time.perf_counter() - started
+
+    summary = ", ".join(f"{n} {what}" for what, n in stats.items())
+    prefix = "(dry run) " if dry_run else ""
+    click.echo(click.style(f"✓  {prefix}{summary} in {elapsed:.2f}s", fg="green"))
 
 
 # ---------------------------------------------------------------------------
@@ -109,6 +156,71 @@ def bootstrap_all(ctx: click.Context) -> None:
     ctx.invoke(bootstrap_customers)
 
 
+# ---------------------------------------------------------------------------
+# diagnostics
+# ---------------------------------------------------------------------------
+
+
+@click.command("slow-queries")
+@click.option("--top", default=20, show_default=True, help="Number of statements to list.")
+@click.option(
+    "--sort",
+    type=click.Choice(["total", "max", "mean", "count"]),
+    default="total",
+    show_default=True,
+)
+@click.option("--reset", is_flag=True, help="Clear the slow-query log after printing it.")
+@with_appcontext
+def slow_queries(top: int, sort: str, reset: bool) -> None:
+    """
+    Print the slowest statement fingerprints from the slow-query log.
+    """
+    log = slow_query_log(current_app)
+    if log is None:
+        click.echo(
+            click.style("⚠  Slow-query logging is off (SLOW_QUERY_THRESHOLD_MS=0)", fg="yellow")
+        )
+        return
+
+    files = log.path.with_name(f"{log.path.stem}.*{log.path.suffix}")  # one per process
+    report = log.report()
+    if not report:
+        click.echo(f"No statements slower than {log.threshold * 1000:g} ms in {files}")
+        return
+
+    ranked = sorted(report.items(), key=lambda item: getattr(item[1], sort), reverse=True)
+    click.echo(f"{'count':>7} {'total s':>9} {'mean ms':>9} {'max ms':>9}  statement")
+    for fp, stats in ranked[:top]:
+        click.echo(
+            f"{stats.count:>7} {stats.total:>9.3f} {stats.mean * 1000:>9.1f} "
+            f"{stats.max * 1000:>9.1f}  {fp}"
+        )
+    click.echo(f"({len(report)} fingerprints ≥ {log.threshold * 1000:g} ms, {files})")
+
+    if reset:
+        log.reset()
+        click.echo(click.style("✓  slow-query log cleared", fg="green"))
+
+
+# ---------------------------------------------------------------------------
+# maintenance
+# ---------------------------------------------------------------------------
+
+
+@click.command("prune-tombstones")
+@with_appcontext
+def prune_tombstones_command() -> None:
+    """
+    Delete tombstones more than TOMBSTONE_RETENTION config revisions old.
+    Change feeds then answer 410 for a `since` before the printed horizon.
+    """
+    deleted = prune_tombstones()
+    horizon = change_horizon(read_version())
+    click.echo(
+        click.style(f"✓  {deleted} tombstone(s) pruned; oldest valid since={horizon}", fg="green")
+    )
+
+
 # ---------------------------------------------------------------------------
 # registration helper
 # ---------------------------------------------------------------------------
@@ -118,5 +230,12 @@ def register_commands(app) -> None:
     """
     Call from create_app() to register the commands.
     """
-    for cmd in (bootstrap_base_columns, bootstrap_customers, bootstrap_all):
+    for cmd in (
+        bootstrap_base_columns,
+        bootstrap_customers,
+        import_customers,
+        bootstrap_all,
+        slow_queries,
+        prune_tombstones_command,
+    ):
         app.cli.add_command(cmd)
@@ -1,4 +1,6 @@
 import os
+from collections.abc import Mapping
+from typing import Any
 from urllib.parse import quote_plus
 
 basedir = os.path.abspath(os.path.dirname(__file__))
@@ -25,10 +27,45 @@ def _build_odbc():
         f"PWD={pwd};"
         f"Encrypt={encrypt};"
         f"TrustServerCertificate={trust};"
-        "Connection Timeout=30;"
+        f"Connection Timeout={os.getenv('SQL_LOGIN_TIMEOUT', '30')};"
     )
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    return default if value is None else value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def engine_options(config: Mapping[str, Any]) -> dict:
+    """
+    Default SQLAlchemy `create_engine` options for the app config (the
+    DB_* settings below).  Used by create_app() unless the config sets
+    SQLALCHEMY_ENGINE_OPTIONS.  The statement timeout and transient-fault
+    handling are engine events, see `admin_page.engine`.
+    """
+    uri: str = config["SQLALCHEMY_DATABASE_URI"]
+    options: dict = {}
+    if uri.startswith("sqlite"):
+        return options  # local development: SQLAlchemy's SQLite defaults
+
+    from admin_page.engine import TimedQueuePool
+
+    options.update(
+        poolclass=TimedQueuePool,  # reports checkout wait to /metrics
+        pool_size=config["DB_POOL_SIZE"],
+        max_overflow=config["DB_MAX_OVERFLOW"],
+        pool_timeout=config["DB_POOL_TIMEOUT"],
+        pool_recycle=config["DB_POOL_RECYCLE"],
+        pool_pre_ping=config["DB_POOL_PRE_PING"],
+    )
+    if uri.startswith("mssql+pyodbc"):
+        # batch executemany() into one round-trip (bulk upserts, link rows)
+        options["fast_executemany"] = True
+        # pyodbc's login timeout (SQL_ATTR_LOGIN_TIMEOUT)
+        options["connect_args"] = {"timeout": config["DB_LOGIN_TIMEOUT"]}
+    return options
+
+
 class Config:
     # Azure AD single-tenant
     AZURE_CLIENT_ID = os.getenv("AZURE_CLIENT_ID")
@@ -37,12 +74,25 @@ class Config:
     AZURE_AUTHORITY = f"https://login.microsoftonline.com/{AZURE_TENANT_ID}"
     AZURE_REDIRECT_PATH = "/auth/callback"
     AZURE_SCOPE = ["User.Read"]
+    # The MSAL client (and the authority metadata it discovered) is shared
+    # per process and rebuilt after this many seconds.
+    MSAL_METADATA_TTL = float(os.getenv("MSAL_METADATA_TTL", "86400"))
+    # Optional msal HttpClient (get/post) used instead of a requests.Session.
+    MSAL_HTTP_CLIENT = None
+    # MSAL token caches are kept per user oid outside the session (LRU + expiry)
+    TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "1000"))
+    TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "3600"))
 
     # Flask session
     SECRET_KEY = os.getenv("FLASK_SECRET_KEY")
 
-    # --- session storage ---
-    SESSION_TYPE = "filesystem"  # or "redis", "memcached", etc.
+    # --- session storage (see admin_page.sessions) ---
+    # "sql" keeps sessions in the config database, shared by all instances;
+    # "filesystem" / "cachelib" / ... are passed through to Flask-Session.
+    SESSION_TYPE = os.getenv("SESSION_TYPE", "sql")
+    SESSION_REFRESH_EACH_REQUEST = False  # write only on change (the sql store slides expiry)
+    SESSION_CLEANUP_INTERVAL = 300  # seconds between lazy purges of expired sessions
+    SESSION_CLEANUP_BATCH = 500  # expired rows removed per purge
     SESSION_FILE_THRESHOLD = 500  # keep a few hundred files then purge
     SESSION_FILE_DIR = "instance/sessions"  # customise as you like
     PERMANENT_SESSION_LIFETIME = 3600  # seconds
@@ -55,9 +105,67 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # --- engine tuning (see engine_options / admin_page.engine) ---
+    # One pool per Functions worker process: size it to the worker's threads.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", os.getenv("PYTHON_THREADPOOL_THREAD_COUNT", "5")))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "2"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # wait for a free connection
+    # Azure SQL drops connections idle for 30 min; recycle well before that
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1500"))
+    DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+    DB_LOGIN_TIMEOUT = int(os.getenv("SQL_LOGIN_TIMEOUT", "30"))
+    DB_STATEMENT_TIMEOUT = int(os.getenv("DB_STATEMENT_TIMEOUT", "30"))  # seconds, 0 = none
+    # Read the API snapshot in one SNAPSHOT-isolation transaction (MSSQL; needs
+    # ALLOW_SNAPSHOT_ISOLATION ON, the Azure SQL default)
+    DB_SNAPSHOT_ISOLATION = _env_bool("DB_SNAPSHOT_ISOLATION", True)
+
+    # --- read API ---
+    # How long (seconds) a process may trust its copy of the config version
+    # before re-reading config.config_version; bounds ETag staleness.
+    CONFIG_VERSION_TTL = float(os.getenv("CONFIG_VERSION_TTL", "5"))
+    # Tombstones older than this many config revisions may be pruned
+    # (`flask prune-tombstones`), so change feeds (`?since=`, /api/watch)
+    # answer 410 for a `since` further back than that, except since=0.
+    TOMBSTONE_RETENTION = int(os.getenv("TOMBSTONE_RETENTION", "10000"))
+
+    # /api/watch long-poll (see admin_page.watch): default and longest wait in
+    # seconds, and how many requests per process may wait at once – keep it
+    # below the worker's thread count so the admin UI still gets threads.
+    API_WATCH_TIMEOUT = float(os.getenv("API_WATCH_TIMEOUT", "25"))
+    API_WATCH_MAX_TIMEOUT = float(os.getenv("API_WATCH_MAX_TIMEOUT", "55"))
+    API_WATCH_MAX_WAITERS = int(os.getenv("API_WATCH_MAX_WAITERS", "8"))
+
+    # Per-client token bucket on /api/* (see admin_page.ratelimit): tokens per
+    # second and bucket size; API_RATE_LIMIT=0 turns it off.
+    API_RATE_LIMIT = float(os.getenv("API_RATE_LIMIT", "20"))
+    API_RATE_BURST = int(os.getenv("API_RATE_BURST", "60"))
+    API_RATE_MAX_CLIENTS = int(os.getenv("API_RATE_MAX_CLIENTS", "10000"))
+
+    # --- request instrumentation (see admin_page.instrumentation) ---
+    # Server-Timing header with the request's SQL / template time; exposes
+    # timings to every client, so only on by default in development.
+    SERVER_TIMING = _env_bool("SERVER_TIMING", False)
+    REQUEST_STATS_LOG = _env_bool("REQUEST_STATS_LOG", True)  # one log line per request
+
+    # --- /metrics (see admin_page.metrics) ---
+    METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
+    # Bearer token for scrapers; signed-in users can always read /metrics
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+    # --- slow-query log (see admin_page.slow_queries, `flask slow-queries`) ---
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "250"))  # 0 = off
+    # default: <instance>/slow_queries.json; each process writes slow_queries.<pid>.json beside it
+    SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG")
+    SLOW_QUERY_MAX_ENTRIES = int(os.getenv("SLOW_QUERY_MAX_ENTRIES", "500"))
+    SLOW_QUERY_FLUSH_INTERVAL = float(os.getenv("SLOW_QUERY_FLUSH_INTERVAL", "300"))
+
+    # rows per page on the customer list page
+    CUSTOMERS_PAGE_SIZE = int(os.getenv("CUSTOMERS_PAGE_SIZE", "100"))
+
 
 class Dev(Config):
     DEBUG = True
+    SERVER_TIMING = _env_bool("SERVER_TIMING", True)
 
 
 class Prod(Config):
@@ -0,0 +1,110 @@
+"""
+admin_page/engine.py
+--------------------
+Engine events that complement the pool options of `config.engine_options`:
+
+* every new MSSQL connection gets `DB_STATEMENT_TIMEOUT` as its pyodbc query
+  timeout, so a blocked statement cannot hold a worker thread forever;
+* pools are `TimedQueuePool`s, which report how long each checkout waited
+  for a connection (`admin_page.metrics` records it);
+* Azure SQL's transient error codes (failover, throttling, dropped idle
+  connections) are classified as disconnects.  SQLAlchemy then invalidates
+  the pool instead of handing the dead connections out again, and the
+  pre-ping on the next checkout reconnects transparently – so an instance
+  that sat idle does not fail its first request.
+
+The write paths use INSERT/UPDATE/DELETE … RETURNING (OUTPUT on MSSQL)
+without a fallback, so `init_engine` refuses a dialect that lacks it
+(SQLite older than 3.35, for instance).
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections.abc import Callable
+
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, ExceptionContext
+from sqlalchemy.pool import QueuePool
+
+from admin_page.extensions import db
+
+# https://learn.microsoft.com/azure/azure-sql/database/troubleshoot-common-errors-issues
+TRANSIENT_ERROR_CODES = frozenset(
+    {
+        20, 64, 233, 4060, 4221, 10053, 10054, 10060, 10928, 10929,
+        40143, 40197, 40501, 40540, 40613, 42108, 42109, 49918, 49919, 49920,
+    }
+)  # fmt: skip
+# pyodbc ends each diagnostic record with "(<native error>) (<ODBC function>)";
+# other parenthesized numbers in the text (e.g. a duplicate key value) are data
+_ERROR_CODE = re.compile(r"\((\d+)\)\s*\(SQL\w+\)")
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool calling `on_wait(seconds)` with the time each checkout took to get a connection."""
+
+    on_wait: Callable[[float], None] | None = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.on_wait is not None:
+                self.on_wait(time.perf_counter() - started)
+
+    def recreate(self) -> TimedQueuePool:
+        # the pool is recreated on dispose() and after a disconnect: keep the hook
+        pool = super().recreate()
+        pool.on_wait = self.on_wait
+        return pool
+
+
+def is_transient(exc: BaseException | None) -> bool:
+    """True if a DBAPI error's native error code is one of Azure SQL's transient ones."""
+    if exc is None:
+        return False
+    # pyodbc: ('42000', '[42000] [Microsoft][ODBC Driver 18 for SQL Server]... (40613)
+    # (SQLExecDirectW)') – one "(code) (SQL…)" pair per diagnostic record
+    return any(int(code) in TRANSIENT_ERROR_CODES for code in _ERROR_CODE.findall(str(exc)))
+
+
+def _mark_transient_as_disconnect(context: ExceptionContext) -> None:
+    if not context.is_disconnect and is_transient(context.original_exception):
+        context.is_disconnect = True
+
+
+def _install(engine: Engine, statement_timeout: int) -> None:
+    if engine.dialect.name != "mssql":
+        return
+
+    event.listen(engine, "handle_error", _mark_transient_as_disconnect)
+
+    if statement_timeout:
+
+        @event.listens_for(engine, "connect")
+        def _set_statement_timeout(dbapi_connection, _record) -> None:
+            dbapi_connection.timeout = statement_timeout  # pyodbc query timeout, seconds
+
+
+def _require_returning(engine: Engine) -> None:
+    dialect = engine.dialect
+    if not (dialect.insert_returning and dialect.update_returning and dialect.delete_returning):
+        raise RuntimeError(
+            f"{dialect.name} does not support INSERT/UPDATE/DELETE … RETURNING, "
+            "which the config write paths require"
+        )
+
+
+def init_engine(app: Flask) -> None:
+    """
+    Check the app's engine(s) support RETURNING and attach the events.
+    Call after `db.init_app`.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            _require_returning(engine)
+            _install(engine, app.config.get("DB_STATEMENT_TIMEOUT", 0))
@@ -1,10 +1,30 @@
 # src/admin_page/extensions.py
-from flask_migrate import Migrate
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from flask_session import Session
 from flask_sqlalchemy import SQLAlchemy
 from flask_wtf import CSRFProtect
 
+if TYPE_CHECKING:
+    from flask_migrate import Migrate
+
 db = SQLAlchemy()
 csrf = CSRFProtect()
 fsession = Session()
-migrate = Migrate()
+
+_migrate: Migrate | None = None
+
+
+def __getattr__(name: str):
+    # Flask-Migrate pulls in Alembic, which only the `flask db` commands need;
+    # create `migrate` on first access so serving processes never import it.
+    global _migrate
+    if name == "migrate":
+        if _migrate is None:
+            from flask_migrate import Migrate
+
+            _migrate = Migrate()
+        return _migrate
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
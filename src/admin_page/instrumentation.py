@@ -0,0 +1,212 @@
+"""
+admin_page/instrumentation.py
+-----------------------------
+Per-request cost accounting.
+
+Engine events count the SQL statements a request executes and sum their
+time; Flask's template signals time rendering.  After each request the
+totals are
+
+* logged as one structured line on the `admin_page.requests` logger (the
+  numbers are also attached as `record.request_stats` for JSON handlers),
+  when `REQUEST_STATS_LOG` is on;
+* sent as a `Server-Timing` header (`db`, `tpl` and `app` metrics, shown by
+  the browser's network panel), when `SERVER_TIMING` is on.
+
+Session loading happens before the request hooks run, so its query is not
+included; streamed bodies are accounted up to the first chunk.
+
+`query_budget(n)` is the test-side counterpart: it fails a block that runs
+more than `n` statements, to catch N+1 regressions in routes::
+
+    with query_budget(4):
+        client.get("/customers/1/edit")
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from flask import (
+    Flask,
+    Response,
+    before_render_template,
+    current_app,
+    g,
+    has_app_context,
+    request,
+    template_rendered,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from admin_page.extensions import db
+
+logger = logging.getLogger("admin_page.requests")
+
+_STATS_KEY = "_request_stats"
+_QUERY_STARTS = "request_stats_query_starts"  # Connection.info key
+
+
+class RequestStats:
+    """SQL and template cost of one request."""
+
+    __slots__ = ("started", "statements", "db_time", "template_time", "_template_starts")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self._template_starts: list[float] = []
+
+    @property
+    def total_time(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> dict[str, float | int]:
+        return {
+            "statements": self.statements,
+            "db_ms": round(self.db_time * 1000, 2),
+            "template_ms": round(self.template_time * 1000, 2),
+            "total_ms": round(self.total_time * 1000, 2),
+        }
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.statements} statements", '
+            f"tpl;dur={self.template_time * 1000:.2f}, "
+            f"app;dur={self.total_time * 1000:.2f}"
+        )
+
+
+def request_stats() -> RequestStats | None:
+    """The current request's stats, or None outside a request."""
+    return g.get(_STATS_KEY) if has_app_context() else None
+
+
+# ── SQL ──────────────────────────────────────────────────────────────────
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+    if request_stats() is not None:
+        conn.info.setdefault(_QUERY_STARTS, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+    starts = conn.info.get(_QUERY_STARTS)
+    stats = request_stats()
+    if not starts or stats is None:
+        return
+    stats.statements += 1
+    stats.db_time += time.perf_counter() - starts.pop()
+
+
+def _handle_error(context) -> None:
+    # a failed statement never reaches after_cursor_execute
+    starts = context.connection.info.get(_QUERY_STARTS) if context.connection else None
+    stats = request_stats()
+    if starts and stats is not None:
+        stats.statements += 1
+        stats.db_time += time.perf_counter() - starts.pop()
+
+
+# ── templates ────────────────────────────────────────────────────────────
+def _template_started(_sender, **_extra) -> None:
+    stats = request_stats()
+    if stats is not None:
+        stats._template_starts.append(time.perf_counter())
+
+
+def _template_finished(_sender, **_extra) -> None:
+    stats = request_stats()
+    if stats is None or not stats._template_starts:
+        return
+    started = stats._template_starts.pop()
+    if not stats._template_starts:  # count nested renders once, with their parent
+        stats.template_time += time.perf_counter() - started
+
+
+# ── request hooks ────────────────────────────────────────────────────────
+def _start_request() -> None:
+    g.setdefault(_STATS_KEY, RequestStats())
+
+
+def _finish_request(response: Response) -> Response:
+    stats = request_stats()
+    if stats is None:
+        return response
+
+    if current_app.config.get("SERVER_TIMING", False):
+        response.headers.add("Server-Timing", stats.server_timing())
+    if current_app.config.get("REQUEST_STATS_LOG", True):
+        values = stats.as_dict()
+        logger.info(
+            "%s %s status=%s statements=%d db_ms=%.2f template_ms=%.2f total_ms=%.2f",
+            request.method,
+            request.path,
+            response.status_code,
+            values["statements"],
+            values["db_ms"],
+            values["template_ms"],
+            values["total_ms"],
+            extra={
+                "request_stats": {
+                    "method": request.method,
+                    "path": request.path,
+                    "endpoint": request.endpoint,
+                    "status": response.status_code,
+                    **values,
+                }
+            },
+        )
+    return response
+
+
+def init_instrumentation(app: Flask) -> None:
+    """Hook the statement counters into the app's engine(s) and requests."""
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(engine, "handle_error", _handle_error)
+
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_finished, app)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+
+# ── tests ────────────────────────────────────────────────────────────────
+class QueryBudgetExceeded(AssertionError):
+    """A block ran more SQL statements than its `query_budget` allows."""
+
+
+@contextmanager
+def query_budget(max_statements: int) -> Iterator[list[str]]:
+    """
+    Fail with QueryBudgetExceeded if the block executes more than
+    `max_statements` SQL statements, on any engine, in the calling thread.
+    Yields the list the statements are recorded in.  Also usable as a
+    decorator.
+    """
+    statements: list[str] = []
+    thread = threading.get_ident()
+
+    def record(_conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+        if threading.get_ident() == thread:
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    if len(statements) > max_statements:
+        listing = "\n".join(f"  {i}. {s}" for i, s in enumerate(statements, start=1))
+        raise QueryBudgetExceeded(
+            f"{len(statements)} SQL statements executed, budget is {max_statements}:\n{listing}"
+        )
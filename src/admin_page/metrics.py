@@ -0,0 +1,278 @@
+"""
+admin_page/metrics.py
+---------------------
+In-process metrics, exposed in Prometheus text format at `/metrics`.
+
+* `admin_page_http_request_duration_seconds` – latency histogram per
+  blueprint and endpoint;
+* `admin_page_http_requests_total` – responses per endpoint and status code;
+* `admin_page_db_pool_checkout_wait_seconds` – time spent waiting for a
+  pooled connection (pools built with `engine.TimedQueuePool`, the default
+  outside SQLite);
+* `admin_page_db_pool_connections` – checked-out / idle / overflow
+  connections, read from the pool at scrape time;
+* `admin_page_cache_requests_total` and `admin_page_cache_hit_ratio` – hits
+  and misses of the config version copy, the config snapshot and ETag
+  revalidation (a 304 is a hit); for `single_flight` a hit is a read that
+  joined an identical one already in flight (see `admin_page.singleflight`).
+
+Recording takes no lock: every thread writes to its own shard (plain dicts
+and lists, updated under the GIL by that thread only) and a scrape sums the
+shards.  A new shard is registered under a lock once per thread.
+"""
+
+from __future__ import annotations
+
+import hmac
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+
+from flask import Flask, Response, current_app, request, session
+from sqlalchemy.pool import QueuePool
+
+from admin_page.extensions import db
+from admin_page.instrumentation import request_stats
+
+_EXTENSION_KEY = "metrics"
+PREFIX = "admin_page_"
+
+# Prometheus client defaults, seconds
+BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0,
+)  # fmt: skip
+
+Labels = tuple[tuple[str, str], ...]
+Sample = tuple[str, Labels, float]
+
+
+class _Shard:
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self) -> None:
+        self.counters: dict[tuple[str, Labels], float] = {}
+        # [count per bucket..., count above the last bucket, sum]
+        self.histograms: dict[tuple[str, Labels], list[float]] = {}
+
+
+class MetricsRegistry:
+    """Counters and histograms sharded per thread, plus gauges read at scrape time."""
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: list[_Shard] = []
+        self._help: dict[str, tuple[str, str]] = {}  # name -> (type, help)
+        self._gauges: list[Callable[[], Iterable[Sample]]] = []
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        self._help[name] = (kind, help_text)
+
+    def add_gauge(self, callback: Callable[[], Iterable[Sample]]) -> None:
+        """Register `callback() -> [(name, labels, value), ...]`, called on every scrape."""
+        self._gauges.append(callback)
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    # ── recording (hot path) ─────────────────────────────────────────────
+    def inc(self, name: str, labels: Labels = (), amount: float = 1) -> None:
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        histograms = self._shard().histograms
+        key = (name, labels)
+        h = histograms.get(key)
+        if h is None:
+            h = histograms[key] = [0.0] * (len(self.buckets) + 2)
+        h[bisect_left(self.buckets, value)] += 1
+        h[-1] += value
+
+    # ── collection ───────────────────────────────────────────────────────
+    def collect(self) -> tuple[dict[tuple[str, Labels], float], dict[tuple[str, Labels], list]]:
+        """Sum the shards: ({(name, labels): value}, {(name, labels): histogram})."""
+        with self._lock:
+            shards = list(self._shards)
+        counters: dict[tuple[str, Labels], float] = {}
+        histograms: dict[tuple[str, Labels], list[float]] = {}
+        for shard in shards:
+            for key, value in shard.counters.copy().items():
+                counters[key] = counters.get(key, 0) + value
+            for key, h in shard.histograms.copy().items():
+                total = histograms.setdefault(key, [0.0] * len(h))
+                for i, v in enumerate(list(h)):
+                    total[i] += v
+        return counters, histograms
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        counters, histograms = self.collect()
+        samples: dict[str, list[str]] = {}
+
+        for (name, labels), value in sorted(counters.items()):
+            samples.setdefault(name, []).append(_line(name, labels, value))
+
+        for (name, labels), h in sorted(histograms.items()):
+            lines = samples.setdefault(name, [])
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), h[:-1], strict=True):
+                cumulative += count
+                lines.append(_line(f"{name}_bucket", (*labels, ("le", _number(bound))), cumulative))
+            lines.append(_line(f"{name}_sum", labels, h[-1]))
+            lines.append(_line(f"{name}_count", labels, cumulative))
+
+        for callback in self._gauges:
+            for name, labels, value in callback():
+                samples.setdefault(name, []).append(_line(name, labels, value))
+
+        out: list[str] = []
+        for name, lines in samples.items():
+            kind, help_text = self._help.get(name, ("untyped", ""))
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(lines)
+        return "\n".join(out) + "\n"
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _line(name: str, labels: Labels, value: float) -> str:
+    if not labels:
+        return f"{name} {_number(value)}"
+    rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return f"{name}{{{rendered}}} {_number(value)}"
+
+
+# ── application hooks ────────────────────────────────────────────────────
+REQUEST_DURATION = PREFIX + "http_request_duration_seconds"
+REQUESTS = PREFIX + "http_requests_total"
+POOL_WAIT = PREFIX + "db_pool_checkout_wait_seconds"
+POOL_CONNECTIONS = PREFIX + "db_pool_connections"
+CACHE_REQUESTS = PREFIX + "cache_requests_total"
+CACHE_HIT_RATIO = PREFIX + "cache_hit_ratio"
+CACHES = ("config_version", "snapshot", "etag", "single_flight")
+
+_HIT = (("result", "hit"),)
+_MISS = (("result", "miss"),)
+_CACHE_LABELS = {
+    (cache, hit): (("cache", cache), *(_HIT if hit else _MISS))
+    for cache in CACHES
+    for hit in (True, False)
+}
+
+
+def metrics_registry() -> MetricsRegistry | None:
+    """The app's registry, or None if metrics are disabled."""
+    return current_app.extensions.get(_EXTENSION_KEY)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count one lookup of `cache` (one of CACHES)."""
+    registry = current_app.extensions.get(_EXTENSION_KEY)
+    if registry is not None:
+        registry.inc(CACHE_REQUESTS, _CACHE_LABELS[cache, hit])
+
+
+def _request_recorder(registry: MetricsRegistry) -> Callable[[Response], Response]:
+    label_cache: dict[str | None, Labels] = {}  # endpoint -> (blueprint, endpoint) labels
+
+    def record(response: Response) -> Response:
+        stats = request_stats()
+        if stats is None:
+            return response
+        endpoint = request._get_current_object().endpoint
+        labels = label_cache.get(endpoint)
+        if labels is None:
+            blueprint = endpoint.rpartition(".")[0] if endpoint else ""
+            labels = label_cache[endpoint] = (
+                ("blueprint", blueprint),
+                ("endpoint", endpoint or ""),
+            )
+        registry.observe(REQUEST_DURATION, labels, stats.total_time)
+        registry.inc(REQUESTS, (*labels, ("status", str(response.status_code))))
+        return response
+
+    return record
+
+
+def _pool_gauges(app: Flask) -> Callable[[], Iterator[Sample]]:
+    def collect() -> Iterator[Sample]:
+        with app.app_context():
+            engines = dict(db.engines)
+        for bind, engine in engines.items():
+            pool = engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            name = bind or "default"
+            yield POOL_CONNECTIONS, (("engine", name), ("state", "checked_out")), pool.checkedout()
+            yield POOL_CONNECTIONS, (("engine", name), ("state", "idle")), pool.checkedin()
+            yield POOL_CONNECTIONS, (("engine", name), ("state", "overflow")), max(
+                pool.overflow(), 0
+            )
+
+    return collect
+
+
+def _hit_ratios(registry: MetricsRegistry) -> Callable[[], Iterator[Sample]]:
+    def collect() -> Iterator[Sample]:
+        counters, _ = registry.collect()
+        for cache in CACHES:
+            labels = (("cache", cache),)
+            hits = counters.get((CACHE_REQUESTS, (*labels, *_HIT)), 0)
+            misses = counters.get((CACHE_REQUESTS, (*labels, *_MISS)), 0)
+            if hits or misses:
+                yield CACHE_HIT_RATIO, labels, hits / (hits + misses)
+
+    return collect
+
+
+def init_metrics(app: Flask) -> None:
+    """Create the app's registry and start recording, unless METRICS_ENABLED is off."""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    registry = MetricsRegistry()
+    registry.describe(REQUEST_DURATION, "histogram", "Request latency by endpoint.")
+    registry.describe(REQUESTS, "counter", "Responses by endpoint and status code.")
+    registry.describe(POOL_WAIT, "histogram", "Time waiting for a pooled DB connection.")
+    registry.describe(POOL_CONNECTIONS, "gauge", "DB pool connections by state.")
+    registry.describe(CACHE_REQUESTS, "counter", "Cache lookups by cache and result.")
+    registry.describe(CACHE_HIT_RATIO, "gauge", "Cache hits / lookups since start.")
+    registry.add_gauge(_pool_gauges(app))
+    registry.add_gauge(_hit_ratios(registry))
+    app.extensions[_EXTENSION_KEY] = registry
+
+    with app.app_context():
+        for bind, engine in db.engines.items():
+            labels = (("engine", bind or "default"),)
+            if hasattr(engine.pool, "on_wait"):
+                engine.pool.on_wait = lambda seconds, labels=labels: registry.observe(
+                    POOL_WAIT, labels, seconds
+                )
+
+    app.after_request(_request_recorder(registry))
+
+
+def metrics_authorized() -> bool:
+    """A signed-in user, or `Authorization: Bearer <METRICS_TOKEN>` (for scrapers)."""
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and request.authorization and request.authorization.type == "bearer":
+        return hmac.compare_digest(request.authorization.token or "", token)
+    return bool(session.get("user"))
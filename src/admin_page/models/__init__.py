@@ -3,6 +3,10 @@ from admin_page.extensions import db
 Base = db.Model
 
 from admin_page.models.base_column_model import BaseColumn  # noqa: E402, F401
+from admin_page.models.config_version_model import ConfigVersion  # noqa: E402, F401
+from admin_page.models.customer_konserni_model import CustomerKonserni  # noqa: E402, F401
 from admin_page.models.customer_model import Customer  # noqa: E402, F401
 from admin_page.models.email_model import EmailModel  # noqa: E402, F401
 from admin_page.models.general_settings_model import GeneralSettings  # noqa: E402, F401
+from admin_page.models.server_session_model import ServerSession  # noqa: E402, F401
+from admin_page.models.tombstone_model import Tombstone  # noqa: E402, F401
@@ -1,8 +1,8 @@
 # app/models/base_column_model.py
 from __future__ import annotations
 
-from sqlalchemy import Integer, String, func, select
-from sqlalchemy.orm import Mapped, mapped_column, object_session, validates
+from sqlalchemy import BigInteger, Integer, String, event, func, select
+from sqlalchemy.orm import Mapped, Session, mapped_column
 
 from admin_page.models import Base  # your shared DeclarativeBase
 
@@ -18,22 +18,42 @@ class BaseColumn(Base):
     dtype: Mapped[str] = mapped_column(String(20), nullable=False)  # "string" | "float" | "int"
     length: Mapped[int | None] = mapped_column(Integer, nullable=True)
     decimals: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # None on a new row = "append": filled in at flush time, see `reserve_orders`
     order: Mapped[int] = mapped_column(Integer, nullable=False, unique=True, index=True)
-
-    # ── auto-assign next order value if None ─────────────────────────────
-    @validates("order")
-    def _validate_or_autofill(self, _key: str, value: int | None) -> int:
-        if value is None:
-            sess = object_session(self)
-            if sess is None:
-                raise RuntimeError(
-                    "Object must be attached to a Session before 'order' can be auto-filled"
-                )
-
-            max_ord: int = sess.scalar(select(func.coalesce(func.max(BaseColumn.order), 0))) or 0
-            return max_ord + 1
-        return value
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
 
     # ── debug representation ────────────────────────────────────────────
     def __repr__(self) -> str:
-        return f"<BaseColumn {self.order:02d} {self.key} ({self.dtype})>"
+        order = "--" if self.order is None else f"{self.order:02d}"
+        return f"<BaseColumn {order} {self.key} ({self.dtype})>"
+
+
+# ── order allocation ────────────────────────────────────────────────────
+def reserve_orders(session: Session, count: int, *, after: int = 0) -> range:
+    """
+    Reserve `count` consecutive `order` values behind the current maximum
+    (and behind `after`) with one query.  On MSSQL the MAX() read takes an
+    update range lock, so concurrent transactions cannot reserve the same
+    block.  For Core bulk inserts; ORM rows with `order=None` get theirs
+    automatically when flushed.
+    """
+    if count <= 0:
+        return range(0)
+    stmt = select(func.coalesce(func.max(BaseColumn.order), 0)).with_hint(
+        BaseColumn, "WITH (UPDLOCK, HOLDLOCK)", "mssql"
+    )
+    with session.no_autoflush:
+        start = max(session.execute(stmt).scalar_one(), after) + 1
+    return range(start, start + count)
+
+
+@event.listens_for(Session, "before_flush")
+def _allocate_pending_orders(session: Session, _flush_context, _instances) -> None:
+    """Give every new BaseColumn without an `order` the next free one, in add() order."""
+    new = [obj for obj in session.new if isinstance(obj, BaseColumn)]
+    pending = [obj for obj in new if obj.order is None]
+    if not pending:
+        return
+    explicit = max((obj.order for obj in new if obj.order is not None), default=0)
+    for obj, order in zip(pending, reserve_orders(session, len(pending), after=explicit)):
+        obj.order = order
@@ -0,0 +1,25 @@
+# app/models/config_version_model.py
+from __future__ import annotations
+
+from sqlalchemy import BigInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from admin_page.models import Base  # your shared DeclarativeBase
+
+
+class ConfigVersion(Base):
+    """
+    Single-row table holding the global config version.
+
+    Every write path bumps `version` in the same transaction as its change,
+    so readers can validate caches with one primary-key lookup.
+    """
+
+    __tablename__ = "config_version"
+    __table_args__ = {"schema": "config"}
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<ConfigVersion {self.version}>"
@@ -0,0 +1,27 @@
+# app/models/customer_konserni_model.py
+from __future__ import annotations
+
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from admin_page.models import Base  # your shared DeclarativeBase
+
+
+class CustomerKonserni(Base):
+    """
+    Normalised copy of `Customer.konserni`, one row per (konserni, customer).
+
+    The primary key leads with `konserni_id`, so "which customers belong to
+    konserni X" is a clustered index seek.  Kept in sync by `save_config`.
+    """
+
+    __tablename__ = "customer_konserni"
+    __table_args__ = {"schema": "config"}
+
+    konserni_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    customer_id: Mapped[int] = mapped_column(
+        ForeignKey("config.customer_configs.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<CustomerKonserni {self.konserni_id} → {self.customer_id}>"
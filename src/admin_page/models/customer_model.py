@@ -1,15 +1,22 @@
 # app/models/config_model.py
 from __future__ import annotations
 
-from sqlalchemy import JSON, Boolean, String
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, BigInteger, Boolean, Index, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from admin_page.models import Base  # your shared DeclarativeBase
+from admin_page.models.customer_konserni_model import CustomerKonserni
 
 
 class Customer(Base):
     __tablename__ = "customer_configs"
-    __table_args__ = {"schema": "config"}
+    __table_args__ = (
+        # keyset pagination: each filter + ORDER BY name is one index range scan
+        Index("ix_customer_configs_enabled_name", "enabled", "name"),
+        Index("ix_customer_configs_source_container_name", "source_container", "name"),
+        Index("ix_customer_configs_destination_container_name", "destination_container", "name"),
+        {"schema": "config"},
+    )
 
     # ── columns ──────────────────────────────────────────────────────────
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -33,6 +40,14 @@ class Customer(Base):
 
     enabled: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
 
+    # config version of the last write that touched this row
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, index=True)
+
+    # indexed mirror of `konserni` (see CustomerKonserni)
+    konserni_links: Mapped[list[CustomerKonserni]] = relationship(
+        CustomerKonserni, cascade="all, delete-orphan"
+    )
+
     # ── representation ───────────────────────────────────────────────────
     def __repr__(self) -> str:
         return (
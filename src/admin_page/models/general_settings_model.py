@@ -1,5 +1,5 @@
 # app/models/general_settings_model.py
-from sqlalchemy import Integer
+from sqlalchemy import BigInteger, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from admin_page.models import Base
@@ -13,9 +13,11 @@ class GeneralSettings(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     retry_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
     retry_delay: Mapped[int] = mapped_column(Integer, nullable=False, default=5)
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
 
     emails: Mapped[list["EmailModel"]] = relationship(  # type: ignore[valid-type]
         "EmailModel",
         back_populates="settings",
         cascade="all, delete-orphan",
+        order_by="EmailModel.id",
     )
@@ -0,0 +1,27 @@
+# app/models/server_session_model.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from admin_page.models import Base  # your shared DeclarativeBase
+
+
+class ServerSession(Base):
+    """
+    Server-side Flask session (see `admin_page.sessions`).  `id` is the
+    prefixed session id from the cookie; `expiry` (naive UTC) is indexed so
+    expired rows can be purged in batches.
+    """
+
+    __tablename__ = "sessions"
+    __table_args__ = {"schema": "config"}
+
+    id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    expiry: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<ServerSession {self.id} until {self.expiry:%Y-%m-%d %H:%M}>"
@@ -0,0 +1,25 @@
+# app/models/tombstone_model.py
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from admin_page.models import Base  # your shared DeclarativeBase
+
+
+class Tombstone(Base):
+    """
+    Marker left behind when a config row is deleted, so change feeds can
+    report the deletion to clients that last synced before it.
+    """
+
+    __tablename__ = "tombstones"
+    __table_args__ = {"schema": "config"}
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    entity: Mapped[str] = mapped_column(String(50), nullable=False)  # "customer" | "base_column"
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<Tombstone {self.entity}#{self.entity_id} @{self.revision}>"
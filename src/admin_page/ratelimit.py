@@ -0,0 +1,87 @@
+"""
+admin_page/ratelimit.py
+-----------------------
+Per-client token bucket for the read API.
+
+Every client (the first `X-Forwarded-For` hop, else the peer address) gets
+a bucket of `API_RATE_BURST` tokens that refills at `API_RATE_LIMIT` tokens
+per second; each `/api/*` request takes one.  A client with an empty bucket
+gets 429 with a `Retry-After` header, so a misbehaving poller is slowed down
+before it can exhaust the connection pool the admin UI shares.
+
+Buckets live in process memory, one table per app, holding at most
+`API_RATE_MAX_CLIENTS` clients (least recently seen dropped first).  The
+forwarded address is not authenticated: this protects against runaway
+pollers, not against a client that lies about who it is.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import abort, current_app, request
+
+_EXTENSION_KEY = "api_rate_limit"
+
+
+class TokenBucketLimiter:
+    """{client: token bucket}, refilled lazily on each take."""
+
+    def __init__(self, rate: float, burst: int, *, max_clients: int = 10_000) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()  # client -> [tokens, at]
+
+    def take(self, client: str, now: float | None = None) -> float:
+        """
+        Take one token for `client`.  Returns 0 if it was granted, otherwise
+        the seconds until the next token is available.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = [float(self.burst), now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0.0
+            return (1 - bucket[0]) / self.rate
+
+
+def _limiter() -> TokenBucketLimiter | None:
+    limiter = current_app.extensions.get(_EXTENSION_KEY)
+    if limiter is None:
+        rate = current_app.config.get("API_RATE_LIMIT", 0)
+        if not rate:
+            return None
+        limiter = current_app.extensions.setdefault(
+            _EXTENSION_KEY,
+            TokenBucketLimiter(
+                rate,
+                current_app.config.get("API_RATE_BURST") or max(1, math.ceil(rate)),
+                max_clients=current_app.config.get("API_RATE_MAX_CLIENTS", 10_000),
+            ),
+        )
+    return limiter
+
+
+def limit_api_requests() -> None:
+    """`before_request` hook: answer 429 once the client's bucket is empty."""
+    limiter = _limiter()
+    if limiter is None:
+        return
+    wait = limiter.take(request.access_route[0] if request.access_route else "-")
+    if wait:
+        abort(429, description="Too many requests", retry_after=math.ceil(wait))
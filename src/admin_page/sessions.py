@@ -0,0 +1,190 @@
+"""
+admin_page/sessions.py
+----------------------
+Server-side session storage.
+
+`SESSION_TYPE = "sql"` (the default) keeps sessions in the config database
+(`config.sessions`), so every Functions instance sees the same sessions and
+no request touches local disk:
+
+* reads are one primary-key SELECT that ignores expired rows;
+* a session is written only when it changed – a page view that just reads
+  `session["user"]` writes nothing – except that the expiry slides forward
+  with a one-column UPDATE once less than half the lifetime is left;
+* expired rows are purged lazily, at most every `SESSION_CLEANUP_INTERVAL`
+  seconds and `SESSION_CLEANUP_BATCH` rows at a time, via the `expiry`
+  index (`flask session_cleanup` purges everything, for cron).
+
+Session I/O runs on its own connection, never on `db.session`, so it cannot
+commit or roll back a request's pending changes.  Like Flask-Session's own SQL
+backend, each storage call is retried (`retry_query`) on errors.  Those hooks
+are private Flask-Session API, hence the `flask-session` version pin.
+
+Any other SESSION_TYPE is handed to Flask-Session unchanged; `"cachelib"`
+without a `SESSION_CACHELIB` client gets an in-process `SimpleCache`, a local
+stand-in for a shared cache service.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask, Request
+from flask_session._utils import retry_query
+from flask_session.base import ServerSideSession, ServerSideSessionInterface
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.engine import Connection
+
+from admin_page.extensions import db, fsession
+from admin_page.models.server_session_model import ServerSession
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class SqlSession(ServerSideSession):
+    stored_expiry: datetime | None = None  # expiry of the stored row, None if not stored yet
+    touched = False  # stored (or expiry extended) during this request
+
+
+class SqlSessionInterface(ServerSideSessionInterface):
+    """Flask-Session interface storing sessions in `config.sessions`."""
+
+    session_class = SqlSession
+    ttl = False  # SQL has no TTL: the base class registers `flask session_cleanup`
+
+    def __init__(
+        self,
+        app: Flask,
+        *,
+        cleanup_interval: float = 300,
+        cleanup_batch: int = 500,
+        **kwargs,
+    ) -> None:
+        self.table = ServerSession.__table__
+        self.cleanup_interval = cleanup_interval
+        self.cleanup_batch = cleanup_batch
+        self._next_cleanup = 0.0
+        self._cleanup_lock = threading.Lock()
+        self._local = threading.local()
+        super().__init__(app, cleanup_n_requests=None, **kwargs)
+
+    # ── storage ──────────────────────────────────────────────────────────
+    @retry_query()
+    def _retrieve_session_data(self, store_id: str) -> dict | None:
+        with db.engine.connect() as conn:
+            row = conn.execute(
+                select(self.table.c.data, self.table.c.expiry).where(
+                    self.table.c.id == store_id, self.table.c.expiry > _utcnow()
+                )
+            ).first()
+        if row is None:
+            return None
+        self._local.expiry = row.expiry
+        return self.serializer.decode(row.data)
+
+    @retry_query()
+    def _delete_session(self, store_id: str) -> None:
+        with db.engine.begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.id == store_id))
+
+    @retry_query()
+    def _upsert_session(
+        self, session_lifetime: timedelta, session: SqlSession, store_id: str
+    ) -> None:
+        expiry = _utcnow() + session_lifetime
+        with db.engine.begin() as conn:
+            if session.modified or session.stored_expiry is None:
+                data = self.serializer.encode(session)
+                updated = conn.execute(
+                    update(self.table)
+                    .where(self.table.c.id == store_id)
+                    .values(data=data, expiry=expiry)
+                ).rowcount
+                if not updated:
+                    conn.execute(insert(self.table).values(id=store_id, data=data, expiry=expiry))
+            else:  # unchanged: just slide the expiry
+                conn.execute(
+                    update(self.table).where(self.table.c.id == store_id).values(expiry=expiry)
+                )
+            self._maybe_cleanup(conn)
+
+        session.stored_expiry = expiry
+        session.touched = True
+
+    # ── expiry ───────────────────────────────────────────────────────────
+    def _purge_batch(self, conn: Connection) -> int:
+        expired = (
+            select(self.table.c.id)
+            .where(self.table.c.expiry <= _utcnow())
+            .order_by(self.table.c.expiry)
+            .limit(self.cleanup_batch)
+        )
+        return conn.execute(delete(self.table).where(self.table.c.id.in_(expired))).rowcount
+
+    def _maybe_cleanup(self, conn: Connection) -> None:
+        now = time.monotonic()
+        if now < self._next_cleanup or not self._cleanup_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_cleanup = now + self.cleanup_interval
+            self._purge_batch(conn)
+        finally:
+            self._cleanup_lock.release()
+
+    @retry_query()
+    def _delete_expired_sessions(self) -> None:
+        while True:
+            with db.engine.begin() as conn:
+                if self._purge_batch(conn) < self.cleanup_batch:
+                    return
+
+    # ── write-only-on-change ─────────────────────────────────────────────
+    def _needs_touch(self, app: Flask, session: SqlSession) -> bool:
+        if session.stored_expiry is None or session.touched:
+            return False
+        remaining = session.stored_expiry - _utcnow()
+        return remaining < app.permanent_session_lifetime / 2
+
+    def should_set_storage(self, app: Flask, session: SqlSession) -> bool:
+        return session.modified or self._needs_touch(app, session)
+
+    def should_set_cookie(self, app: Flask, session: SqlSession) -> bool:
+        # re-issue the cookie whenever the stored expiry moved
+        return session.touched or super().should_set_cookie(app, session)
+
+    def open_session(self, app: Flask, request: Request) -> SqlSession:
+        self._local.expiry = None
+        session = super().open_session(app, request)
+        session.stored_expiry = self._local.expiry
+        return session
+
+
+def init_sessions(app: Flask) -> None:
+    """Install the session interface selected by `SESSION_TYPE`."""
+    config = app.config
+    session_type = config.get("SESSION_TYPE", "sql").lower()
+
+    if session_type != "sql":
+        if session_type == "cachelib" and config.get("SESSION_CACHELIB") is None:
+            from cachelib import SimpleCache
+
+            config["SESSION_CACHELIB"] = SimpleCache(
+                threshold=config.get("SESSION_FILE_THRESHOLD", 500),
+                default_timeout=int(app.permanent_session_lifetime.total_seconds()),
+            )
+        fsession.init_app(app)
+        return
+
+    app.session_interface = SqlSessionInterface(
+        app,
+        key_prefix=config.get("SESSION_KEY_PREFIX", "session:"),
+        permanent=config.get("SESSION_PERMANENT", True),
+        sid_length=config.get("SESSION_ID_LENGTH", 32),
+        serialization_format=config.get("SESSION_SERIALIZATION_FORMAT", "msgpack"),
+        cleanup_interval=config.get("SESSION_CLEANUP_INTERVAL", 300),
+        cleanup_batch=config.get("SESSION_CLEANUP_BATCH", 500),
+    )
@@ -0,0 +1,88 @@
+"""
+admin_page/singleflight.py
+--------------------------
+Request coalescing: concurrent identical reads share one execution.
+
+When a pipeline fan-out starts, dozens of workers ask for the same resource
+at the same moment.  `SingleFlight.do(key, fn)` lets the first caller for
+`key` run `fn()` while every caller that arrives before it finishes waits
+and receives the same result (or exception) instead of running `fn` again.
+Nothing is cached: once the call returns, the next caller for `key` starts
+a new one.
+
+Keys must identify everything the result depends on.  The read API keys its
+calls by resource and config version (the ETag), so a write that bumps the
+version never hands out a body read before it.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+from flask import current_app
+
+from admin_page.metrics import record_cache
+
+T = TypeVar("T")
+
+_EXTENSION_KEY = "single_flight"
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls by key (one process, any number of threads)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> tuple[T, bool]:
+        """
+        Return (`fn()`, shared): run `fn` unless a call for `key` is already
+        in flight, in which case wait for that one.  `shared` is True for
+        the callers that waited.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+def single_flight(key: Hashable, fn: Callable[[], T]) -> T:
+    """`SingleFlight.do` on the current app's instance, counted on /metrics."""
+    flight: SingleFlight = current_app.extensions.setdefault(_EXTENSION_KEY, SingleFlight())
+    result, shared = flight.do(key, fn)
+    record_cache("single_flight", hit=shared)
+    return result
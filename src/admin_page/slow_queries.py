@@ -0,0 +1,230 @@
+"""
+admin_page/slow_queries.py
+--------------------------
+Slow-query log aggregated by statement fingerprint.
+
+Every statement that takes at least `SLOW_QUERY_THRESHOLD_MS` is reduced to
+a fingerprint – literals replaced by `?`, IN / VALUES lists collapsed,
+whitespace normalised – and counted in a bounded in-memory table (count,
+total and max time per fingerprint).  When the table is full, a new
+fingerprint replaces the one with the least total time.
+
+The table is merged into a JSON file every `SLOW_QUERY_FLUSH_INTERVAL`
+seconds and at exit.  Each process writes its own file next to
+`SLOW_QUERY_LOG` (by default `<instance>/slow_queries.json`), named
+`slow_queries.<pid>.json`, so concurrent flushes never overwrite each other;
+`flask slow-queries` merges every process's file (totals survive restarts)
+and prints the top offenders.  `--reset` removes them all.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from flask import Flask
+from sqlalchemy import event
+
+from admin_page.extensions import db
+
+logger = logging.getLogger(__name__)
+
+_EXTENSION_KEY = "slow_queries"
+_QUERY_STARTS = "slow_query_starts"  # Connection.info key
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.\"\]])-?\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES = re.compile(r"(VALUES\s*\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """`statement` with its literals and list lengths stripped."""
+    fp = _STRING.sub("?", statement)
+    fp = _NUMBER.sub("?", fp)
+    fp = _LIST.sub("(...)", fp)
+    fp = _VALUES.sub(r"\1", fp)
+    return _SPACE.sub(" ", fp).strip()
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total: float = 0.0  # seconds
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other: QueryStats) -> None:
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+
+class SlowQueryLog:
+    """Bounded {fingerprint: QueryStats} table, flushed into a per-process JSON file."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        *,
+        threshold: float = 0.25,
+        max_entries: int = 500,
+        flush_interval: float = 300,
+    ) -> None:
+        self.path = Path(path)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._entries: dict[str, QueryStats] = {}
+        self._next_flush = time.monotonic() + flush_interval
+
+    def record(self, statement: str, seconds: float) -> None:
+        if seconds < self.threshold:
+            return
+        fp = fingerprint(statement)
+        with self._lock:
+            stats = self._entries.get(fp)
+            if stats is None:
+                if len(self._entries) >= self.max_entries:
+                    del self._entries[min(self._entries, key=lambda k: self._entries[k].total)]
+                stats = self._entries[fp] = QueryStats()
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            due = time.monotonic() >= self._next_flush
+        if due:
+            self.flush()
+
+    def pending(self) -> dict[str, QueryStats]:
+        with self._lock:
+            return {fp: QueryStats(**asdict(s)) for fp, s in self._entries.items()}
+
+    # ── persistence ──────────────────────────────────────────────────────
+    def _process_file(self) -> Path:
+        # looked up at flush time: a forked worker must not reuse its parent's file
+        return self.path.with_name(f"{self.path.stem}.{os.getpid()}{self.path.suffix}")
+
+    def _files(self) -> list[Path]:
+        """Every process's log file (and a pre-per-process shared one, if left over)."""
+        pattern = re.compile(rf"{re.escape(self.path.stem)}\.\d+{re.escape(self.path.suffix)}")
+        files = [self.path] if self.path.exists() else []
+        if self.path.parent.is_dir():
+            files += sorted(p for p in self.path.parent.iterdir() if pattern.fullmatch(p.name))
+        return files
+
+    @staticmethod
+    def _read(path: Path) -> dict[str, QueryStats]:
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError):
+            logger.warning("Unreadable slow-query log %s, skipping it", path)
+            return {}
+        return {fp: QueryStats(**s) for fp, s in raw.get("queries", {}).items()}
+
+    def load(self) -> dict[str, QueryStats]:
+        """The flushed totals of every process, merged."""
+        merged: dict[str, QueryStats] = {}
+        for path in self._files():
+            for fp, stats in self._read(path).items():
+                merged.setdefault(fp, QueryStats()).merge(stats)
+        return merged
+
+    def flush(self) -> None:
+        """Merge the in-memory table into this process's log file and clear it."""
+        with self._lock:
+            entries, self._entries = self._entries, {}
+            self._next_flush = time.monotonic() + self.flush_interval
+        if not entries:
+            return
+
+        # only this process writes its file; the lock orders its own threads
+        with self._flush_lock:
+            path = self._process_file()
+            try:
+                merged = self._read(path)
+                for fp, stats in entries.items():
+                    merged.setdefault(fp, QueryStats()).merge(stats)
+                if len(merged) > self.max_entries:
+                    keep = sorted(merged, key=lambda k: merged[k].total, reverse=True)
+                    merged = {fp: merged[fp] for fp in keep[: self.max_entries]}
+
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f"{path.name}.tmp")
+                body = {"queries": {fp: asdict(s) for fp, s in merged.items()}}
+                tmp.write_text(json.dumps(body, indent=1), encoding="utf-8")
+                os.replace(tmp, path)  # atomic: readers never see a partial file
+            except OSError:
+                logger.warning("Could not write slow-query log %s", path, exc_info=True)
+
+    def report(self) -> dict[str, QueryStats]:
+        """Flushed totals of every process plus what this one has not flushed yet."""
+        merged = self.load()
+        for fp, stats in self.pending().items():
+            merged.setdefault(fp, QueryStats()).merge(stats)
+        return merged
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        for path in self._files():
+            path.unlink(missing_ok=True)
+
+
+def slow_query_log(app: Flask) -> SlowQueryLog | None:
+    """The app's slow-query log, or None if it is disabled."""
+    return app.extensions.get(_EXTENSION_KEY)
+
+
+def init_slow_queries(app: Flask) -> None:
+    """Record slow statements of the app's engine(s), unless SLOW_QUERY_THRESHOLD_MS is 0."""
+    threshold_ms = app.config.get("SLOW_QUERY_THRESHOLD_MS", 250)
+    if not threshold_ms:
+        return
+
+    log = SlowQueryLog(
+        app.config.get("SLOW_QUERY_LOG") or os.path.join(app.instance_path, "slow_queries.json"),
+        threshold=threshold_ms / 1000,
+        max_entries=app.config.get("SLOW_QUERY_MAX_ENTRIES", 500),
+        flush_interval=app.config.get("SLOW_QUERY_FLUSH_INTERVAL", 300),
+    )
+    app.extensions[_EXTENSION_KEY] = log
+    atexit.register(log.flush)
+
+    def before(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+        conn.info.setdefault(_QUERY_STARTS, []).append(time.perf_counter())
+
+    def after(conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+        starts = conn.info.get(_QUERY_STARTS)
+        if starts:
+            log.record(statement, time.perf_counter() - starts.pop())
+
+    def failed(context) -> None:
+        # failed statements (e.g. a statement timeout) skip after_cursor_execute
+        starts = context.connection.info.get(_QUERY_STARTS) if context.connection else None
+        if starts:
+            elapsed = time.perf_counter() - starts.pop()
+            if context.statement:
+                log.record(context.statement, elapsed)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", before)
+            event.listen(engine, "after_cursor_execute", after)
+            event.listen(engine, "handle_error", failed)
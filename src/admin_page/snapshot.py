@@ -0,0 +1,179 @@
+"""
+admin_page/snapshot.py
+----------------------
+Immutable, process-wide snapshot of the config tables for the read paths.
+
+The three config tables are small, so `/api/*` and the manual-run page serve
+from one in-memory copy instead of querying on every request.  A snapshot is
+tagged with the config version it was loaded at (see `admin_page.versioning`)
+and rebuilt only when `current_version()` reports a newer one, which keeps
+several Functions instances coherent within `CONFIG_VERSION_TTL` seconds.
+Rows are read with Core selects into the msgspec structs of
+`admin_page.structs`, and the bodies are encoded with msgspec.
+
+Each snapshot also carries every customer's compiled effective schema (see
+`effective_schema`).  A rebuild reuses the previous snapshot's schema for a
+customer whose revision is unchanged, as long as the base columns are too,
+so only the touched customers are recompiled.
+
+All tables are read in one transaction on a connection of its own, at
+SNAPSHOT isolation on MSSQL (`DB_SNAPSHOT_ISOLATION`; the database needs
+ALLOW_SNAPSHOT_ISOLATION ON, the Azure SQL default).  The version and every
+row then come from the same committed state, without blocking writers – the
+guarantee `/api/bundle` hands on to a pipeline run.
+"""
+
+from __future__ import annotations
+
+import gzip
+import threading
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import cached_property
+from types import MappingProxyType
+
+import msgspec
+from flask import current_app
+from sqlalchemy.orm import Session
+
+from admin_page.blueprints.customers.services import effective_schema, read_configs
+from admin_page.blueprints.settings.services import read_base_columns, read_settings
+from admin_page.extensions import db as database
+from admin_page.metrics import record_cache
+from admin_page.structs import BaseColumnSpec, CustomerConfig, Settings, encoder
+from admin_page.versioning import current_version, read_version
+
+_EXTENSION_KEY = "config_snapshot"
+
+# isolation level that gives one transaction a stable view without locking
+_SNAPSHOT_ISOLATION = {"mssql": "SNAPSHOT", "postgresql": "REPEATABLE READ"}
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Read-only view of all config rows at one `version`."""
+
+    version: int
+    customers: tuple[CustomerConfig, ...]  # ordered by name
+    customers_by_id: Mapping[int, CustomerConfig]
+    base_columns: Mapping[str, BaseColumnSpec]  # ordered by `order`
+    settings: Settings
+    # Pre-encoded API bodies – built once per version, served as-is.
+    customers_json: bytes = field(repr=False)
+    settings_json: bytes = field(repr=False)
+    # {customer id: (customer revision, encoded effective schema)}
+    schemas_json: Mapping[int, tuple[int, bytes]] = field(repr=False)
+    enabled_schemas_json: bytes = field(repr=False)  # JSON array, ordered by name
+    # {"version", "customers", "base_columns", "settings"} in one body
+    bundle_json: bytes = field(repr=False)
+
+    @cached_property
+    def bundle_gzip(self) -> bytes:
+        """`bundle_json` gzip-compressed, on first use."""
+        return gzip.compress(self.bundle_json, compresslevel=6, mtime=0)
+
+
+class _SnapshotHolder:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.snapshot: ConfigSnapshot | None = None
+
+
+def _compile_schemas(
+    customers: tuple[CustomerConfig, ...],
+    base_columns: Mapping[str, BaseColumnSpec],
+    previous: ConfigSnapshot | None,
+) -> dict[int, tuple[int, bytes]]:
+    """Encode each customer's effective schema, reusing unchanged ones from `previous`."""
+    reusable: Mapping[int, tuple[int, bytes]] = {}
+    if previous is not None and list(previous.base_columns.items()) == list(base_columns.items()):
+        reusable = previous.schemas_json
+
+    out: dict[int, tuple[int, bytes]] = {}
+    for customer in customers:
+        cached = reusable.get(customer.id)
+        if cached is not None and cached[0] == customer.revision:
+            out[customer.id] = cached
+        else:
+            out[customer.id] = (
+                customer.revision,
+                encoder.encode(effective_schema(customer, base_columns)),
+            )
+    return out
+
+
+@contextmanager
+def _consistent_read() -> Iterator[Session]:
+    """A session on its own connection, inside one (snapshot-isolated) read transaction."""
+    engine = database.engine
+    level = None
+    if current_app.config.get("DB_SNAPSHOT_ISOLATION", True):
+        level = _SNAPSHOT_ISOLATION.get(engine.dialect.name)
+
+    with engine.connect() as conn:
+        if level is not None:
+            conn.execution_options(isolation_level=level)  # reset when returned to the pool
+        with Session(bind=conn) as session, session.begin():
+            yield session
+
+
+def _load(previous: ConfigSnapshot | None = None) -> ConfigSnapshot:
+    """Read all config tables (Core rows, no ORM objects) and build a new snapshot."""
+    with _consistent_read() as db:
+        version = read_version(db)
+        customers = tuple(read_configs(db))
+        base_columns = read_base_columns(db)
+        settings = read_settings(db)
+
+    schemas = _compile_schemas(customers, base_columns, previous)
+    enabled_schemas = b",".join(schemas[c.id][1] for c in customers if c.enabled)
+    settings_body = {**msgspec.structs.asdict(settings), "base_columns": base_columns}
+    customers_json = encoder.encode(customers)
+    # spliced from the parts, so the customer list is encoded only once
+    bundle_json = b"".join(
+        (
+            b'{"version":%d,"customers":' % version,
+            customers_json,
+            b',"base_columns":',
+            encoder.encode(base_columns),
+            b',"settings":',
+            encoder.encode(settings),
+            b"}",
+        )
+    )
+    return ConfigSnapshot(
+        version=version,
+        customers=customers,
+        customers_by_id=MappingProxyType({c.id: c for c in customers}),
+        base_columns=MappingProxyType(base_columns),
+        settings=settings,
+        customers_json=customers_json,
+        settings_json=encoder.encode(settings_body),
+        schemas_json=MappingProxyType(schemas),
+        enabled_schemas_json=b"[" + enabled_schemas + b"]",
+        bundle_json=bundle_json,
+    )
+
+
+def get_snapshot() -> ConfigSnapshot:
+    """
+    Return the current config snapshot, reloading it if the config version
+    has moved past the cached one.  Concurrent callers share one reload.
+    """
+    holder: _SnapshotHolder = current_app.extensions.setdefault(_EXTENSION_KEY, _SnapshotHolder())
+    version = current_version()
+
+    snapshot = holder.snapshot
+    if snapshot is not None and snapshot.version >= version:
+        record_cache("snapshot", hit=True)
+        return snapshot
+
+    with holder.lock:
+        snapshot = holder.snapshot
+        if snapshot is None or snapshot.version < version:
+            record_cache("snapshot", hit=False)
+            snapshot = holder.snapshot = _load(snapshot)
+        else:
+            record_cache("snapshot", hit=True)  # another thread just reloaded it
+    return snapshot
@@ -0,0 +1,70 @@
+"""
+admin_page/structs.py
+---------------------
+Typed, immutable read models for the API.
+
+The read path builds these straight from Core `select()` rows (see
+`read_configs`, `read_base_columns` and `read_settings`), so no ORM instances
+are created, and encodes them with msgspec instead of walking dicts through
+Flask's JSON provider.  Field order is the JSON key order.
+"""
+
+from __future__ import annotations
+
+import msgspec
+
+
+class CustomerConfig(msgspec.Struct, frozen=True):
+    id: int
+    name: str
+    konserni: list[int]
+    source_container: str
+    destination_container: str
+    file_format: str
+    file_encoding: str
+    extra_columns: dict[str, dict[str, str]] | None
+    exclude_columns: list[str] | None
+    enabled: bool
+    revision: int
+
+
+class BaseColumnSpec(msgspec.Struct, frozen=True):
+    """One base column; keyed by its `key` wherever it is used."""
+
+    name: str
+    dtype: str
+    length: int | None
+    decimals: int | None
+
+
+class Email(msgspec.Struct, frozen=True):
+    address: str
+    display_name: str
+
+
+class Settings(msgspec.Struct, frozen=True):
+    revision: int
+    retry_attempts: int
+    retry_delay: int
+    emails: list[Email]
+
+
+class SchemaColumn(msgspec.Struct, frozen=True):
+    position: int
+    key: str
+    name: str | None
+    dtype: str | None
+    length: int | None
+    decimals: int | None
+    source: str  # "base" | "extra"
+
+
+class EffectiveSchema(msgspec.Struct, frozen=True):
+    customer_id: int
+    name: str
+    revision: int
+    columns: list[SchemaColumn]
+
+
+# msgspec encoders are thread-safe and cheap to reuse
+encoder = msgspec.json.Encoder()
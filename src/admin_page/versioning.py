@@ -0,0 +1,197 @@
+"""
+admin_page/versioning.py
+------------------------
+Global config version used to validate caches of the read API.
+
+Write paths call `bump_version()` inside their own transaction, so the
+version in `config.config_version` moves exactly when committed data does.
+Readers call `current_version()`, which answers from a process-local copy
+and only goes back to SQL once `CONFIG_VERSION_TTL` seconds have passed;
+threads that find the copy expired at the same time share one read.
+`wait_for_version()` blocks until the version moves: a commit in this
+process wakes it at once, one on another instance at the next refresh.
+
+Deletions are reported to change feeds through tombstones, which
+`prune_tombstones()` drops once they are `TOMBSTONE_RETENTION` revisions
+old; `change_horizon()` is the oldest `since` a feed can still answer.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from flask import current_app, has_app_context
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.orm import Session
+
+from admin_page.extensions import db as database
+from admin_page.metrics import record_cache
+from admin_page.models.config_version_model import ConfigVersion
+from admin_page.models.tombstone_model import Tombstone
+from admin_page.singleflight import single_flight
+
+_ROW_ID = 1
+_PENDING_KEY = "config_version"  # Session.info key: version bumped but not yet committed
+_EXTENSION_KEY = "config_version"
+
+
+class _VersionState:
+    """Process-local copy of the version, one per Flask app."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)  # notified when `version` grows
+        self.version: int | None = None
+        self.checked_at: float = 0.0
+
+    def remember(self, version: int) -> None:
+        """
+        Store `version` as the local copy, unless it is older than the copy.
+
+        The version only ever grows, so an older value is stale: e.g. a
+        database read that started before a local commit published a newer
+        version.
+        """
+        with self.lock:
+            if self.version is None or version > self.version:
+                if self.version is not None:
+                    self.changed.notify_all()
+                self.version = version
+            self.checked_at = time.monotonic()
+
+
+def _state() -> _VersionState:
+    return current_app.extensions.setdefault(_EXTENSION_KEY, _VersionState())
+
+
+def bump_version(db: Session | None = None) -> int:
+    """
+    Increment the global config version inside the caller's transaction.
+
+    The new value becomes visible to `current_version()` in this process as
+    soon as the transaction commits; a rollback discards it.
+    """
+    db = db or database.session
+
+    stmt = (
+        update(ConfigVersion)
+        .where(ConfigVersion.id == _ROW_ID)
+        .values(version=ConfigVersion.version + 1)
+    )
+    # UPDATE … RETURNING / OUTPUT inserted.version: one round-trip
+    # (RETURNING support is checked once, by `engine.init_engine`)
+    version = db.execute(stmt.returning(ConfigVersion.version)).scalar_one_or_none()
+    if version is None:
+        # Fresh database (e.g. db.create_all() in dev) – seed the row.
+        version = 1
+        db.add(ConfigVersion(id=_ROW_ID, version=version))
+        db.flush()
+
+    db.info[_PENDING_KEY] = version
+    return version
+
+
+def read_version(db: Session | None = None) -> int:
+    """Read the version straight from the database (no caching)."""
+    db = db or database.session
+    return db.scalar(select(ConfigVersion.version).where(ConfigVersion.id == _ROW_ID)) or 0
+
+
+def current_version(*, max_age: float | None = None) -> int:
+    """
+    Return the global config version.
+
+    Parameters
+    ----------
+    max_age
+        Accept a process-local copy this many seconds old.  Defaults to
+        `CONFIG_VERSION_TTL`; pass 0 to force a database read.
+    """
+    if max_age is None:
+        max_age = current_app.config.get("CONFIG_VERSION_TTL", 5)
+
+    state = _state()
+    with state.lock:
+        version, checked_at = state.version, state.checked_at
+    if version is not None and time.monotonic() - checked_at < max_age:
+        record_cache("config_version", hit=True)
+        return version
+
+    record_cache("config_version", hit=False)
+    if max_age > 0:
+        # a read already in flight is at most `max_age` old by the time it returns
+        version = single_flight(_EXTENSION_KEY, read_version)
+    else:
+        version = read_version()
+    state.remember(version)
+    return state.version
+
+
+def wait_for_version(since: int, timeout: float) -> int:
+    """
+    Block until the config version is past `since`, or `timeout` seconds
+    have passed, and return the current version.
+
+    A commit in this process wakes the caller immediately; a commit on
+    another instance is seen when the local copy is next refreshed (every
+    `CONFIG_VERSION_TTL` seconds, one read per process however many callers
+    wait).  The app session is closed between checks so a waiting request
+    does not hold a pooled connection.
+    """
+    state = _state()
+    ttl = current_app.config.get("CONFIG_VERSION_TTL", 5)
+    recheck = ttl if ttl > 0 else 1.0
+    deadline = time.monotonic() + timeout
+
+    while True:
+        version = current_version()
+        remaining = deadline - time.monotonic()
+        if version > since or remaining <= 0:
+            return version
+
+        database.session.close()
+        with state.changed:
+            if state.version is None or state.version <= since:
+                state.changed.wait(min(remaining, recheck))
+
+
+def change_horizon(version: int) -> int:
+    """
+    The oldest `since` a change feed can answer at config `version`: older
+    tombstones may have been pruned.  `since=0` (a full sync, which needs
+    no tombstones) is always answerable.
+    """
+    return max(0, version - current_app.config["TOMBSTONE_RETENTION"])
+
+
+def prune_tombstones(db: Session | None = None) -> int:
+    """Delete the tombstones behind the change horizon and commit; returns how many."""
+    db = db or database.session
+
+    horizon = change_horizon(read_version(db))
+    deleted = db.execute(delete(Tombstone).where(Tombstone.revision <= horizon)).rowcount
+    db.commit()
+    return deleted
+
+
+def etag_for(resource: str, version: int) -> str:
+    """Strong entity tag for `resource` at config `version`."""
+    return f"{resource}-{version}"
+
+
+# ---------------------------------------------------------------------------
+# session hooks – publish bumped versions only once they are committed
+# ---------------------------------------------------------------------------
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_version(session: Session) -> None:
+    version = session.info.pop(_PENDING_KEY, None)
+    if version is not None and has_app_context():
+        _state().remember(version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_version(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
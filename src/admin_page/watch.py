@@ -0,0 +1,123 @@
+"""
+admin_page/watch.py
+-------------------
+Change notifications for `/api/watch` (long-poll).
+
+A watcher sends the last config version it has seen and is held until the
+version moves past it (see `versioning.wait_for_version`); it then gets the
+ids of the entities changed since, instead of re-reading everything:
+
+    {"version": 42, "since": 40,
+     "changed": {"customers": [3, 7], "base_columns": [], "settings": false},
+     "deleted": {"customers": [5], "base_columns": []}}
+
+Every write path bumps the version in its transaction, so every committed
+change wakes the watchers of this process; other instances' changes are
+noticed with the version refresh (`CONFIG_VERSION_TTL`).  Watchers released
+by the same change share one query for the ids (`single_flight`), and at
+most `API_WATCH_MAX_WAITERS` requests per process wait at a time, so long
+polls cannot take every worker thread.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from flask import current_app
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.orm import Session
+from werkzeug.exceptions import Gone
+
+from admin_page.extensions import db as database
+from admin_page.models.base_column_model import BaseColumn
+from admin_page.models.customer_model import Customer
+from admin_page.models.general_settings_model import GeneralSettings
+from admin_page.models.tombstone_model import Tombstone
+from admin_page.singleflight import single_flight
+from admin_page.versioning import change_horizon, read_version, wait_for_version
+
+_EXTENSION_KEY = "watch_waiters"
+
+
+def list_changed_ids(since: int, db: Session | None = None) -> dict[str, Any]:
+    """
+    Ids of the customers, base columns and settings changed or deleted after
+    config revision `since`, read with one UNION ALL.
+
+    The version is read before the rows, so a change racing with this call
+    is reported again next time rather than missed.  Raises Gone if `since`
+    is behind the change horizon (see `versioning.change_horizon`).
+    """
+    db = db or database.session
+
+    version = read_version(db)
+    if since and since < change_horizon(version):
+        raise Gone(f"Revision {since} is too old, resync from since=0.")
+    rows = db.execute(
+        union_all(
+            select(literal("changed"), literal("customer"), Customer.id).where(
+                Customer.revision > since
+            ),
+            select(literal("changed"), literal("base_column"), BaseColumn.id).where(
+                BaseColumn.revision > since
+            ),
+            select(literal("changed"), literal("settings"), GeneralSettings.id).where(
+                GeneralSettings.revision > since
+            ),
+            select(literal("deleted"), Tombstone.entity, Tombstone.entity_id).where(
+                Tombstone.revision > since
+            ),
+        )
+    )
+
+    changed: dict[str, list[int]] = {"customer": [], "base_column": [], "settings": []}
+    deleted: dict[str, list[int]] = {"customer": [], "base_column": []}
+    for action, entity, entity_id in rows:
+        target = deleted if action == "deleted" else changed
+        if entity in target:
+            target[entity].append(entity_id)
+
+    return {
+        "version": version,
+        "since": since,
+        "changed": {
+            "customers": sorted(changed["customer"]),
+            "base_columns": sorted(changed["base_column"]),
+            "settings": bool(changed["settings"]),
+        },
+        "deleted": {
+            "customers": sorted(set(deleted["customer"])),
+            "base_columns": sorted(set(deleted["base_column"])),
+        },
+    }
+
+
+def _waiters() -> threading.BoundedSemaphore:
+    return current_app.extensions.setdefault(
+        _EXTENSION_KEY,
+        threading.BoundedSemaphore(current_app.config["API_WATCH_MAX_WAITERS"]),
+    )
+
+
+class TooManyWatchers(Exception):
+    """`API_WATCH_MAX_WAITERS` requests are already waiting in this process."""
+
+
+def watch(since: int, timeout: float) -> dict[str, Any] | None:
+    """
+    Wait up to `timeout` seconds for the config version to pass `since`.
+    Returns `list_changed_ids(since)`, or None if nothing changed in time.
+    Raises TooManyWatchers if the process is already at its waiter limit.
+    """
+    waiters = _waiters()
+    if not waiters.acquire(blocking=False):
+        raise TooManyWatchers
+    try:
+        version = wait_for_version(since, timeout)
+    finally:
+        waiters.release()
+
+    if version <= since:
+        return None
+    return single_flight(("watch", since, version), lambda: list_changed_ids(since))
@@ -1,19 +1,97 @@
 # tests/conftest.py
 import pytest
+
 from admin_page import create_app
 from admin_page.config import Dev
 from admin_page.extensions import db
 
 
-@pytest.fixture
-def app(tmp_path):
-    Dev.SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path/'test.db'}"
-    app = create_app(Dev)
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks", "service-layer benchmarks (tests/test_benchmarks.py)")
+    group.addoption(
+        "--benchmark", action="store_true", help="run the benchmarks (skipped by default)"
+    )
+    group.addoption(
+        "--bench-customers",
+        default="1000,10000",
+        help="comma-separated customer volumes to seed (default: 1000,10000)",
+    )
+    group.addoption(
+        "--bench-base-columns", type=int, default=200, help="base columns to seed (default: 200)"
+    )
+    group.addoption(
+        "--bench-repeat", type=int, default=5, help="timed runs per operation (default: 5)"
+    )
+    group.addoption(
+        "--bench-json",
+        default="bench-results.json",
+        help="where to write the JSON results (default: bench-results.json)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: service-layer benchmark, needs --benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmark: run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def make_app(db_path, *, serving=False, **config):
+    """The SQLite-backed test app with its tables created; `config` overrides settings."""
+
+    class TestConfig(Dev):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        # SQLite has no schemas: map the models' "config" schema onto the default one
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            "execution_options": {"schema_translate_map": {"config": None}}
+        }
+        SECRET_KEY = "test"
+        WTF_CSRF_ENABLED = False
+
+    for key, value in config.items():
+        setattr(TestConfig, key, value)
+
+    app = create_app(TestConfig, serving=serving)
     with app.app_context():
         db.create_all()
-    yield app
+    return app
+
+
+def customer_form(name: str = "acme", **overrides) -> dict:
+    """A valid `save_config` payload for customer `name`; `overrides` replace fields."""
+    return {
+        "name": name,
+        "konserni": [1],
+        "source_container": "in",
+        "destination_container": "out",
+        "file_format": "csv",
+        "file_encoding": "utf-8",
+        "extra_columns": [],
+        "exclude_columns": [],
+        "enabled": True,
+        **overrides,
+    }
+
+
+@pytest.fixture
+def app(tmp_path):
+    yield make_app(tmp_path / "test.db")
 
 
 @pytest.fixture
 def client(app):
     return app.test_client()
+
+
+@pytest.fixture
+def logged_in(client):
+    """`client` with a signed-in user in its session."""
+    with client.session_transaction() as sess:
+        sess["user"] = {"name": "Test User", "oid": "user-oid"}
+    return client
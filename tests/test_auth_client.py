@@ -0,0 +1,158 @@
+import base64
+import json
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from admin_page.blueprints.auth.client import get_msal_client
+from admin_page.blueprints.auth.token_cache import TokenCacheStore, token_cache_store
+
+TENANT = "00000000-0000-0000-0000-000000000001"
+CLIENT_ID = "11111111-1111-1111-1111-111111111111"
+AUTHORITY = f"https://login.microsoftonline.com/{TENANT}"
+ISSUER = f"https://login.microsoftonline.com/{TENANT}/v2.0"
+
+
+def _b64(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+class _Response:
+    def __init__(self, payload: dict, status_code: int = 200) -> None:
+        self.status_code = status_code
+        self.text = json.dumps(payload)
+        self.headers: dict[str, str] = {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(self.text)
+
+
+class StubIdentityProvider:
+    """In-process msal `http_client` standing in for Entra ID."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, str]] = []
+
+    def discovery_count(self) -> int:
+        return sum(url.endswith("/.well-known/openid-configuration") for _, url in self.requests)
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        self.requests.append(("GET", url))
+        if url.endswith("/.well-known/openid-configuration"):
+            return _Response(
+                {
+                    "authorization_endpoint": f"{AUTHORITY}/oauth2/v2.0/authorize",
+                    "token_endpoint": f"{AUTHORITY}/oauth2/v2.0/token",
+                    "issuer": ISSUER,
+                }
+            )
+        return _Response({"error": "not_found"}, 404)
+
+    def post(self, url, params=None, data=None, headers=None, **kwargs):
+        self.requests.append(("POST", url))
+        now = int(time.time())
+        claims = {
+            "iss": ISSUER,
+            "aud": CLIENT_ID,
+            "iat": now,
+            "nbf": now,
+            "exp": now + 3600,
+            "oid": "user-oid",
+            "tid": TENANT,
+            "name": "Test User",
+            "preferred_username": "test@example.com",
+        }
+        id_token = f"{_b64({'alg': 'none'})}.{_b64(claims)}.sig"
+        return _Response(
+            {
+                "access_token": "access",
+                "token_type": "Bearer",
+                "expires_in": 3600,
+                "id_token": id_token,
+                "client_info": _b64({"uid": "user-oid", "utid": TENANT}),
+            }
+        )
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def idp(app):
+    stub = StubIdentityProvider()
+    app.config.update(
+        AZURE_CLIENT_ID=CLIENT_ID,
+        AZURE_CLIENT_SECRET="secret",
+        AZURE_AUTHORITY=AUTHORITY,
+        MSAL_HTTP_CLIENT=stub,
+    )
+    return stub
+
+
+def _login(client) -> None:
+    resp = client.get("/auth/login")
+    assert resp.status_code == 302
+    state = parse_qs(urlparse(resp.headers["Location"]).query)["state"][0]
+
+    resp = client.get(f"/auth/callback?code=abc&state={state}")
+    assert resp.status_code == 302, resp.data
+
+
+def test_logins_share_one_discovery_fetch(app, idp):
+    for _ in range(5):
+        with app.test_client() as client:
+            _login(client)
+            with client.session_transaction() as session:
+                assert session["user"]["oid"] == "user-oid"
+
+    assert idp.discovery_count() == 1
+    assert sum(method == "POST" for method, _ in idp.requests) == 5
+
+
+def test_client_is_rebuilt_after_ttl(app, idp):
+    app.config["MSAL_METADATA_TTL"] = 0
+
+    with app.app_context():
+        first = get_msal_client()
+        second = get_msal_client()
+
+    assert first is not second
+    assert idp.discovery_count() == 2
+
+
+def test_token_cache_is_kept_out_of_the_session(app, idp):
+    with app.test_client() as client:
+        _login(client)
+        with client.session_transaction() as session:
+            assert set(session) <= {"_permanent", "user", "csrf_token"}
+
+        with app.app_context():
+            assert "user-oid" in token_cache_store()
+            cache = token_cache_store().load("user-oid")
+            assert cache.find(cache.CredentialType.ACCESS_TOKEN)
+
+        client.get("/auth/logout")
+        with app.app_context():
+            assert "user-oid" not in token_cache_store()
+
+
+class _ChangedCache:
+    has_state_changed = True
+
+    def serialize(self) -> str:
+        return "{}"
+
+
+def test_token_cache_store_is_bounded_and_expires(monkeypatch):
+    store = TokenCacheStore(max_entries=2, ttl=60)
+    for oid in ("a", "b", "c"):
+        store.save(oid, _ChangedCache())
+    assert len(store) == 2
+    assert "a" not in store
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    assert "b" not in store
+    assert "c" not in store
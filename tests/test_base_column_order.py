@@ -0,0 +1,50 @@
+from sqlalchemy import insert, select
+
+from admin_page.extensions import db
+from admin_page.instrumentation import query_budget
+from admin_page.models.base_column_model import BaseColumn, reserve_orders
+
+
+def _column(key: str, order: int | None = None) -> BaseColumn:
+    return BaseColumn(key=key, name=key.upper(), dtype="string", order=order)
+
+
+def _orders() -> dict[str, int]:
+    return dict(db.session.execute(select(BaseColumn.key, BaseColumn.order)).all())
+
+
+def test_pending_rows_share_one_max_query(app):
+    with app.app_context():
+        db.session.add(_column("first", order=1))
+        db.session.commit()
+
+        db.session.add_all(_column(f"c{i}") for i in range(50))
+        # one MAX(order) for all 50 rows (SQLite then INSERTs ORM rows one by one)
+        with query_budget(1 + 50) as statements:
+            db.session.commit()
+        assert sum("max(" in s.lower() for s in statements) == 1
+
+        orders = _orders()
+        assert [orders[f"c{i}"] for i in range(50)] == list(range(2, 52))
+
+
+def test_pending_rows_go_after_explicit_orders_in_the_same_flush(app):
+    with app.app_context():
+        db.session.add_all([_column("a"), _column("b", order=10), _column("c")])
+        db.session.commit()
+        assert _orders() == {"a": 11, "b": 10, "c": 12}
+
+
+def test_reserve_orders_for_core_inserts(app):
+    with app.app_context():
+        db.session.add(_column("existing", order=7))
+        db.session.flush()
+
+        block = reserve_orders(db.session, 3)
+        assert block == range(8, 11)
+        db.session.execute(
+            insert(BaseColumn),
+            [{"key": f"k{o}", "name": "K", "dtype": "int", "order": o} for o in block],
+        )
+        db.session.commit()
+        assert sorted(_orders().values()) == [7, 8, 9, 10]
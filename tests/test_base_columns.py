@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import select
+
+from admin_page.blueprints.settings.services import (
+    move_base_columns,
+    reorder_base_columns,
+    save_base_columns,
+)
+from admin_page.extensions import db
+from admin_page.instrumentation import query_budget
+from admin_page.models import Tombstone
+from admin_page.models.base_column_model import BaseColumn
+from admin_page.versioning import read_version
+
+
+def _spec(key, name=None, dtype="string"):
+    return {"key": key, "name": name or key.upper(), "dtype": dtype}
+
+
+def _stored():
+    rows = db.session.execute(
+        select(BaseColumn.key, BaseColumn.name, BaseColumn.order, BaseColumn.revision).order_by(
+            BaseColumn.order
+        )
+    ).all()
+    return [(r.key, r.name, r.order) for r in rows], {r.key: r.revision for r in rows}
+
+
+@pytest.fixture
+def columns(app):
+    with app.app_context():
+        save_base_columns([_spec("a"), _spec("b"), _spec("c"), _spec("d")])
+        return {r.key: r.id for r in db.session.scalars(select(BaseColumn))}
+
+
+def test_save_base_columns_writes_only_the_diff(app, columns):
+    with app.app_context():
+        version = read_version()
+
+        # swap b and d, rename c, drop a, add e
+        save_base_columns([_spec("d"), _spec("c", "Cee"), _spec("b"), _spec("e")])
+        rows, revisions = _stored()
+        assert read_version() == version + 1
+        tombstones = db.session.execute(select(Tombstone.entity, Tombstone.entity_id)).all()
+
+    assert rows == [("d", "D", 1), ("c", "Cee", 2), ("b", "B", 3), ("e", "E", 4)]
+    assert revisions == dict.fromkeys("dcbe", version + 1)
+    assert [tuple(t) for t in tombstones] == [("base_column", columns["a"])]
+
+
+def test_unchanged_rows_keep_their_revision(app, columns):
+    with app.app_context():
+        version = read_version()
+        save_base_columns([_spec("a"), _spec("b", "Bee"), _spec("c"), _spec("d")])
+        _, revisions = _stored()
+    assert revisions == {"a": version, "b": version + 1, "c": version, "d": version}
+
+
+def test_noop_save_writes_nothing(app, columns):
+    with app.app_context():
+        version = read_version()
+        with query_budget(1):  # the SELECT of the existing rows
+            save_base_columns([_spec("a"), _spec("b"), _spec("c"), _spec("d")])
+        assert read_version() == version
+
+
+def test_save_without_deletes_keeps_unsubmitted_rows_last(app, columns):
+    with app.app_context():
+        save_base_columns([_spec("c"), _spec("a")], allow_deletes=False)
+        rows, _ = _stored()
+    assert [(k, o) for k, _, o in rows] == [("c", 1), ("a", 2), ("b", 3), ("d", 4)]
+
+
+def test_reorder_and_move_touch_only_moved_rows(app, columns):
+    with app.app_context():
+        version = read_version()
+        reorder_base_columns([columns[k] for k in ("a", "c", "b", "d")])
+        rows, revisions = _stored()
+        assert [k for k, _, _ in rows] == ["a", "c", "b", "d"]
+        assert revisions == {"a": version, "b": version + 1, "c": version + 1, "d": version}
+
+        assert move_base_columns([("d", 1), ("a", 99)]) == ["d", "c", "b", "a"]
+        with pytest.raises(KeyError):
+            move_base_columns([("nope", 1)])
+
+
+def test_patch_order_endpoint(app, logged_in, columns):
+    resp = logged_in.patch("/settings/base_columns/order", json={"moves": [{"key": "c", "to": 1}]})
+    assert resp.status_code == 200
+    assert resp.get_json() == {"status": "ok", "order": ["c", "a", "b", "d"]}
+
+    bad = {"moves": [{"key": "c", "to": 0}]}
+    assert logged_in.patch("/settings/base_columns/order", json=bad).status_code == 400
+    assert logged_in.patch("/settings/base_columns/order", json={}).status_code == 400
+    unknown = {"moves": [{"key": "nope", "to": 1}]}
+    assert logged_in.patch("/settings/base_columns/order", json=unknown).status_code == 404
+
+
+def test_patch_order_requires_login(client, columns):
+    resp = client.patch("/settings/base_columns/order", json={"moves": []})
+    assert resp.status_code == 302
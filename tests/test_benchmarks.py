@@ -0,0 +1,377 @@
+"""
+Service-layer benchmarks on a seeded SQLite stand-in for the config database.
+
+Skipped unless pytest is run with --benchmark:
+
+    pytest tests/test_benchmarks.py --benchmark --bench-customers 1000,10000,50000 \\
+        --bench-base-columns 300 --bench-json bench-results.json
+
+Every operation is reported with its wall time (min and median of
+--bench-repeat runs), the number of SQL statements one run executes (an
+executemany counts once) and the peak memory allocated during one run
+(tracemalloc).  The JSON file records the commit it was measured on, so two
+files can be diffed to spot regressions.  Setup steps (snapshot resets, test
+data for the next write) run outside the measurement.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+import sqlalchemy
+from conftest import make_app
+from sqlalchemy import event, insert
+
+from admin_page.blueprints.customers.services import list_configs, save_config
+from admin_page.blueprints.settings.services import (
+    get_base_columns,
+    load_settings,
+    reorder_base_columns,
+    save_base_columns,
+    save_settings,
+)
+from admin_page.extensions import db
+from admin_page.models.base_column_model import BaseColumn
+from admin_page.models.config_version_model import ConfigVersion
+from admin_page.models.customer_konserni_model import CustomerKonserni
+from admin_page.models.customer_model import Customer
+from admin_page.models.email_model import EmailModel
+from admin_page.models.general_settings_model import GeneralSettings
+
+pytestmark = pytest.mark.benchmark
+
+KONSERNI_COUNT = 500
+IN_LIST_SIZE = 500
+EMAIL_COUNT = 10
+
+
+def pytest_generate_tests(metafunc):
+    if "seeded_app" in metafunc.fixturenames:
+        volumes = [int(v) for v in metafunc.config.getoption("--bench-customers").split(",")]
+        metafunc.parametrize("seeded_app", volumes, indirect=True, scope="module", ids=str)
+
+
+# ── seeding ──────────────────────────────────────────────────────────────
+def _customer_rows(count: int, base_keys: list[str]) -> list[dict]:
+    return [
+        {
+            "id": i,
+            "name": f"customer-{i:06d}",
+            "konserni": [i % KONSERNI_COUNT, (i * 7) % KONSERNI_COUNT],
+            "source_container": f"source-{i % 20}",
+            "destination_container": f"destination-{i % 20}",
+            "file_format": "csv",
+            "file_encoding": "utf-8",
+            "extra_columns": {f"extra_{i % 3}": {"name": "Extra", "dtype": "string"}},
+            "exclude_columns": [base_keys[i % len(base_keys)]],
+            "enabled": i % 10 != 0,
+            "revision": 1,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def _seed(customers: int, base_columns: int) -> None:
+    session = db.session
+    base_rows = [
+        {
+            "id": i,
+            "key": f"col_{i:04d}",
+            "name": f"Column {i}",
+            "dtype": ("string", "int", "float")[i % 3],
+            "length": 50 if i % 3 == 0 else None,
+            "decimals": 2 if i % 3 == 2 else None,
+            "order": i,
+            "revision": 1,
+        }
+        for i in range(1, base_columns + 1)
+    ]
+    session.execute(insert(BaseColumn), base_rows)
+
+    rows = _customer_rows(customers, [r["key"] for r in base_rows])
+    session.execute(insert(Customer), rows)
+    session.execute(
+        insert(CustomerKonserni),
+        [
+            {"konserni_id": k, "customer_id": r["id"]}
+            for r in rows
+            for k in sorted(set(r["konserni"]))
+        ],
+    )
+
+    session.execute(insert(GeneralSettings).values(id=1, retry_attempts=3, retry_delay=5))
+    session.execute(
+        insert(EmailModel),
+        [
+            {"settings_id": 1, "address": f"ops{i}@example.com", "display_name": f"Ops {i}"}
+            for i in range(EMAIL_COUNT)
+        ],
+    )
+    session.execute(insert(ConfigVersion).values(id=1, version=1))
+    session.commit()
+
+
+@pytest.fixture(scope="module")
+def seeded_app(request, tmp_path_factory):
+    customers = request.param
+    base_columns = request.config.getoption("--bench-base-columns")
+    app = make_app(
+        tmp_path_factory.mktemp(f"bench-{customers}") / "bench.db",
+        CONFIG_VERSION_TTL=0,  # every request checks the version, as across instances
+        DEBUG=False,
+        REQUEST_STATS_LOG=False,
+        API_RATE_LIMIT=0,  # one client issuing every measured request
+    )
+    app.config["BENCH_VOLUME"] = {"customers": customers, "base_columns": base_columns}
+    with app.app_context():
+        _seed(customers, base_columns)
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+# ── measuring ────────────────────────────────────────────────────────────
+@pytest.fixture(scope="session")
+def bench_results(request):
+    results: list[dict] = []
+    yield results
+    if not results:
+        return
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    out = Path(request.config.getoption("--bench-json"))
+    out.write_text(
+        json.dumps(
+            {
+                "commit": commit,
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "sqlalchemy": sqlalchemy.__version__,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+@pytest.fixture
+def measure(seeded_app, bench_results, request):
+    """
+    `measure(op, fn, setup=None)` runs `fn` once to warm up, then
+    --bench-repeat timed runs and one run under tracemalloc, each in a
+    fresh session; `setup` runs untimed before every run.
+    """
+    repeat = request.config.getoption("--bench-repeat")
+    statements = 0
+
+    def count(*_args) -> None:
+        nonlocal statements
+        statements += 1
+
+    def run(fn: Callable[[], object], setup: Callable[[], object] | None) -> float:
+        if setup is not None:
+            setup()
+            db.session.remove()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        db.session.remove()
+        return elapsed
+
+    def _measure(
+        op: str, fn: Callable[[], object], setup: Callable[[], object] | None = None
+    ) -> dict:
+        with seeded_app.app_context():
+            engine = db.engine
+            run(fn, setup)
+            walls = [run(fn, setup) for _ in range(repeat)]
+
+            if setup is not None:
+                setup()
+                db.session.remove()
+            event.listen(engine, "before_cursor_execute", count)
+            statements_before = statements
+            tracemalloc.start()
+            try:
+                run(fn, None)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+                event.remove(engine, "before_cursor_execute", count)
+
+        result = {
+            **seeded_app.config["BENCH_VOLUME"],
+            "op": op,
+            "repeat": repeat,
+            "wall_min_ms": round(min(walls) * 1000, 3),
+            "wall_median_ms": round(statistics.median(walls) * 1000, 3),
+            "statements": statements - statements_before,
+            "peak_kib": round(peak / 1024, 1),
+        }
+        bench_results.append(result)
+        return result
+
+    return _measure
+
+
+# ── customers ────────────────────────────────────────────────────────────
+def test_list_configs(seeded_app, measure):
+    customers = seeded_app.config["BENCH_VOLUME"]["customers"]
+    middle = customers // 2
+    some = list(range(1, customers + 1, max(1, customers // IN_LIST_SIZE)))[:IN_LIST_SIZE]
+
+    measure("list_configs(all)", list_configs)
+    measure("list_configs(all, as_dict)", lambda: list_configs(as_dict=True))
+    measure("list_configs(pk)", lambda: list_configs(pk=middle, as_dict=True))
+    measure(f"list_configs(pk IN {len(some)})", lambda: list_configs(pk=some, as_dict=True))
+
+
+def _form_data(name: str, destination: str) -> dict:
+    return {
+        "name": name,
+        "konserni": [1, 2, 3],
+        "source_container": "source-bench",
+        "destination_container": destination,
+        "file_format": "csv",
+        "file_encoding": "utf-8",
+        "extra_columns": [{"key": "bench", "name": "Bench", "dtype": "string"}],
+        "exclude_columns": ["col_0001"],
+        "enabled": True,
+    }
+
+
+def test_save_config(seeded_app, measure):
+    customers = seeded_app.config["BENCH_VOLUME"]["customers"]
+    inserted = 0
+
+    def insert_one():
+        nonlocal inserted
+        inserted += 1
+        save_config(_form_data(f"bench-new-{inserted:06d}", "destination-bench"))
+
+    toggle = 0
+
+    def update_one():
+        nonlocal toggle
+        toggle ^= 1
+        save_config(_form_data("customer-000001", f"destination-{toggle}"), pk=1)
+
+    measure("save_config(insert)", insert_one)
+    measure("save_config(update)", update_one)
+
+    with seeded_app.app_context():
+        assert db.session.query(Customer).count() > customers
+
+
+# ── base columns ─────────────────────────────────────────────────────────
+def _specs() -> list[dict]:
+    return [
+        {
+            "key": c.key,
+            "name": c.name,
+            "dtype": c.dtype,
+            "length": c.length,
+            "decimals": c.decimals,
+        }
+        for c in get_base_columns(as_rows=True)
+    ]
+
+
+def test_save_base_columns(seeded_app, measure):
+    with seeded_app.app_context():
+        specs = _specs()
+
+    result = measure("save_base_columns(no-op)", lambda: save_base_columns(specs))
+    assert result["statements"] <= 2  # the diff read, no writes
+
+    renamed = 0
+
+    def edit_one():
+        nonlocal renamed
+        renamed += 1
+        save_base_columns([{**specs[0], "name": f"Renamed {renamed}"}, *specs[1:]])
+
+    measure("save_base_columns(edit 1)", edit_one)
+
+
+def test_reorder_base_columns(seeded_app, measure):
+    with seeded_app.app_context():
+        ids = [c.id for c in get_base_columns(as_rows=True)]
+
+    state = {"ids": ids}
+
+    def reverse():
+        state["ids"] = state["ids"][::-1]
+        reorder_base_columns(state["ids"])
+
+    measure("reorder_base_columns(reverse)", reverse)
+
+
+# ── settings ─────────────────────────────────────────────────────────────
+def test_settings(seeded_app, measure):
+    measure("load_settings", lambda: load_settings(as_dict=True))
+
+    attempts = 0
+
+    def save():
+        nonlocal attempts
+        attempts += 1
+        updated = GeneralSettings(retry_attempts=attempts % 10, retry_delay=5)
+        updated.emails = [
+            EmailModel(address=f"ops{i}@example.com", display_name=f"Ops {i}")
+            for i in range(EMAIL_COUNT)
+        ]
+        assert save_settings(updated)
+
+    measure("save_settings", save)
+
+
+# ── read API ─────────────────────────────────────────────────────────────
+API_PATHS = [
+    "/api/customer_configs",
+    "/api/customer_configs?limit=100",
+    "/api/customer_configs?enabled=true&limit=100",
+    "/api/customer_configs/schemas",
+    "/api/customer_configs/1/schema",
+    "/api/customer_configs/by-konserni/7",
+    "/api/customer_configs/by-konserni?ids=1,2,3,4,5",
+    "/api/settings",
+    "/api/bundle",
+]
+
+
+@pytest.mark.parametrize("path", API_PATHS)
+def test_api(seeded_app, measure, path):
+    client = seeded_app.test_client()
+
+    def get():
+        resp = client.get(path)
+        assert resp.status_code == 200, resp.status_code
+        return resp
+
+    def drop_snapshot():
+        seeded_app.extensions.pop("config_snapshot", None)
+
+    measure(f"GET {path} (cold)", get, setup=drop_snapshot)
+    measure(f"GET {path} (warm)", get)
+
+    etag = get().headers["ETag"]
+
+    def revalidate():
+        resp = client.get(path, headers={"If-None-Match": etag})
+        assert resp.status_code == 304, resp.status_code
+
+    measure(f"GET {path} (304)", revalidate)
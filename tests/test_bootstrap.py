@@ -0,0 +1,96 @@
+import json
+
+import pytest
+from conftest import customer_form
+from werkzeug.exceptions import BadRequest
+
+from admin_page.blueprints.customers.services import bulk_upsert_configs, list_configs, save_config
+from admin_page.instrumentation import query_budget
+from admin_page.versioning import read_version
+
+
+@pytest.fixture
+def existing(app):
+    with app.app_context():
+        save_config(customer_form("keep"))
+        save_config(customer_form("change"))
+        save_config(customer_form("stale"))
+
+
+def _names(app):
+    with app.app_context():
+        return {c["name"]: c for c in list_configs(as_dict=True)}
+
+
+def test_bulk_upsert_inserts_updates_and_skips_unchanged(app, existing):
+    configs = [
+        customer_form("keep"),
+        customer_form("change", konserni=[7, 8], enabled=False),
+        customer_form("new", exclude_columns=["col_1"]),
+    ]
+    with app.app_context():
+        version = read_version()
+        stats = bulk_upsert_configs(configs)
+        assert read_version() == version + 1
+
+    assert stats == {"inserted": 1, "updated": 1, "unchanged": 1, "deleted": 0}
+    rows = _names(app)
+    assert set(rows) == {"keep", "change", "stale", "new"}
+    assert rows["change"]["konserni"] == [7, 8] and rows["change"]["enabled"] is False
+    assert rows["new"]["exclude_columns"] == ["col_1"]
+    assert rows["keep"]["revision"] < rows["change"]["revision"] == rows["new"]["revision"]
+
+    with app.app_context(), query_budget(1):  # nothing changed: one SELECT, no write
+        assert bulk_upsert_configs(configs)["unchanged"] == 3
+
+
+def test_bulk_upsert_prune_and_dry_run(app, existing):
+    configs = [customer_form("keep"), customer_form("new")]
+    with app.app_context():
+        version = read_version()
+        planned = bulk_upsert_configs(configs, prune=True, dry_run=True)
+        assert read_version() == version
+    assert planned == {"inserted": 1, "updated": 0, "unchanged": 1, "deleted": 2}
+    assert set(_names(app)) == {"keep", "change", "stale"}
+
+    with app.app_context():
+        assert bulk_upsert_configs(configs, prune=True) == planned
+    assert set(_names(app)) == {"keep", "new"}
+
+
+def test_bulk_upsert_rejects_duplicate_names(app, existing):
+    with app.app_context(), pytest.raises(BadRequest, match="Duplicate"):
+        bulk_upsert_configs([customer_form("new"), customer_form("new")])
+    assert set(_names(app)) == {"keep", "change", "stale"}
+
+
+def _write_configs(root, *configs):
+    cfg_dir = root / "blueprints" / "customers" / "customer_configs"
+    cfg_dir.mkdir(parents=True)
+    for config in configs:
+        (cfg_dir / f"{config['name']}.json").write_text(json.dumps(config), encoding="utf-8")
+
+
+def test_bootstrap_customers_command(app, existing, tmp_path):
+    app.root_path = str(tmp_path)
+    _write_configs(tmp_path, customer_form("keep"), customer_form("new"))
+    runner = app.test_cli_runner()
+
+    dry = runner.invoke(args=["bootstrap-customers", "--dry-run", "--prune"])
+    assert dry.exit_code == 0, dry.output
+    assert "(dry run) 1 inserted, 0 updated, 1 unchanged, 2 deleted" in dry.output
+    assert set(_names(app)) == {"keep", "change", "stale"}
+
+    result = runner.invoke(args=["bootstrap-customers"])
+    assert result.exit_code == 0, result.output
+    assert "1 inserted, 0 updated, 1 unchanged, 0 deleted" in result.output
+    assert set(_names(app)) == {"keep", "change", "stale", "new"}
+
+
+def test_bootstrap_customers_aborts_on_a_bad_file(app, existing, tmp_path):
+    app.root_path = str(tmp_path)
+    _write_configs(tmp_path, customer_form("new"), customer_form("bad", konserni=["x"]))
+
+    result = app.test_cli_runner().invoke(args=["bootstrap-customers"])
+    assert result.exit_code != 0
+    assert set(_names(app)) == {"keep", "change", "stale"}  # nothing written
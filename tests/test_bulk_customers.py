@@ -0,0 +1,106 @@
+import pytest
+from conftest import customer_form
+from sqlalchemy import select
+from werkzeug.exceptions import BadRequest
+
+from admin_page.blueprints.customers.services import (
+    bulk_delete_customers,
+    bulk_set_enabled,
+    list_configs,
+    save_config,
+)
+from admin_page.extensions import db
+from admin_page.instrumentation import query_budget
+from admin_page.models import CustomerKonserni, Tombstone
+from admin_page.versioning import read_version
+
+
+@pytest.fixture
+def customer_ids(app):
+    with app.app_context():
+        ids = [save_config(customer_form(f"acme-{i}")).id for i in range(3)]
+        ids.append(
+            save_config(customer_form("other", source_container="elsewhere", enabled=False)).id
+        )
+        return ids
+
+
+def test_bulk_enable_by_ids(app, customer_ids):
+    a, b, _, other = customer_ids
+    with app.app_context():
+        before = read_version()
+        with query_budget(3):  # version bump, matched ids, UPDATE … RETURNING
+            outcome, version = bulk_set_enabled(False, ids=[a, other, 9999])
+
+        assert outcome == {a: "updated", other: "unchanged", 9999: "not_found"}
+        assert version == before + 1 == read_version()
+        assert list_configs(pk=a).enabled is False
+        assert list_configs(pk=b).enabled is True
+        assert list_configs(pk=a).revision == version
+
+
+def test_bulk_enable_noop_keeps_version(app, customer_ids):
+    with app.app_context():
+        before = read_version()
+        outcome, version = bulk_set_enabled(True, ids=customer_ids[:3])
+        assert set(outcome.values()) == {"unchanged"}
+        assert version is None
+        assert read_version() == before
+
+
+def test_bulk_enable_by_filter(app, customer_ids):
+    a, b, c, other = customer_ids
+    with app.app_context():
+        outcome, _ = bulk_set_enabled(False, filters={"prefix": "acme", "enabled": True})
+        assert outcome == {a: "updated", b: "updated", c: "updated"}
+        assert list_configs(pk=other).enabled is False
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"ids": [1], "filters": {"prefix": "a"}},
+        {"ids": []},
+        {"ids": ["x"]},
+        {"filters": {}},
+        {"filters": {"name": "acme"}},
+    ],
+)
+def test_bulk_target_is_validated(app, kwargs):
+    with app.app_context(), pytest.raises(BadRequest):
+        bulk_set_enabled(True, **kwargs)
+
+
+def test_bulk_delete_writes_tombstones(app, customer_ids):
+    a, b, c, other = customer_ids
+    with app.app_context():
+        outcome, version = bulk_delete_customers(ids=[a, b, 9999])
+        assert outcome == {a: "deleted", b: "deleted", 9999: "not_found"}
+        assert list_configs(pk=a) is None and list_configs(pk=c) is not None
+
+        tombstones = db.session.scalars(
+            select(Tombstone.entity_id).where(Tombstone.revision == version)
+        ).all()
+        assert sorted(tombstones) == [a, b]
+        links = db.session.scalars(select(CustomerKonserni.customer_id)).all()
+        assert a not in links and b not in links and c in links
+
+        assert bulk_delete_customers(ids=[a]) == ({a: "not_found"}, None)
+
+
+def test_bulk_routes(logged_in, customer_ids):
+    a, b, c, other = customer_ids
+
+    resp = logged_in.post("/customers/bulk/enabled", json={"enabled": False, "ids": [a, b]})
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["results"] == {str(a): "updated", str(b): "updated"}
+    assert body["counts"] == {"updated": 2} and body["version"] is not None
+
+    resp = logged_in.post("/customers/bulk/delete", json={"filter": {"source_container": "in"}})
+    assert resp.get_json()["counts"] == {"deleted": 3}
+
+    assert logged_in.post("/customers/bulk/enabled", json={"ids": [a]}).status_code == 400
+    assert logged_in.post("/customers/bulk/delete", json={"filter": {}}).status_code == 400
+    assert logged_in.post("/customers/bulk/delete", json={"ids": "1,2"}).status_code == 400
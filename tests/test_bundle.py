@@ -0,0 +1,79 @@
+import gzip
+import json
+
+import pytest
+from conftest import customer_form
+from sqlalchemy import event
+
+from admin_page.blueprints.customers.services import save_config
+from admin_page.blueprints.settings.services import read_settings, save_base_columns
+from admin_page.extensions import db
+from admin_page.instrumentation import query_budget
+from admin_page.snapshot import get_snapshot
+from admin_page.versioning import current_version
+
+
+@pytest.fixture
+def seeded(app):
+    with app.app_context():
+        save_base_columns(
+            [{"key": f"col_{i}", "name": f"Column {i}", "dtype": "string"} for i in range(3)]
+        )
+        for name in ("beta", "alpha"):
+            save_config(customer_form(name))
+        read_settings()  # seeds the default settings row
+    return app
+
+
+def test_bundle_matches_the_separate_endpoints(client, seeded):
+    resp = client.get("/api/bundle")
+    assert resp.status_code == 200
+    assert "Content-Encoding" not in resp.headers
+    bundle = resp.get_json()
+
+    assert list(bundle) == ["version", "customers", "base_columns", "settings"]
+    assert bundle["customers"] == client.get("/api/customer_configs").get_json()
+    assert [c["name"] for c in bundle["customers"]] == ["alpha", "beta"]
+    assert list(bundle["base_columns"]) == ["col_0", "col_1", "col_2"]
+
+    settings = client.get("/api/settings").get_json()
+    assert bundle["settings"] == {k: v for k, v in settings.items() if k != "base_columns"}
+    assert resp.headers["ETag"] == f'"bundle-{bundle["version"]}"'
+
+
+def test_bundle_is_gzipped_on_request(client, seeded):
+    plain = client.get("/api/bundle")
+    resp = client.get("/api/bundle", headers={"Accept-Encoding": "gzip, deflate"})
+
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert resp.headers["ETag"] != plain.headers["ETag"]
+    assert json.loads(gzip.decompress(resp.get_data())) == plain.get_json()
+
+    etag = resp.headers["ETag"]
+    again = client.get(
+        "/api/bundle", headers={"Accept-Encoding": "gzip", "If-None-Match": etag.strip('"')}
+    )
+    assert again.status_code == 304 and "Content-Encoding" not in again.headers
+
+
+def test_bundle_is_read_in_one_transaction(app, seeded):
+    app.extensions.pop("config_snapshot", None)
+    connections = set()
+
+    def record(conn, *_args):
+        connections.add(conn.connection.dbapi_connection)
+
+    with app.app_context():
+        version = current_version()
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            # version, customers, base columns, settings, e-mails
+            with query_budget(5) as statements:
+                snapshot = get_snapshot()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+
+    assert len(connections) == 1
+    assert not any(s.lstrip().upper().startswith(("INSERT", "UPDATE")) for s in statements)
+    assert json.loads(snapshot.bundle_json)["version"] == snapshot.version == version
@@ -0,0 +1,145 @@
+import pytest
+from conftest import customer_form
+from sqlalchemy import select
+
+from admin_page.blueprints.customers.services import (
+    delete_customer,
+    list_config_changes,
+    save_config,
+    set_customer_enabled,
+)
+from admin_page.blueprints.settings.services import (
+    load_settings,
+    read_settings,
+    save_base_columns,
+    save_settings,
+)
+from admin_page.extensions import db
+from admin_page.models import EmailModel, GeneralSettings, Tombstone
+from admin_page.versioning import read_version
+
+
+@pytest.fixture
+def customer_ids(app):
+    with app.app_context():
+        return [save_config(customer_form(name)).id for name in ("alpha", "beta", "gamma")]
+
+
+def test_since_feed_reports_changes_and_deletions(app, client, customer_ids):
+    a, b, c = customer_ids
+    with app.app_context():
+        since = read_version()
+        set_customer_enabled(a, False)
+        delete_customer(b)
+
+    resp = client.get(f"/api/customer_configs?since={since}")
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["since"] == since and body["revision"] == since + 2
+    assert [r["id"] for r in body["changed"]] == [a]
+    assert body["deleted"] == [b]
+
+    # caught up: nothing left, and the same version revalidates with 304
+    caught_up = client.get(f"/api/customer_configs?since={body['revision']}")
+    assert caught_up.get_json()["changed"] == [] == caught_up.get_json()["deleted"]
+    etag = caught_up.headers["ETag"]
+    assert (
+        client.get(
+            f"/api/customer_configs?since={body['revision']}", headers={"If-None-Match": etag}
+        ).status_code
+        == 304
+    )
+
+
+def test_since_zero_is_a_full_sync(app, customer_ids):
+    with app.app_context():
+        save_base_columns([{"key": "col_1", "name": "Id", "dtype": "int"}])
+        delete_customer(customer_ids[0])
+        changes = list_config_changes(0)
+    assert [r["name"] for r in changes["changed"]] == ["beta", "gamma"]
+    assert changes["deleted"] == []
+    assert [c["key"] for c in changes["base_columns"]["changed"]] == ["col_1"]
+    assert changes["base_columns"]["deleted"] == []
+    assert changes["settings"]["retry_attempts"] == 3  # never saved, still synced
+
+
+def _columns(*keys):
+    return [{"key": k, "name": k.upper(), "dtype": "string"} for k in keys]
+
+
+def test_since_feed_reports_base_column_and_settings_changes(app, client, customer_ids):
+    with app.app_context():
+        save_base_columns(_columns("a", "b", "c"))
+        ids = {c["key"]: c["id"] for c in list_config_changes(0)["base_columns"]["changed"]}
+        since = read_version()
+
+        # rename b, drop c
+        save_base_columns([*_columns("a"), {"key": "b", "name": "Bee", "dtype": "string"}])
+        settings = load_settings()
+        save_settings(
+            GeneralSettings(
+                id=settings.id,
+                retry_attempts=5,
+                retry_delay=settings.retry_delay,
+                emails=[EmailModel(address="ops@x", display_name="Ops")],
+            )
+        )
+        expected_settings = read_settings()
+
+    body = client.get(f"/api/customer_configs?since={since}").get_json()
+    assert body["revision"] == since + 2
+    assert body["changed"] == [] == body["deleted"]
+    assert body["base_columns"] == {
+        "changed": [
+            {
+                "id": ids["b"],
+                "key": "b",
+                "name": "Bee",
+                "dtype": "string",
+                "length": None,
+                "decimals": None,
+                "order": 2,
+                "revision": since + 1,
+            }
+        ],
+        "deleted": [ids["c"]],
+    }
+    assert body["settings"] == {
+        "revision": since + 2,
+        "retry_attempts": 5,
+        "retry_delay": expected_settings.retry_delay,
+        "emails": [{"address": "ops@x", "display_name": "Ops"}],
+    }
+
+    # unchanged since the last revision: nothing for any entity
+    caught_up = client.get(f"/api/customer_configs?since={body['revision']}").get_json()
+    assert caught_up["base_columns"] == {"changed": [], "deleted": []}
+    assert caught_up["settings"] is None
+
+
+@pytest.mark.parametrize("since", ["-1", "x", ""])
+def test_since_must_be_a_revision(client, since):
+    assert client.get(f"/api/customer_configs?since={since}").status_code == 400
+
+
+def test_prune_tombstones_moves_the_horizon(app, client, customer_ids):
+    a, b, c = customer_ids
+    app.config["TOMBSTONE_RETENTION"] = 2
+    with app.app_context():
+        delete_customer(a)  # old enough to prune once two more revisions exist
+        since = read_version()
+        delete_customer(b)
+        set_customer_enabled(c, False)
+
+    result = app.test_cli_runner().invoke(args=["prune-tombstones"])
+    assert result.exit_code == 0, result.output
+    assert f"1 tombstone(s) pruned; oldest valid since={since}" in result.output
+
+    with app.app_context():
+        remaining = db.session.scalars(select(Tombstone.entity_id)).all()
+    assert remaining == [b]
+
+    assert client.get(f"/api/customer_configs?since={since}").get_json()["deleted"] == [b]
+    assert client.get(f"/api/customer_configs?since={since - 1}").status_code == 410
+    assert client.get(f"/api/watch?since={since - 1}&timeout=0").status_code == 410
+    assert client.get("/api/customer_configs?since=0").status_code == 200
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+import textwrap
+
+from conftest import customer_form, make_app
+
+from admin_page.blueprints.customers.services import save_config
+
+
+def test_serving_app_has_no_migrate_or_commands(tmp_path):
+    app = make_app(tmp_path / "test.db", serving=True)
+    assert "migrate" not in app.extensions
+    assert "bootstrap-customers" not in app.cli.commands
+
+    with app.app_context():
+        save_config(customer_form())
+    resp = app.test_client().get("/api/customer_configs")
+    assert resp.status_code == 200 and resp.get_json()[0]["name"] == "acme"
+
+
+def test_full_app_registers_migrate_and_commands(app):
+    assert "migrate" in app.extensions
+    assert {"bootstrap-customers", "prune-tombstones", "slow-queries"} <= set(app.cli.commands)
+
+
+def test_serving_mode_does_not_import_alembic(tmp_path):
+    # a fresh interpreter: this one has imported everything already
+    script = textwrap.dedent(f"""
+        import sys
+
+        from admin_page import create_app
+        from admin_page.config import Dev
+
+        class Config(Dev):
+            SQLALCHEMY_DATABASE_URI = "sqlite:///{tmp_path / 'test.db'}"
+            SECRET_KEY = "test"
+
+        create_app(Config, serving=True)
+        assert "flask_migrate" not in sys.modules and "alembic" not in sys.modules
+        assert "admin_page.cli" not in sys.modules
+
+        from admin_page.extensions import migrate  # created on first access
+        assert type(migrate).__name__ == "Migrate"
+        """)
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, cwd=tmp_path
+    )
+    assert result.returncode == 0, result.stderr
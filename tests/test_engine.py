@@ -0,0 +1,135 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from admin_page.config import engine_options
+from admin_page.engine import (
+    TimedQueuePool,
+    _mark_transient_as_disconnect,
+    init_engine,
+    is_transient,
+)
+from admin_page.extensions import db
+
+MSSQL_URI = "mssql+pyodbc:///?odbc_connect=DRIVER%3D%7BODBC+Driver+18+for+SQL+Server%7D"
+DB_CONFIG = {
+    "DB_POOL_SIZE": 4,
+    "DB_MAX_OVERFLOW": 1,
+    "DB_POOL_TIMEOUT": 2.5,
+    "DB_POOL_RECYCLE": 600,
+    "DB_POOL_PRE_PING": True,
+    "DB_LOGIN_TIMEOUT": 15,
+}
+
+
+@pytest.mark.parametrize("flag", ["insert_returning", "update_returning", "delete_returning"])
+def test_init_engine_requires_returning(app, monkeypatch, flag):
+    with app.app_context():
+        monkeypatch.setattr(db.engine.dialect, flag, False)
+    with pytest.raises(RuntimeError, match="RETURNING"):
+        init_engine(app)
+
+
+def test_engine_options_for_sqlite_are_the_defaults():
+    assert engine_options({"SQLALCHEMY_DATABASE_URI": "sqlite:///x.db", **DB_CONFIG}) == {}
+
+
+def test_engine_options_for_mssql():
+    options = engine_options({"SQLALCHEMY_DATABASE_URI": MSSQL_URI, **DB_CONFIG})
+    assert options == {
+        "poolclass": TimedQueuePool,
+        "pool_size": 4,
+        "max_overflow": 1,
+        "pool_timeout": 2.5,
+        "pool_recycle": 600,
+        "pool_pre_ping": True,
+        "fast_executemany": True,
+        "connect_args": {"timeout": 15},
+    }
+
+
+def test_engine_options_for_other_servers_skip_the_pyodbc_options():
+    options = engine_options({"SQLALCHEMY_DATABASE_URI": "postgresql://db/x", **DB_CONFIG})
+    assert options["poolclass"] is TimedQueuePool and options["pool_size"] == 4
+    assert "fast_executemany" not in options and "connect_args" not in options
+
+
+ODBC = "[Microsoft][ODBC Driver 18 for SQL Server]"
+
+
+@pytest.mark.parametrize(
+    ("message", "transient"),
+    [
+        (
+            f"('08S01', '[08S01] {ODBC}TCP Provider: An existing connection was forcibly "
+            "closed by the remote host.\\r\\n (10054) (SQLExecDirectW)')",
+            True,
+        ),
+        (
+            f"('42000', '[42000] {ODBC}[SQL Server]Database 'config' on server 'x' is not "
+            "currently available. (40613) (SQLExecDirectW)')",
+            True,
+        ),
+        (
+            f"('HY000', '[HY000] {ODBC}[SQL Server]The request limit for the database is "
+            "30 and has been reached. (10928) (SQLExecute)')",
+            True,
+        ),
+        # several diagnostic records: any transient one counts
+        (
+            f"('01000', '[01000] {ODBC}[SQL Server]Changed context. (5701) (SQLExecDirectW); "
+            f"[08S01] {ODBC}Communication link failure (0) (SQLExecDirectW); "
+            "[08S01] Session terminated (40197) (SQLExecDirectW)')",
+            True,
+        ),
+        (
+            f"('23000', '[23000] {ODBC}[SQL Server]Violation of UNIQUE KEY constraint "
+            "'uq_name'. (2627) (SQLExecDirectW)')",
+            False,
+        ),
+        # numbers in the message data are not error codes
+        (
+            f"('23000', '[23000] {ODBC}[SQL Server]Cannot insert duplicate key row in object "
+            "'config.customers'. The duplicate key value is (20). (2601) (SQLExecDirectW)')",
+            False,
+        ),
+        ("plain message mentioning (40613) without a native code", False),
+        ("no error code here", False),
+    ],
+)
+def test_is_transient(message, transient):
+    assert is_transient(Exception(message)) is transient
+
+
+def test_is_transient_without_an_error():
+    assert is_transient(None) is False
+
+
+def test_transient_errors_are_classified_as_disconnects():
+    transient = SimpleNamespace(
+        is_disconnect=False, original_exception=Exception("... (40613) (SQLExecDirectW)")
+    )
+    _mark_transient_as_disconnect(transient)
+    assert transient.is_disconnect is True
+
+    # an IntegrityError must not invalidate the pool
+    duplicate = SimpleNamespace(
+        is_disconnect=False,
+        original_exception=Exception("... key value is (20). (2627) (SQLExecDirectW)"),
+    )
+    _mark_transient_as_disconnect(duplicate)
+    assert duplicate.is_disconnect is False
+
+
+def test_timed_pool_reports_waits_and_survives_recreate():
+    waits = []
+    pool = TimedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1)
+    pool.on_wait = waits.append
+
+    pool.connect().close()
+    assert len(waits) == 1 and waits[0] >= 0
+
+    recreated = pool.recreate()
+    recreated.connect().close()
+    assert len(waits) == 2
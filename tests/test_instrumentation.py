@@ -0,0 +1,65 @@
+import logging
+
+import pytest
+from conftest import customer_form
+
+from admin_page.blueprints.customers.services import save_config
+from admin_page.blueprints.settings.services import save_base_columns
+from admin_page.extensions import db
+from admin_page.instrumentation import QueryBudgetExceeded, query_budget
+from admin_page.models.customer_model import Customer
+
+
+@pytest.fixture
+def customer(app):
+    with app.app_context():
+        save_base_columns(
+            [{"key": f"col_{i}", "name": f"Column {i}", "dtype": "string"} for i in range(20)]
+        )
+        cfg = save_config(customer_form(konserni=[1, 2], exclude_columns=["col_3"]))
+        return cfg.id
+
+
+def test_server_timing_and_log_line(app, client, caplog):
+    app.config["SERVER_TIMING"] = True
+
+    with caplog.at_level(logging.INFO, logger="admin_page.requests"):
+        resp = client.get("/api/settings")
+
+    assert resp.status_code == 200
+    timing = resp.headers["Server-Timing"]
+    assert timing.startswith("db;dur=") and "tpl;dur=" in timing and "app;dur=" in timing
+
+    (record,) = [r for r in caplog.records if r.name == "admin_page.requests"]
+    stats = record.request_stats
+    assert stats["path"] == "/api/settings" and stats["status"] == 200
+    assert stats["statements"] > 0 and f'"{stats["statements"]} statements"' in timing
+
+
+def test_server_timing_is_opt_in(app, client):
+    app.config["SERVER_TIMING"] = False
+    assert "Server-Timing" not in client.get("/api/settings").headers
+
+
+def test_template_time_is_measured(app, logged_in, customer, caplog):
+    with caplog.at_level(logging.INFO, logger="admin_page.requests"):
+        assert logged_in.get(f"/customers/{customer}/edit").status_code == 200
+
+    (record,) = [r for r in caplog.records if r.name == "admin_page.requests"]
+    assert record.request_stats["template_ms"] > 0
+
+
+def test_edit_page_query_budget(logged_in, customer):
+    # session read, customer, base columns, session write (the form's CSRF token)
+    with query_budget(4):
+        assert logged_in.get(f"/customers/{customer}/edit").status_code == 200
+
+
+def test_query_budget_catches_n_plus_one(app, customer):
+    with app.app_context():
+        ids = [customer] * 5
+        with pytest.raises(QueryBudgetExceeded, match="5 SQL statements executed, budget is 2"):
+            with query_budget(2):
+                for pk in ids:
+                    db.session.get(Customer, pk)
+                    db.session.expunge_all()
@@ -0,0 +1,77 @@
+import pytest
+from conftest import customer_form
+from sqlalchemy import select
+from werkzeug.exceptions import BadRequest
+
+from admin_page.blueprints.customers.services import (
+    MAX_KONSERNI_IDS,
+    delete_customer,
+    find_by_konserni,
+    save_config,
+)
+from admin_page.extensions import db
+from admin_page.instrumentation import query_budget
+from admin_page.models import CustomerKonserni
+
+
+@pytest.fixture
+def customer_ids(app):
+    with app.app_context():
+        return {
+            name: save_config(customer_form(name, konserni=konserni)).id
+            for name, konserni in (("beta", [1, 2]), ("alpha", [2]), ("gamma", [3]))
+        }
+
+
+def _links(app):
+    with app.app_context():
+        rows = db.session.execute(
+            select(CustomerKonserni.customer_id, CustomerKonserni.konserni_id)
+        ).all()
+    return sorted(map(tuple, rows))
+
+
+def test_links_follow_the_konserni_column(app, customer_ids):
+    beta, alpha, gamma = customer_ids["beta"], customer_ids["alpha"], customer_ids["gamma"]
+    assert _links(app) == sorted([(beta, 1), (beta, 2), (alpha, 2), (gamma, 3)])
+
+    with app.app_context():
+        save_config(customer_form("beta", konserni=[2, 3]), pk=beta)
+        delete_customer(gamma)
+    assert _links(app) == sorted([(beta, 2), (beta, 3), (alpha, 2)])
+
+
+def test_find_by_konserni_is_one_query(app, customer_ids):
+    with app.app_context(), query_budget(1):
+        found = find_by_konserni([2, 1, 2, 99])
+    assert {k: [c["name"] for c in v] for k, v in found.items()} == {
+        1: ["beta"],
+        2: ["alpha", "beta"],
+        99: [],
+    }
+
+
+def test_find_by_konserni_caps_the_id_list(app):
+    with app.app_context(), pytest.raises(BadRequest, match="At most"):
+        find_by_konserni(range(MAX_KONSERNI_IDS + 1))
+
+
+def test_by_konserni_endpoints(client, customer_ids):
+    one = client.get("/api/customer_configs/by-konserni/2")
+    assert [c["name"] for c in one.get_json()] == ["alpha", "beta"]
+    assert client.get("/api/customer_configs/by-konserni/99").get_json() == []
+
+    many = client.get("/api/customer_configs/by-konserni?ids=3, 1,3").get_json()
+    assert {k: [c["name"] for c in v] for k, v in many.items()} == {
+        "1": ["beta"],
+        "3": ["gamma"],
+    }
+
+    etag = one.headers["ETag"]
+    again = client.get("/api/customer_configs/by-konserni/2", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+
+
+@pytest.mark.parametrize("ids", ["x", "1,x", "", ",", "1.5"])
+def test_by_konserni_rejects_bad_ids(client, ids):
+    assert client.get(f"/api/customer_configs/by-konserni?ids={ids}").status_code == 400
@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+from conftest import make_app
+
+from admin_page.engine import TimedQueuePool
+from admin_page.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def app(tmp_path):
+    yield make_app(
+        tmp_path / "test.db",
+        SQLALCHEMY_ENGINE_OPTIONS={
+            "poolclass": TimedQueuePool,
+            "execution_options": {"schema_translate_map": {"config": None}},
+        },
+        METRICS_TOKEN="scrape-token",
+    )
+
+
+def _scrape(client) -> str:
+    resp = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/plain"
+    return resp.get_data(as_text=True)
+
+
+def test_metrics_requires_auth(client):
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+
+def test_metrics_for_signed_in_users(logged_in):
+    assert logged_in.get("/metrics").status_code == 200
+
+
+def test_request_latency_status_and_caches(client):
+    etag = client.get("/api/settings").headers["ETag"]
+    assert client.get("/api/settings", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/customer_configs/999/schema").status_code == 404
+
+    text = _scrape(client)
+    labels = 'blueprint="api",endpoint="api.get_settings"'
+    assert "# TYPE admin_page_http_request_duration_seconds histogram" in text
+    assert f'admin_page_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"admin_page_http_request_duration_seconds_count{{{labels}}} 2" in text
+    assert f'admin_page_http_requests_total{{{labels},status="200"}} 1' in text
+    assert f'admin_page_http_requests_total{{{labels},status="304"}} 1' in text
+    assert 'endpoint="api.get_customer_schema",status="404"} 1' in text
+
+    assert 'admin_page_cache_requests_total{cache="etag",result="hit"} 1' in text
+    assert 'admin_page_cache_requests_total{cache="snapshot",result="miss"} 1' in text
+    assert 'admin_page_cache_hit_ratio{cache="etag"} 0.5' in text
+
+
+def test_pool_wait_and_connections(client):
+    client.get("/api/settings")
+
+    text = _scrape(client)
+    assert 'admin_page_db_pool_checkout_wait_seconds_count{engine="default"}' in text
+    assert 'admin_page_db_pool_connections{engine="default",state="checked_out"} 0' in text
+    # the request's session and the snapshot's read transaction each used one
+    assert 'admin_page_db_pool_connections{engine="default",state="idle"} 2' in text
+
+
+def test_registry_sums_thread_shards():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    labels = (("endpoint", "x"),)
+
+    def work():
+        for _ in range(1000):
+            registry.inc("hits_total", labels)
+            registry.observe("latency_seconds", labels, 0.5)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    counters, histograms = registry.collect()
+    assert counters[("hits_total", labels)] == 8000
+    assert histograms[("latency_seconds", labels)] == [0, 8000, 0, 4000.0]
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{endpoint="x",le="0.1"} 0' in text
+    assert 'latency_seconds_bucket{endpoint="x",le="1"} 8000' in text
+    assert 'latency_seconds_bucket{endpoint="x",le="+Inf"} 8000' in text
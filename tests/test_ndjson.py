@@ -0,0 +1,138 @@
+import json
+
+import pytest
+from conftest import customer_form, make_app
+
+from admin_page.blueprints.customers.services import list_configs, save_config
+
+
+def _export(client):
+    resp = client.get("/api/customer_configs/export")
+    assert resp.status_code == 200
+    return resp.get_data()
+
+
+def _line(**overrides):
+    row = {
+        "name": "acme",
+        "konserni": [1],
+        "source_container": "in",
+        "destination_container": "out",
+        "file_format": "csv",
+        "file_encoding": "utf-8",
+        "extra_columns": None,
+        "exclude_columns": None,
+        "enabled": True,
+    }
+    return json.dumps({**row, **overrides}) + "\n"
+
+
+def _configs(app):
+    with app.app_context():
+        return {
+            c["name"]: {k: v for k, v in c.items() if k not in ("id", "revision")}
+            for c in list_configs(as_dict=True)
+        }
+
+
+def test_round_trip_into_another_instance(app, logged_in, tmp_path):
+    with app.app_context():
+        save_config(
+            customer_form(
+                "alpha",
+                extra_columns=[{"key": "x", "name": "X", "dtype": "string"}],
+                exclude_columns=["col_1"],
+            )
+        )
+        save_config(customer_form("beta", enabled=False, konserni=[2, 3]))
+    body = _export(logged_in)
+    assert body.count(b"\n") == 2
+
+    other = make_app(tmp_path / "other.db")
+    other_client = other.test_client()
+    with other_client.session_transaction() as sess:
+        sess["user"] = {"name": "Test User", "oid": "user-oid"}
+    resp = other_client.post("/customers/import", data=body)
+    assert resp.get_json() == {
+        "status": "ok",
+        "dry_run": False,
+        "inserted": 2,
+        "updated": 0,
+        "unchanged": 0,
+    }
+    assert _configs(other) == _configs(app)
+
+    # importing the same export again changes nothing
+    again = logged_in.post("/customers/import", data=body).get_json()
+    assert (again["inserted"], again["updated"], again["unchanged"]) == (0, 0, 2)
+
+
+def test_dry_run_writes_nothing(app, logged_in):
+    resp = logged_in.post(
+        "/customers/import?dry_run=1", data=_line() + _line(name="other", enabled=False)
+    )
+    assert resp.get_json()["dry_run"] is True
+    assert resp.get_json()["inserted"] == 2
+    assert _configs(app) == {}
+
+
+@pytest.mark.parametrize(
+    ("line", "error"),
+    [
+        ("{not json\n", "invalid JSON"),
+        ("[1, 2]\n", "expected a JSON object"),
+        (_line(name=""), "'name'"),
+        (_line(konserni="1"), "'konserni'"),
+        (_line(enabled="false"), "'enabled'"),
+        (_line(enabled=None), "'enabled'"),
+        (_line(exclude_columns="abc"), "'exclude_columns'"),
+        (_line(exclude_columns=[1]), "'exclude_columns'"),
+        (_line(extra_columns={"k": "str"}), "'extra_columns'"),
+        (_line(extra_columns={"k": {"name": 1}}), "'extra_columns'"),
+        (_line(extra_columns="abc"), "'extra_columns'"),
+    ],
+)
+def test_bad_line_is_rejected_with_its_number(app, logged_in, line, error):
+    resp = logged_in.post("/customers/import", data=_line(name="first") + line)
+    assert resp.status_code == 400
+    assert resp.get_json()["error"].startswith("Line 2: ")
+    assert error in resp.get_json()["error"]
+    assert _configs(app) == {}  # the good first line was rolled back too
+
+
+def test_duplicate_names_are_rejected(logged_in):
+    resp = logged_in.post("/customers/import", data=_line() + _line())
+    assert resp.status_code == 400
+    assert "duplicate customer name" in resp.get_json()["error"]
+
+
+def test_import_customers_command_with_csrf_enabled(app, client, tmp_path):
+    with app.app_context():
+        save_config(customer_form("alpha"))
+        save_config(customer_form("beta", enabled=False))
+    export = tmp_path / "customers.ndjson"
+    export.write_bytes(_export(client))
+
+    target = make_app(tmp_path / "target.db", WTF_CSRF_ENABLED=True)
+    browser = target.test_client()
+    with browser.session_transaction() as sess:
+        sess["user"] = {"name": "Test User", "oid": "user-oid"}
+    # a script holds no CSRF token, so the HTTP endpoint refuses it …
+    assert browser.post("/customers/import", data=export.read_bytes()).status_code == 400
+
+    # … and the CLI is the scripted path
+    runner = target.test_cli_runner()
+    dry = runner.invoke(args=["import-customers", str(export), "--dry-run"])
+    assert dry.exit_code == 0, dry.output
+    assert "(dry run) 2 inserted, 0 updated, 0 unchanged" in dry.output
+    assert _configs(target) == {}
+
+    result = runner.invoke(args=["import-customers", str(export)])
+    assert result.exit_code == 0, result.output
+    assert _configs(target) == _configs(app)
+
+    bad = tmp_path / "bad.ndjson"
+    bad.write_text(_line(name="new") + _line(enabled="yes"), encoding="utf-8")
+    failed = runner.invoke(args=["import-customers", str(bad)])
+    assert failed.exit_code != 0 and "Line 2: 'enabled'" in failed.output
+    assert "new" not in _configs(target)
@@ -0,0 +1,82 @@
+import pytest
+from conftest import customer_form
+
+from admin_page.blueprints.customers.services import (
+    decode_cursor,
+    encode_cursor,
+    page_configs,
+    save_config,
+)
+
+NAMES = ["a_1", "a%2", "alpha", "beta", "gamma", "ÄÖ-unicode"]
+
+
+@pytest.fixture
+def customers(app):
+    with app.app_context():
+        for i, name in enumerate(NAMES):
+            save_config(
+                customer_form(
+                    name,
+                    enabled=i % 2 == 0,
+                    source_container="in" if i < 3 else "other",
+                )
+            )
+
+
+def test_keyset_pages_cover_every_row_once(app, customers):
+    with app.app_context():
+        seen, cursor = [], None
+        while True:
+            rows, cursor = page_configs(after=cursor, limit=4)
+            seen += [r["name"] for r in rows]
+            if cursor is None:
+                break
+    assert seen == sorted(NAMES)
+
+
+def test_filters(app, customers):
+    with app.app_context():
+        enabled, _ = page_configs(enabled=True)
+        assert [r["name"] for r in enabled] == ["a_1", "alpha", "gamma"]
+
+        # LIKE wildcards in the prefix are matched literally
+        prefixed, _ = page_configs(name_prefix="a%")
+        assert [r["name"] for r in prefixed] == ["a%2"]
+
+        other, _ = page_configs(source_container="other", enabled=False)
+        assert [r["name"] for r in other] == ["beta", "ÄÖ-unicode"]
+
+
+def test_fields_projection(app, customers):
+    with app.app_context():
+        rows, _ = page_configs(fields=["enabled"], limit=1)
+        assert rows == [{"id": rows[0]["id"], "enabled": False}]  # "a%2" sorts first
+
+
+def test_api_pagination(client, customers):
+    first = client.get("/api/customer_configs?limit=2&fields=name").get_json()
+    assert [r["name"] for r in first["items"]] == ["a%2", "a_1"]
+    assert set(first["items"][0]) == {"id", "name"}
+
+    second = client.get(f"/api/customer_configs?limit=2&after={first['next_cursor']}")
+    assert [r["name"] for r in second.get_json()["items"]] == ["alpha", "beta"]
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["limit=x", "enabled=maybe", "fields=name,password", "after=%%%"],
+)
+def test_api_pagination_rejects_bad_arguments(client, query):
+    assert client.get(f"/api/customer_configs?{query}").status_code == 400
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("ÄÖ-unicode")) == "ÄÖ-unicode"
+
+
+def test_manual_run_lists_every_customer(app, logged_in, customers):
+    app.config["CUSTOMERS_PAGE_SIZE"] = 2
+    html = logged_in.get("/manual_run/").get_data(as_text=True)
+    assert f"0 / {len(NAMES)}" in html
+    assert all(f'value="{name}"' in html for name in ("alpha", "gamma"))
@@ -0,0 +1,88 @@
+import pytest
+from conftest import customer_form
+
+from admin_page.blueprints.customers.services import save_config, set_customer_enabled
+from admin_page.blueprints.settings.services import save_base_columns
+from admin_page.snapshot import get_snapshot
+
+
+@pytest.fixture
+def customer_ids(app):
+    with app.app_context():
+        save_base_columns(
+            [
+                {"key": "col_1", "name": "Id", "dtype": "int"},
+                {"key": "col_2", "name": "Amount", "dtype": "decimal", "length": 18, "decimals": 2},
+                {"key": "col_3", "name": "Note", "dtype": "string", "length": 200},
+            ]
+        )
+        return [
+            save_config(
+                customer_form(
+                    "beta",
+                    # excluded by key and by display name (what the form submits)
+                    exclude_columns=["col_1", "Note"],
+                    extra_columns=[{"key": "x_1", "name": "Extra", "dtype": "string"}],
+                )
+            ).id,
+            save_config(customer_form("alpha")).id,
+            save_config(customer_form("off", enabled=False)).id,
+        ]
+
+
+def test_customer_schema(client, customer_ids):
+    beta = customer_ids[0]
+    resp = client.get(f"/api/customer_configs/{beta}/schema")
+    assert resp.status_code == 200
+    schema = resp.get_json()
+    assert schema["customer_id"] == beta and schema["name"] == "beta"
+    assert schema["columns"] == [
+        {
+            "position": 1,
+            "key": "col_2",
+            "name": "Amount",
+            "dtype": "decimal",
+            "length": 18,
+            "decimals": 2,
+            "source": "base",
+        },
+        {
+            "position": 2,
+            "key": "x_1",
+            "name": "Extra",
+            "dtype": "string",
+            "length": None,
+            "decimals": None,
+            "source": "extra",
+        },
+    ]
+
+    etag = resp.headers["ETag"]
+    again = client.get(f"/api/customer_configs/{beta}/schema", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+
+    assert client.get("/api/customer_configs/999/schema").status_code == 404
+
+
+def test_enabled_schemas(client, customer_ids):
+    schemas = client.get("/api/customer_configs/schemas").get_json()
+    assert [s["name"] for s in schemas] == ["alpha", "beta"]
+    assert [c["key"] for c in schemas[0]["columns"]] == ["col_1", "col_2", "col_3"]
+
+
+def test_unchanged_schemas_are_reused(app, customer_ids):
+    beta, alpha, _ = customer_ids
+    with app.app_context():
+        before = get_snapshot().schemas_json
+
+        set_customer_enabled(beta, False)
+        after = get_snapshot().schemas_json
+        assert after[alpha][1] is before[alpha][1]
+        assert after[beta][1] is not before[beta][1]
+
+        # a base column change recompiles every schema
+        save_base_columns([{"key": "col_1", "name": "Id", "dtype": "int"}])
+        recompiled = get_snapshot()
+    assert recompiled.schemas_json[alpha][1] is not after[alpha][1]
+    assert b"col_2" not in recompiled.schemas_json[alpha][1]
+    assert recompiled.enabled_schemas_json.count(b'"customer_id"') == 1
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from flask_session import _utils
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import OperationalError
+
+from admin_page.extensions import db
+from admin_page.models.server_session_model import ServerSession
+
+
+def _now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _rows(app):
+    with app.app_context():
+        return db.session.execute(select(ServerSession.id, ServerSession.expiry)).all()
+
+
+def _set_expiry(app, expiry):
+    with app.app_context():
+        db.session.execute(update(ServerSession).values(expiry=expiry))
+        db.session.commit()
+
+
+@pytest.fixture
+def warm(app, logged_in):
+    """Signed-in client whose session already holds everything a page adds (csrf token)."""
+    assert logged_in.get("/manual_run/").status_code == 200
+    return logged_in
+
+
+def test_unchanged_session_is_not_written(app, warm):
+    (before,) = _rows(app)
+    resp = warm.get("/manual_run/")
+    assert resp.status_code == 200
+    assert "Set-Cookie" not in resp.headers
+    assert _rows(app) == [before]
+
+
+def test_expiry_slides_once_half_the_lifetime_is_left(app, warm):
+    lifetime = app.permanent_session_lifetime
+    _set_expiry(app, _now() + lifetime / 3)
+
+    resp = warm.get("/manual_run/")
+    assert resp.status_code == 200
+    assert "Set-Cookie" in resp.headers  # the cookie follows the new expiry
+    ((_, expiry),) = _rows(app)
+    assert expiry > _now() + lifetime * 0.9
+
+    # still signed in: only the expiry column was touched
+    assert warm.get("/manual_run/").status_code == 200
+
+
+def test_expired_session_is_ignored(app, warm):
+    _set_expiry(app, _now() - timedelta(seconds=1))
+    resp = warm.get("/manual_run/")
+    assert resp.status_code == 302 and "/login" in resp.headers["Location"]
+
+
+def _add_expired(app, n):
+    with app.app_context():
+        db.session.execute(
+            insert(ServerSession),
+            [
+                {"id": f"old-{i}", "data": b"\x80", "expiry": _now() - timedelta(hours=1)}
+                for i in range(n)
+            ],
+        )
+        db.session.commit()
+
+
+def _count(app):
+    with app.app_context():
+        return db.session.scalar(select(func.count()).select_from(ServerSession))
+
+
+def test_session_cleanup_command_purges_every_expired_row(app, warm):
+    app.session_interface.cleanup_batch = 2
+    _add_expired(app, 5)
+
+    result = app.test_cli_runner().invoke(args=["session_cleanup"])
+    assert result.exit_code == 0, result.output
+    assert _count(app) == 1  # the live session is kept
+
+
+def test_lazy_purge_is_batched_and_rate_limited(app, logged_in):
+    interface = app.session_interface
+    interface.cleanup_batch = 2
+    interface._next_cleanup = 0.0
+    _add_expired(app, 5)
+
+    # a session write purges one batch, then waits for the interval
+    with logged_in.session_transaction() as sess:
+        sess["n"] = 1
+    assert _count(app) == 1 + 5 - 2
+
+    with logged_in.session_transaction() as sess:
+        sess["n"] = 2
+    assert _count(app) == 1 + 5 - 2
+
+
+def test_storage_errors_are_retried(app, warm, monkeypatch):
+    monkeypatch.setattr(_utils.time, "sleep", lambda _: None)
+    with app.app_context():
+        engine = db.engine
+    connect, calls = engine.connect, []
+
+    def flaky_connect():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OperationalError("SELECT", {}, Exception("connection reset"))
+        return connect()
+
+    monkeypatch.setattr(engine, "connect", flaky_connect)
+    assert warm.get("/manual_run/").status_code == 200
+    assert len(calls) >= 2
@@ -0,0 +1,148 @@
+import threading
+import time
+
+import pytest
+from conftest import customer_form, make_app
+from sqlalchemy import event
+
+from admin_page.blueprints.customers.services import save_config
+from admin_page.blueprints.settings.services import read_settings
+from admin_page.extensions import db
+from admin_page.ratelimit import TokenBucketLimiter
+from admin_page.singleflight import SingleFlight
+
+THREADS = 32
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = make_app(tmp_path / "test.db", REQUEST_STATS_LOG=False, API_RATE_LIMIT=0)
+    with app.app_context():
+        for i in range(5):
+            save_config(customer_form(f"acme-{i}", konserni=[i]))
+        read_settings()  # seeds the default settings row
+    # start cold, as a freshly scaled-out instance would
+    app.extensions.pop("config_version", None)
+    app.extensions.pop("config_snapshot", None)
+    return app
+
+
+@pytest.fixture
+def statements(app):
+    """Statements run on the app's engine from any thread, each slowed down by 20 ms."""
+    seen: list[str] = []
+    lock = threading.Lock()
+
+    def record(_conn, _cursor, statement, _parameters, _context, _executemany):
+        with lock:
+            seen.append(statement)
+        time.sleep(0.02)  # keep the first fetch in flight while the others arrive
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def _hammer(app, path: str) -> list[tuple[int, bytes]]:
+    barrier = threading.Barrier(THREADS)
+    results: list[tuple[int, bytes]] = []
+    lock = threading.Lock()
+
+    def worker():
+        client = app.test_client()
+        barrier.wait()
+        resp = client.get(path)
+        with lock:
+            results.append((resp.status_code, resp.get_data()))
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+@pytest.mark.parametrize(
+    "path", ["/api/customer_configs", "/api/settings", "/api/customer_configs?prefix=acme"]
+)
+def test_concurrent_reads_share_one_fetch(app, statements, path):
+    results = _hammer(app, path)
+
+    assert len(results) == THREADS
+    assert {status for status, _ in results} == {200}
+    assert len({body for _, body in results}) == 1
+
+    # one version read plus one build (the snapshot or page queries), not one per request
+    version_reads = [s for s in statements if "config_version" in s]
+    assert len(version_reads) <= 2
+    assert len(statements) <= 8
+
+
+def test_single_flight_shares_result_and_error():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = 0
+
+    def slow():
+        nonlocal calls
+        calls += 1
+        started.set()
+        release.wait()
+        return calls
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+    leader.start()
+    started.wait()
+    followers = [
+        threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(4)
+    ]
+    for t in followers:
+        t.start()
+    time.sleep(0.1)  # let them join the call the leader is stuck in
+    release.set()
+    for t in (leader, *followers):
+        t.join()
+
+    assert calls == 1
+    assert sorted(results) == [(1, False)] + [(1, True)] * 4
+    assert flight.in_flight() == 0
+    assert flight.do("k", lambda: 2) == (2, False)  # nothing is cached
+
+    def boom():
+        raise RuntimeError("db down")
+
+    with pytest.raises(RuntimeError, match="db down"):
+        flight.do("k", boom)
+    assert flight.in_flight() == 0
+
+
+def test_token_bucket():
+    limiter = TokenBucketLimiter(rate=2, burst=3, max_clients=2)
+
+    assert [limiter.take("a", now=0) for _ in range(3)] == [0, 0, 0]
+    assert limiter.take("a", now=0) == pytest.approx(0.5)
+    assert limiter.take("a", now=0.5) == 0  # refilled one token
+    assert limiter.take("b", now=0.5) == 0  # other clients are unaffected
+
+    limiter.take("c", now=1)  # evicts "a", the least recently seen
+    assert limiter.take("a", now=1) == 0
+
+
+def test_api_rate_limit(app, client):
+    app.config.update(API_RATE_LIMIT=1, API_RATE_BURST=2)
+
+    assert client.get("/api/settings").status_code == 200
+    assert client.get("/api/settings").status_code == 200
+    resp = client.get("/api/settings")
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+
+    other = client.get("/api/settings", headers={"X-Forwarded-For": "10.0.0.2"})
+    assert other.status_code == 200
+    # the admin UI is not limited
+    assert client.get("/customers/").status_code != 429
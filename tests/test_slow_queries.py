@@ -0,0 +1,88 @@
+import pytest
+from conftest import make_app
+
+from admin_page import slow_queries
+from admin_page.blueprints.settings.services import save_base_columns
+from admin_page.slow_queries import SlowQueryLog, fingerprint, slow_query_log
+
+
+@pytest.fixture
+def app(tmp_path):
+    yield make_app(
+        tmp_path / "test.db",
+        SLOW_QUERY_THRESHOLD_MS=1e-6,  # record everything
+        SLOW_QUERY_LOG=str(tmp_path / "slow.json"),
+    )
+
+
+def test_fingerprint_strips_literals_and_lists():
+    assert fingerprint("SELECT a FROM t WHERE id IN (?, ?, ?) AND n = 'x''y'  LIMIT 10") == (
+        "SELECT a FROM t WHERE id IN (...) AND n = ? LIMIT ?"
+    )
+    assert fingerprint("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == (
+        "INSERT INTO t (a, b) VALUES (...)"
+    )
+    assert fingerprint('SELECT t1.col_2 FROM "t1" WHERE x > -3.5') == (
+        'SELECT t1.col_2 FROM "t1" WHERE x > ?'
+    )
+
+
+def test_log_is_bounded_and_flushes_merged_totals(tmp_path):
+    log = SlowQueryLog(tmp_path / "slow.json", threshold=0.1, max_entries=2)
+    log.record("SELECT 1", 0.05)  # under the threshold
+    log.record("SELECT a FROM t WHERE id = 1", 0.2)
+    log.record("SELECT a FROM t WHERE id = 2", 0.4)
+    log.record("SELECT b FROM t", 0.3)
+    log.record("SELECT c FROM t", 0.5)  # evicts the fingerprint with the least total time
+
+    assert set(log.pending()) == {"SELECT a FROM t WHERE id = ?", "SELECT c FROM t"}
+    log.flush()
+    assert log.pending() == {}
+
+    log.record("SELECT a FROM t WHERE id = 3", 0.9)
+    log.flush()
+    stats = log.load()["SELECT a FROM t WHERE id = ?"]
+    assert (stats.count, round(stats.total, 6), stats.max) == (3, 1.5, 0.9)
+
+
+def test_processes_flush_to_their_own_files(tmp_path, monkeypatch):
+    path = tmp_path / "slow.json"
+    first, second = SlowQueryLog(path, threshold=0), SlowQueryLog(path, threshold=0)
+    first.record("SELECT a FROM t", 0.5)
+    second.record("SELECT a FROM t", 0.25)
+    second.record("SELECT b FROM t", 0.1)
+
+    # overlapping flushes: each process rewrites only its own file
+    monkeypatch.setattr(slow_queries.os, "getpid", lambda: 101)
+    first.flush()
+    monkeypatch.setattr(slow_queries.os, "getpid", lambda: 202)
+    second.flush()
+    first.record("SELECT a FROM t", 1.0)
+    monkeypatch.setattr(slow_queries.os, "getpid", lambda: 101)
+    first.flush()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["slow.101.json", "slow.202.json"]
+    merged = SlowQueryLog(path).report()
+    a = merged["SELECT a FROM t"]
+    assert (a.count, a.total, a.max) == (3, 1.75, 1.0)
+    assert merged["SELECT b FROM t"].count == 1
+
+    first.reset()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_slow_queries_cli_lists_top_fingerprints(app):
+    with app.app_context():
+        save_base_columns([{"key": "a", "name": "A", "dtype": "string"}])
+    slow_query_log(app).flush()
+
+    result = app.test_cli_runner().invoke(args=["slow-queries", "--top", "3", "--sort", "count"])
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0].split() == ["count", "total", "s", "mean", "ms", "max", "ms", "statement"]
+    assert len(lines) == 5  # header, 3 statements, footer
+    assert "base_columns" in result.output
+
+    result = app.test_cli_runner().invoke(args=["slow-queries", "--reset"])
+    assert "slow-query log cleared" in result.output
+    assert slow_query_log(app).report() == {}
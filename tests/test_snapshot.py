@@ -0,0 +1,50 @@
+from conftest import customer_form, make_app
+
+from admin_page.blueprints.customers.services import save_config, set_customer_enabled
+from admin_page.instrumentation import query_budget
+from admin_page.snapshot import get_snapshot
+
+
+def test_snapshot_is_reused_until_the_version_moves(app):
+    with app.app_context():
+        a = save_config(customer_form("beta")).id
+        save_config(customer_form("alpha"))
+
+        snapshot = get_snapshot()
+        assert [c.name for c in snapshot.customers] == ["alpha", "beta"]
+        assert snapshot.customers_by_id[a].name == "beta"
+
+        with query_budget(0):  # cached version, cached snapshot
+            assert get_snapshot() is snapshot
+
+        set_customer_enabled(a, False)
+        reloaded = get_snapshot()
+        assert reloaded is not snapshot
+        assert reloaded.version == snapshot.version + 1
+        assert reloaded.customers_by_id[a].enabled is False
+
+
+def test_snapshots_are_per_app(app, tmp_path):
+    other = make_app(tmp_path / "other.db")
+    with app.app_context():
+        save_config(customer_form("only-here"))
+        mine = get_snapshot()
+    with other.app_context():
+        theirs = get_snapshot()
+
+    assert [c.name for c in mine.customers] == ["only-here"]
+    assert theirs.customers == ()
+
+
+def test_other_instance_write_is_seen_after_the_ttl(app, tmp_path):
+    app.config["CONFIG_VERSION_TTL"] = 0
+    other = make_app(tmp_path / "test.db")  # a second instance on the same database
+    with app.app_context():
+        before = get_snapshot()
+    with other.app_context():
+        save_config(customer_form("from-elsewhere"))
+    with app.app_context():
+        after = get_snapshot()
+
+    assert after.version > before.version
+    assert [c.name for c in after.customers] == ["from-elsewhere"]
@@ -0,0 +1,81 @@
+import json
+
+import msgspec
+import pytest
+from conftest import customer_form
+
+from admin_page.blueprints.customers.services import (
+    config_to_dict,
+    list_configs,
+    read_configs,
+    save_config,
+)
+from admin_page.blueprints.settings.services import (
+    load_settings,
+    read_base_columns,
+    read_settings,
+    save_base_columns,
+)
+from admin_page.extensions import db
+from admin_page.structs import BaseColumnSpec, CustomerConfig, encoder
+
+
+@pytest.fixture
+def populated(app):
+    with app.app_context():
+        save_base_columns(
+            [
+                {"key": "col_2", "name": "Amount", "dtype": "decimal", "length": 18, "decimals": 2},
+                {"key": "col_1", "name": "Id", "dtype": "int"},
+            ]
+        )
+        save_config(
+            customer_form(
+                "beta",
+                konserni=[3, 1],
+                extra_columns=[{"key": "x", "name": "X", "dtype": "string"}],
+                exclude_columns=["col_1"],
+            )
+        )
+        save_config(customer_form("alpha", enabled=False))
+        load_settings()
+
+
+def test_read_configs_matches_the_orm_dicts(app, populated):
+    with app.app_context():
+        db.session.expunge_all()
+        structs = read_configs()
+        assert not db.session.identity_map  # Core rows only, no ORM instances
+        dicts = list_configs(as_dict=True)
+
+    assert all(isinstance(c, CustomerConfig) for c in structs)
+    # same values and the same JSON key order as config_to_dict
+    assert encoder.encode(structs) == json.dumps(dicts, separators=(",", ":")).encode()
+    with pytest.raises(AttributeError):
+        structs[0].enabled = True  # frozen
+
+
+def test_read_base_columns_and_settings(app, populated):
+    with app.app_context():
+        columns = read_base_columns()
+        settings = read_settings()
+        orm_settings = load_settings()
+
+    assert list(columns) == ["col_2", "col_1"]  # in `order`
+    assert columns["col_2"] == BaseColumnSpec("Amount", "decimal", 18, 2)
+    assert (settings.retry_attempts, settings.retry_delay) == (
+        orm_settings.retry_attempts,
+        orm_settings.retry_delay,
+    )
+
+
+def test_api_bodies_are_msgspec_encoded(app, client, populated):
+    with app.app_context():
+        expected = [config_to_dict(c) for c in list_configs()]
+
+    assert client.get("/api/customer_configs").get_json() == expected
+
+    bundle = msgspec.json.decode(client.get("/api/bundle").get_data())
+    assert bundle["customers"] == expected
+    assert list(bundle["base_columns"]) == ["col_2", "col_1"]
+    assert set(bundle["settings"]) == {"revision", "retry_attempts", "retry_delay", "emails"}
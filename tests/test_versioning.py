@@ -0,0 +1,67 @@
+import pytest
+from conftest import customer_form
+
+from admin_page import versioning
+from admin_page.blueprints.customers.services import save_config, set_customer_enabled
+from admin_page.instrumentation import query_budget
+from admin_page.versioning import bump_version, current_version, etag_for, read_version
+
+
+@pytest.fixture
+def customer_id(app):
+    with app.app_context():
+        return save_config(customer_form()).id
+
+
+@pytest.mark.parametrize("path", ["/api/customer_configs", "/api/settings"])
+def test_etag_and_304(app, client, customer_id, path):
+    resp = client.get(path)
+    assert resp.status_code == 200
+    etag = resp.headers["ETag"]
+    assert resp.headers["Cache-Control"] == "no-cache"
+
+    with app.app_context(), query_budget(0):  # answered from the cached version
+        again = client.get(path, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag and not again.get_data()
+
+    # any of several tags, or *, matches
+    assert client.get(path, headers={"If-None-Match": f'"x", {etag}'}).status_code == 304
+    assert client.get(path, headers={"If-None-Match": "*"}).status_code == 304
+    assert client.get(path, headers={"If-None-Match": '"stale-1"'}).status_code == 200
+
+
+def test_write_changes_the_etag(app, client, customer_id):
+    etag = client.get("/api/customer_configs").headers["ETag"]
+    with app.app_context():
+        set_customer_enabled(customer_id, False)
+
+    resp = client.get("/api/customer_configs", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert resp.get_json()[0]["enabled"] is False
+
+
+def test_version_is_published_on_commit_only(app):
+    with app.app_context():
+        before = current_version(max_age=0)
+
+        bump_version()
+        versioning.database.session.rollback()
+        assert current_version() == before == read_version()
+
+        bumped = bump_version()
+        versioning.database.session.commit()
+        assert current_version() == bumped == before + 1
+        assert etag_for("settings", bumped) == f"settings-{bumped}"
+
+
+def test_stale_read_does_not_move_the_version_back(app, monkeypatch):
+    with app.app_context():
+        bump_version()
+        versioning.database.session.commit()
+        published = current_version()
+
+        # a read that started before the commit returns the older value late
+        monkeypatch.setattr(versioning, "read_version", lambda: published - 1)
+        assert current_version(max_age=0) == published
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+from conftest import customer_form, make_app
+
+from admin_page.blueprints.customers.services import (
+    delete_customer,
+    save_config,
+    set_customer_enabled,
+)
+from admin_page.blueprints.settings.services import save_base_columns
+from admin_page.versioning import read_version
+from admin_page.watch import list_changed_ids
+
+
+@pytest.fixture
+def customer_ids(app):
+    with app.app_context():
+        return [save_config(customer_form(name)).id for name in ("alpha", "beta")]
+
+
+def _later(app, fn, delay=0.2):
+    def run():
+        time.sleep(delay)
+        with app.app_context():
+            fn()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_watch_times_out_with_204(client, customer_ids):
+    version = client.get("/api/bundle").get_json()["version"]
+    started = time.monotonic()
+    resp = client.get(f"/api/watch?since={version}&timeout=0.2")
+    assert resp.status_code == 204
+    assert 0.2 <= time.monotonic() - started < 2
+
+
+def test_watch_returns_at_once_when_behind(client, customer_ids):
+    resp = client.get("/api/watch?since=0&timeout=10")
+    assert resp.status_code == 200
+    assert resp.get_json()["changed"]["customers"] == customer_ids
+
+
+def test_local_commit_wakes_the_watcher(app, client, customer_ids):
+    a, _ = customer_ids
+    with app.app_context():
+        since = read_version()
+
+    writer = _later(app, lambda: set_customer_enabled(a, False))
+    started = time.monotonic()
+    resp = client.get(f"/api/watch?since={since}&timeout=10")
+    writer.join()
+
+    assert time.monotonic() - started < 2  # woken by the commit, not the timeout
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["since"] == since and body["version"] == since + 1
+    assert body["changed"] == {"customers": [a], "base_columns": [], "settings": False}
+
+
+def test_other_instance_is_seen_at_version_refresh(app, tmp_path, customer_ids):
+    app.config["CONFIG_VERSION_TTL"] = 0.2
+    other = make_app(tmp_path / "test.db")  # a second instance on the same database
+    with app.app_context():
+        since = read_version()
+
+    writer = _later(other, lambda: delete_customer(customer_ids[1]))
+    resp = app.test_client().get(f"/api/watch?since={since}&timeout=10")
+    writer.join()
+
+    assert resp.status_code == 200
+    assert resp.get_json()["deleted"] == {"customers": [customer_ids[1]], "base_columns": []}
+
+
+def test_list_changed_ids(app, customer_ids):
+    with app.app_context():
+        since = read_version()
+        save_base_columns([{"key": "col_a", "name": "A", "dtype": "string"}])
+        delete_customer(customer_ids[0])
+
+        changes = list_changed_ids(since)
+        assert changes["version"] == read_version() == since + 2
+        assert changes["changed"]["customers"] == []
+        assert len(changes["changed"]["base_columns"]) == 1
+        assert changes["deleted"]["customers"] == [customer_ids[0]]
+
+
+def test_watch_rejects_bad_arguments_and_caps_waiters(app, client):
+    assert client.get("/api/watch?since=-1").status_code == 400
+    assert client.get("/api/watch?timeout=nan").status_code == 400
+
+    app.config["API_WATCH_MAX_WAITERS"] = 0
+    app.extensions.pop("watch_waiters", None)
+    resp = client.get("/api/watch?timeout=1")
+    assert resp.status_code == 503 and resp.headers["Retry-After"] == "1"
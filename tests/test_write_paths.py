@@ -0,0 +1,117 @@
+import pytest
+from conftest import customer_form
+from werkzeug.exceptions import BadRequest
+
+from admin_page.blueprints.customers.services import list_configs, save_config, set_customer_enabled
+from admin_page.blueprints.settings.services import load_settings, read_settings, save_settings
+from admin_page.extensions import db
+from admin_page.instrumentation import query_budget
+from admin_page.models import EmailModel, GeneralSettings
+from admin_page.versioning import bump_version, read_version
+
+
+@pytest.fixture
+def customer_id(app):
+    with app.app_context():
+        bump_version()  # seed the version row
+        db.session.commit()
+        return save_config(customer_form()).id
+
+
+def test_bump_version_is_one_statement(app, customer_id):
+    with app.app_context():
+        before = read_version()
+        with query_budget(1):
+            assert bump_version() == before + 1
+        db.session.commit()
+
+
+def test_set_customer_enabled_updates_with_returning(app, customer_id):
+    with app.app_context():
+        loaded = list_configs(pk=customer_id)  # as the edit view does
+        assert loaded.enabled is True
+
+        with query_budget(2):  # version bump, UPDATE … RETURNING
+            customer = set_customer_enabled(customer_id, False)
+        assert customer is loaded and customer in db.session
+        assert customer.enabled is False
+        assert list_configs(pk=customer_id).enabled is False
+
+        version = read_version()
+        assert set_customer_enabled(customer_id, False).enabled is False
+        assert read_version() == version  # no-op: nothing written
+
+        with pytest.raises(ValueError):
+            set_customer_enabled(9999, True)
+
+
+def test_save_config_writes_only_changes(app, customer_id):
+    with app.app_context():
+        row = list_configs(pk=customer_id)  # what the edit view loads first
+        with query_budget(0):
+            assert save_config(customer_form(), pk=customer_id) is row
+
+        with query_budget(2):  # version bump, UPDATE of the one changed column
+            save_config(customer_form(destination_container="elsewhere"), pk=customer_id)
+        assert list_configs(pk=customer_id).destination_container == "elsewhere"
+
+
+def test_save_config_duplicate_name_is_rejected_by_the_index(app, customer_id):
+    with app.app_context():
+        with pytest.raises(BadRequest):
+            save_config(customer_form())
+        assert len(list_configs()) == 1
+
+
+def _updated(settings: GeneralSettings, emails: list[tuple[str, str]], **scalars):
+    return GeneralSettings(
+        id=settings.id,
+        retry_attempts=scalars.get("retry_attempts", settings.retry_attempts),
+        retry_delay=scalars.get("retry_delay", settings.retry_delay),
+        emails=[EmailModel(address=a, display_name=n) for a, n in emails],
+    )
+
+
+def test_save_settings_diffs_emails(app):
+    with app.app_context():
+        settings = load_settings()
+        assert save_settings(_updated(settings, [("a@x", "A"), ("b@x", "B"), ("c@x", "C")]))
+        db.session.remove()
+
+        settings = load_settings()
+        with query_budget(0):
+            assert save_settings(_updated(settings, [("a@x", "A"), ("b@x", "B"), ("c@x", "C")]))
+
+        ids = {e.address: e.id for e in settings.emails}
+        updated = _updated(settings, [("a@x", "A"), ("b@x", "Bee"), ("d@x", "D")], retry_delay=9)
+        assert save_settings(updated)
+        db.session.remove()
+
+        stored = read_settings()
+        assert stored.retry_delay == 9
+        assert {(e.address, e.display_name) for e in stored.emails} == {
+            ("a@x", "A"),
+            ("b@x", "Bee"),
+            ("d@x", "D"),
+        }
+        kept = {e.address: e.id for e in load_settings().emails}
+        assert kept["a@x"] == ids["a@x"] and kept["b@x"] == ids["b@x"]
+
+
+def test_save_settings_keeps_the_submitted_email_order(app):
+    with app.app_context():
+        settings = load_settings()
+        assert save_settings(_updated(settings, [("b@x", "B"), ("c@x", "C")]))
+        db.session.remove()
+
+        order = [("a@x", "A"), ("b@x", "B"), ("d@x", "D"), ("c@x", "C")]
+        assert save_settings(_updated(load_settings(), order))
+        db.session.remove()
+        assert [(e.address, e.display_name) for e in read_settings().emails] == order
+        assert [(e.address, e.display_name) for e in load_settings().emails] == order
+
+        # moving an address to the front works the same way
+        order = [("c@x", "C"), ("a@x", "A"), ("b@x", "B"), ("d@x", "D")]
+        assert save_settings(_updated(load_settings(), order))
+        db.session.remove()
+        assert [(e.address, e.display_name) for e in read_settings().emails] == order